@@ -0,0 +1,63 @@
+"""route_driven_indexes
+
+Составные/покрывающие индексы под реальные запросы роутов:
+  * time_entries: status + date (дашборд, отчёты), project_id + status (_compute_stats)
+  * invoices: client_id + status + issue_date (list_invoices), status + due_date (просрочка)
+  * invoice_items: invoice_id + amount (суммы счетов)
+
+Одиночные индексы, полностью покрытые префиксом составных, удалены.
+
+Revision ID: 5c2a8e41d7b9
+Revises: 903e3eb82d87
+Create Date: 2026-10-19 10:12:40.512311
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c2a8e41d7b9'
+down_revision: Union[str, None] = '903e3eb82d87'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_time_entries_status_date', 'time_entries', ['status', 'date', 'project_id', 'duration_hours'], unique=False)
+    op.create_index('ix_time_entries_project_status', 'time_entries', ['project_id', 'status', 'duration_hours'], unique=False)
+    op.drop_index('ix_time_entries_status', table_name='time_entries')
+    op.drop_index('ix_time_entries_project_id', table_name='time_entries')
+
+    op.create_index('ix_invoices_client_status_issue_date', 'invoices', ['client_id', 'status', 'issue_date'], unique=False)
+    op.create_index('ix_invoices_status_issue_date', 'invoices', ['status', 'issue_date'], unique=False)
+    op.create_index('ix_invoices_status_due_date', 'invoices', ['status', 'due_date'], unique=False)
+    op.drop_index('ix_invoices_client_id', table_name='invoices')
+    op.drop_index('ix_invoices_status', table_name='invoices')
+    op.drop_index('ix_invoices_due_date', table_name='invoices')
+
+    op.create_index('ix_invoice_items_invoice_amount', 'invoice_items', ['invoice_id', 'amount'], unique=False)
+    op.drop_index('ix_invoice_items_invoice_id', table_name='invoice_items')
+
+    # Обновить статистику планировщика SQLite под новые индексы
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute('ANALYZE')
+
+
+def downgrade() -> None:
+    op.create_index('ix_invoice_items_invoice_id', 'invoice_items', ['invoice_id'], unique=False)
+    op.drop_index('ix_invoice_items_invoice_amount', table_name='invoice_items')
+
+    op.create_index('ix_invoices_due_date', 'invoices', ['due_date'], unique=False)
+    op.create_index('ix_invoices_status', 'invoices', ['status'], unique=False)
+    op.create_index('ix_invoices_client_id', 'invoices', ['client_id'], unique=False)
+    op.drop_index('ix_invoices_status_due_date', table_name='invoices')
+    op.drop_index('ix_invoices_status_issue_date', table_name='invoices')
+    op.drop_index('ix_invoices_client_status_issue_date', table_name='invoices')
+
+    op.create_index('ix_time_entries_project_id', 'time_entries', ['project_id'], unique=False)
+    op.create_index('ix_time_entries_status', 'time_entries', ['status'], unique=False)
+    op.drop_index('ix_time_entries_project_status', table_name='time_entries')
+    op.drop_index('ix_time_entries_status_date', table_name='time_entries')
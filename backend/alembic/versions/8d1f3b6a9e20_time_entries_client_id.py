@@ -0,0 +1,46 @@
+"""time_entries_client_id
+
+Денормализованный client_id в time_entries (копия projects.client_id)
+с заполнением существующих строк и индексом (client_id, date).
+
+Revision ID: 8d1f3b6a9e20
+Revises: 5c2a8e41d7b9
+Create Date: 2026-10-19 11:03:17.204558
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d1f3b6a9e20'
+down_revision: Union[str, None] = '5c2a8e41d7b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('time_entries', sa.Column('client_id', sa.Integer(), nullable=True))
+
+    # Backfill из проектов
+    op.execute(
+        'UPDATE time_entries SET client_id = '
+        '(SELECT projects.client_id FROM projects WHERE projects.id = time_entries.project_id)'
+    )
+
+    # SQLite не умеет ALTER COLUMN / ADD CONSTRAINT — batch пересоздаёт таблицу
+    with op.batch_alter_table('time_entries') as batch_op:
+        batch_op.alter_column('client_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.create_foreign_key(
+            'fk_time_entries_client_id_clients', 'clients', ['client_id'], ['id'], ondelete='CASCADE'
+        )
+    op.create_index('ix_time_entries_client_date', 'time_entries', ['client_id', 'date'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_time_entries_client_date', table_name='time_entries')
+    with op.batch_alter_table('time_entries') as batch_op:
+        batch_op.drop_constraint('fk_time_entries_client_id_clients', type_='foreignkey')
+        batch_op.drop_column('client_id')
@@ -0,0 +1,37 @@
+"""active_timers
+
+Запущенные таймеры (только момент старта).
+
+Revision ID: a6c3f0d87e15
+Revises: f4b1e8a2c6d0
+Create Date: 2026-10-19 17:34:51.205873
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6c3f0d87e15'
+down_revision: Union[str, None] = 'f4b1e8a2c6d0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('active_timers',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('started_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_active_timers_project_id', 'active_timers', ['project_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_active_timers_project_id', table_name='active_timers')
+    op.drop_table('active_timers')
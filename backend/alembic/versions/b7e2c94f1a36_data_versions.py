@@ -0,0 +1,33 @@
+"""data_versions
+
+Таблица версий данных: счётчик изменений на каждую таблицу,
+источник ETag для условных GET-запросов.
+
+Revision ID: b7e2c94f1a36
+Revises: 8d1f3b6a9e20
+Create Date: 2026-10-19 14:21:05.318742
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2c94f1a36'
+down_revision: Union[str, None] = '8d1f3b6a9e20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('data_versions',
+    sa.Column('table_name', sa.String(length=64), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('table_name')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('data_versions')
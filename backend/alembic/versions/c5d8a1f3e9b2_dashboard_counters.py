@@ -0,0 +1,301 @@
+"""dashboard_counters
+
+Счётчики дашборда (часы по дням, неоплаченное / невыставленное по валютам,
+число просроченных счетов), триггеры их инкрементального обновления и
+начальное заполнение по существующим данным.
+
+Revision ID: c5d8a1f3e9b2
+Revises: a6c3f0d87e15
+Create Date: 2026-10-19 18:02:13.418522
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d8a1f3e9b2'
+down_revision: Union[str, None] = 'a6c3f0d87e15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TRIGGERS = [
+    '''
+CREATE TRIGGER dashboard_counters_time_entries_ai AFTER INSERT ON time_entries BEGIN
+    INSERT INTO dashboard_counters (metric, bucket, currency, value) SELECT 'hours', NEW.date, '', 1 * NEW.duration_hours
+        WHERE true
+        ON CONFLICT (metric, bucket, currency) DO UPDATE SET value = value + excluded.value;
+    INSERT INTO dashboard_counters (metric, bucket, currency, value) SELECT 'unbilled', '', p.currency, 1 * NEW.duration_hours * p.hourly_rate
+        FROM projects p
+        WHERE p.id = NEW.project_id AND NEW.status = 'confirmed' AND p.hourly_rate IS NOT NULL
+        ON CONFLICT (metric, bucket, currency) DO UPDATE SET value = value + excluded.value;
+    INSERT INTO dashboard_counters (metric, bucket, currency, value) SELECT 'unbilled_hours', '', p.currency, 1 * NEW.duration_hours
+        FROM projects p
+        WHERE p.id = NEW.project_id AND NEW.status = 'confirmed' AND p.hourly_rate IS NULL
+        ON CONFLICT (metric, bucket, currency) DO UPDATE SET value = value + excluded.value;
+END
+    ''',
+    '''
+CREATE TRIGGER dashboard_counters_time_entries_au AFTER UPDATE OF date, duration_hours, status, project_id ON time_entries BEGIN
+    INSERT INTO dashboard_counters (metric, bucket, currency, value) SELECT 'hours', OLD.date, '', -1 * OLD.duration_hours
+        WHERE true
+        ON CONFLICT (metric, bucket, currency) DO UPDATE SET value = value + excluded.value;
+    INSERT INTO dashboard_counters (metric, bucket, currency, value) SELECT 'unbilled', '', p.currency, -1 * OLD.duration_hours * p.hourly_rate
+        FROM projects p
+        WHERE p.id = OLD.project_id AND OLD.status = 'confirmed' AND p.hourly_rate IS NOT NULL
+        ON CONFLICT (metric, bucket, currency) DO UPDATE SET value = value + excluded.value;
+    INSERT INTO dashboard_counters (metric, bucket, currency, value) SELECT 'unbilled_hours', '', p.currency, -1 * OLD.duration_hours
+        FROM projects p
+        WHERE p.id = OLD.project_id AND OLD.status = 'confirmed' AND p.hourly_rate IS NULL
+        ON CONFLICT (metric, bucket, currency) DO UPDATE SET value = value + excluded.value;
+    INSERT INTO dashboard_counters (metric, bucket, currency, value) SELECT 'hours', NEW.date, '', 1 * NEW.duration_hours
+        WHERE true
+        ON CONFLICT (metric, bucket, currency) DO UPDATE SET value = value + excluded.value;
+    INSERT INTO dashboard_counters (metric, bucket, currency, value) SELECT 'unbilled', '', p.currency, 1 * NEW.duration_hours * p.hourly_rate
+        FROM projects p
+        WHERE p.id = NEW.project_id AND NEW.status = 'confirmed' AND p.hourly_rate IS NOT NULL
+        ON CONFLICT (metric, bucket, currency) DO UPDATE SET value = value + excluded.value;
+    INSERT INTO dashboard_counters (metric, bucket, currency, value) SELECT 'unbilled_hours', '', p.currency, 1 * NEW.duration_hours
+        FROM projects p
+        WHERE p.id = NEW.project_id AND NEW.status = 'confirmed' AND p.hourly_rate IS NULL
+        ON CONFLICT (metric, bucket, currency) DO UPDATE SET value = value + excluded.value;
+END
+    ''',
+    '''
+CREATE TRIGGER dashboard_counters_time_entries_bd BEFORE DELETE ON time_entries BEGIN
+    INSERT INTO dashboard_counters (metric, bucket, currency, value) SELECT 'hours', OLD.date, '', -1 * OLD.duration_hours
+        WHERE true
+        ON CONFLICT (metric, bucket, currency) DO UPDATE SET value = value + excluded.value;
+    INSERT INTO dashboard_counters (metric, bucket, currency, value) SELECT 'unbilled', '', p.currency, -1 * OLD.duration_hours * p.hourly_rate
+        FROM projects p
+        WHERE p.id = OLD.project_id AND OLD.status = 'confirmed' AND p.hourly_rate IS NOT NULL
+        ON CONFLICT (metric, bucket, currency) DO UPDATE SET value = value + excluded.value;
+    INSERT INTO dashboard_counters (metric, bucket, currency, value) SELECT 'unbilled_hours', '', p.currency, -1 * OLD.duration_hours
+        FROM projects p
+        WHERE p.id = OLD.project_id AND OLD.status = 'confirmed' AND p.hourly_rate IS NULL
+        ON CONFLICT (metric, bucket, currency) DO UPDATE SET value = value + excluded.value;
+    INSERT INTO dashboard_counters (metric, bucket, currency, value) SELECT 'unpaid', inv.issue_date, p.currency, -1 * SUM(i.amount)
+        FROM invoice_items i JOIN time_entries te ON te.id = i.time_entry_id
+        JOIN projects p ON p.id = te.project_id
+        JOIN invoices inv ON inv.id = i.invoice_id
+        WHERE te.id = OLD.id AND inv.status IN ('sent', 'overdue')
+        GROUP BY inv.issue_date
+        ON CONFLICT (metric, bucket, currency) DO UPDATE SET value = value + excluded.value;
+    INSERT INTO dashboard_counters (metric, bucket, currency, value) SELECT 'unpaid', inv.issue_date, 'RUB', 1 * SUM(i.amount)
+        FROM invoice_items i JOIN time_entries te ON te.id = i.time_entry_id
+        JOIN projects p ON p.id = te.project_id
+        JOIN invoices inv ON inv.id = i.invoice_id
+        WHERE te.id = OLD.id AND inv.status IN ('sent', 'overdue')
+        GROUP BY inv.issue_date
+        ON CONFLICT (metric, bucket, currency) DO UPDATE SET value = value + excluded.value;
+END
+    ''',
+    '''
+CREATE TRIGGER dashboard_counters_invoice_items_ai AFTER INSERT ON invoice_items BEGIN
+    INSERT INTO dashboard_counters (metric, bucket, currency, value) SELECT 'unpaid', inv.issue_date, COALESCE(p.currency, 'RUB'), 1 * NEW.amount
+        FROM invoices inv
+        LEFT JOIN time_entries te ON te.id = NEW.time_entry_id
+        LEFT
+        JOIN projects p ON p.id = te.project_id
+        WHERE inv.id = NEW.invoice_id AND inv.status IN ('sent', 'overdue')
+        ON CONFLICT (metric, bucket, currency) DO UPDATE SET value = value + excluded.value;
+END
+    ''',
+    '''
+CREATE TRIGGER dashboard_counters_invoice_items_au AFTER UPDATE OF amount, invoice_id, time_entry_id ON invoice_items BEGIN
+    INSERT INTO dashboard_counters (metric, bucket, currency, value) SELECT 'unpaid', inv.issue_date, COALESCE(p.currency, 'RUB'), -1 * OLD.amount
+        FROM invoices inv
+        LEFT JOIN time_entries te ON te.id = OLD.time_entry_id
+        LEFT
+        JOIN projects p ON p.id = te.project_id
+        WHERE inv.id = OLD.invoice_id AND inv.status IN ('sent', 'overdue')
+        ON CONFLICT (metric, bucket, currency) DO UPDATE SET value = value + excluded.value;
+    INSERT INTO dashboard_counters (metric, bucket, currency, value) SELECT 'unpaid', inv.issue_date, COALESCE(p.currency, 'RUB'), 1 * NEW.amount
+        FROM invoices inv
+        LEFT JOIN time_entries te ON te.id = NEW.time_entry_id
+        LEFT
+        JOIN projects p ON p.id = te.project_id
+        WHERE inv.id = NEW.invoice_id AND inv.status IN ('sent', 'overdue')
+        ON CONFLICT (metric, bucket, currency) DO UPDATE SET value = value + excluded.value;
+END
+    ''',
+    '''
+CREATE TRIGGER dashboard_counters_invoice_items_bd BEFORE DELETE ON invoice_items BEGIN
+    INSERT INTO dashboard_counters (metric, bucket, currency, value) SELECT 'unpaid', inv.issue_date, COALESCE(p.currency, 'RUB'), -1 * OLD.amount
+        FROM invoices inv
+        LEFT JOIN time_entries te ON te.id = OLD.time_entry_id
+        LEFT
+        JOIN projects p ON p.id = te.project_id
+        WHERE inv.id = OLD.invoice_id AND inv.status IN ('sent', 'overdue')
+        ON CONFLICT (metric, bucket, currency) DO UPDATE SET value = value + excluded.value;
+END
+    ''',
+    '''
+CREATE TRIGGER dashboard_counters_invoices_ai AFTER INSERT ON invoices BEGIN
+    INSERT INTO dashboard_counters (metric, bucket, currency, value) SELECT 'unpaid', NEW.issue_date, COALESCE(p.currency, 'RUB'), 1 * SUM(i.amount)
+        FROM invoice_items i
+        LEFT JOIN time_entries te ON te.id = i.time_entry_id
+        LEFT
+        JOIN projects p ON p.id = te.project_id
+        WHERE i.invoice_id = NEW.id AND NEW.status IN ('sent', 'overdue')
+        GROUP BY COALESCE(p.currency, 'RUB')
+        ON CONFLICT (metric, bucket, currency) DO UPDATE SET value = value + excluded.value;
+    INSERT INTO dashboard_counters (metric, bucket, currency, value) SELECT 'overdue', '', '', 1
+        WHERE NEW.status = 'overdue'
+        ON CONFLICT (metric, bucket, currency) DO UPDATE SET value = value + excluded.value;
+END
+    ''',
+    '''
+CREATE TRIGGER dashboard_counters_invoices_au AFTER UPDATE OF status, issue_date ON invoices BEGIN
+    INSERT INTO dashboard_counters (metric, bucket, currency, value) SELECT 'unpaid', OLD.issue_date, COALESCE(p.currency, 'RUB'), -1 * SUM(i.amount)
+        FROM invoice_items i
+        LEFT JOIN time_entries te ON te.id = i.time_entry_id
+        LEFT
+        JOIN projects p ON p.id = te.project_id
+        WHERE i.invoice_id = OLD.id AND OLD.status IN ('sent', 'overdue')
+        GROUP BY COALESCE(p.currency, 'RUB')
+        ON CONFLICT (metric, bucket, currency) DO UPDATE SET value = value + excluded.value;
+    INSERT INTO dashboard_counters (metric, bucket, currency, value) SELECT 'overdue', '', '', -1
+        WHERE OLD.status = 'overdue'
+        ON CONFLICT (metric, bucket, currency) DO UPDATE SET value = value + excluded.value;
+    INSERT INTO dashboard_counters (metric, bucket, currency, value) SELECT 'unpaid', NEW.issue_date, COALESCE(p.currency, 'RUB'), 1 * SUM(i.amount)
+        FROM invoice_items i
+        LEFT JOIN time_entries te ON te.id = i.time_entry_id
+        LEFT
+        JOIN projects p ON p.id = te.project_id
+        WHERE i.invoice_id = NEW.id AND NEW.status IN ('sent', 'overdue')
+        GROUP BY COALESCE(p.currency, 'RUB')
+        ON CONFLICT (metric, bucket, currency) DO UPDATE SET value = value + excluded.value;
+    INSERT INTO dashboard_counters (metric, bucket, currency, value) SELECT 'overdue', '', '', 1
+        WHERE NEW.status = 'overdue'
+        ON CONFLICT (metric, bucket, currency) DO UPDATE SET value = value + excluded.value;
+END
+    ''',
+    '''
+CREATE TRIGGER dashboard_counters_invoices_bd BEFORE DELETE ON invoices BEGIN
+    INSERT INTO dashboard_counters (metric, bucket, currency, value) SELECT 'unpaid', OLD.issue_date, COALESCE(p.currency, 'RUB'), -1 * SUM(i.amount)
+        FROM invoice_items i
+        LEFT JOIN time_entries te ON te.id = i.time_entry_id
+        LEFT
+        JOIN projects p ON p.id = te.project_id
+        WHERE i.invoice_id = OLD.id AND OLD.status IN ('sent', 'overdue')
+        GROUP BY COALESCE(p.currency, 'RUB')
+        ON CONFLICT (metric, bucket, currency) DO UPDATE SET value = value + excluded.value;
+    INSERT INTO dashboard_counters (metric, bucket, currency, value) SELECT 'overdue', '', '', -1
+        WHERE OLD.status = 'overdue'
+        ON CONFLICT (metric, bucket, currency) DO UPDATE SET value = value + excluded.value;
+END
+    ''',
+    '''
+CREATE TRIGGER dashboard_counters_projects_au AFTER UPDATE OF hourly_rate, currency ON projects BEGIN
+    INSERT INTO dashboard_counters (metric, bucket, currency, value) SELECT 'unbilled', '', OLD.currency, -1 * SUM(te.duration_hours) * OLD.hourly_rate
+        FROM time_entries te
+        WHERE te.project_id = OLD.id AND te.status = 'confirmed' AND OLD.hourly_rate IS NOT NULL
+        GROUP BY te.project_id
+        ON CONFLICT (metric, bucket, currency) DO UPDATE SET value = value + excluded.value;
+    INSERT INTO dashboard_counters (metric, bucket, currency, value) SELECT 'unbilled_hours', '', OLD.currency, -1 * SUM(te.duration_hours)
+        FROM time_entries te
+        WHERE te.project_id = OLD.id AND te.status = 'confirmed' AND OLD.hourly_rate IS NULL
+        GROUP BY te.project_id
+        ON CONFLICT (metric, bucket, currency) DO UPDATE SET value = value + excluded.value;
+    INSERT INTO dashboard_counters (metric, bucket, currency, value) SELECT 'unbilled', '', NEW.currency, 1 * SUM(te.duration_hours) * NEW.hourly_rate
+        FROM time_entries te
+        WHERE te.project_id = NEW.id AND te.status = 'confirmed' AND NEW.hourly_rate IS NOT NULL
+        GROUP BY te.project_id
+        ON CONFLICT (metric, bucket, currency) DO UPDATE SET value = value + excluded.value;
+    INSERT INTO dashboard_counters (metric, bucket, currency, value) SELECT 'unbilled_hours', '', NEW.currency, 1 * SUM(te.duration_hours)
+        FROM time_entries te
+        WHERE te.project_id = NEW.id AND te.status = 'confirmed' AND NEW.hourly_rate IS NULL
+        GROUP BY te.project_id
+        ON CONFLICT (metric, bucket, currency) DO UPDATE SET value = value + excluded.value;
+    INSERT INTO dashboard_counters (metric, bucket, currency, value) SELECT 'unpaid', inv.issue_date, OLD.currency, -1 * SUM(i.amount)
+        FROM invoice_items i JOIN time_entries te ON te.id = i.time_entry_id
+        JOIN projects p ON p.id = te.project_id
+        JOIN invoices inv ON inv.id = i.invoice_id
+        WHERE te.project_id = OLD.id AND inv.status IN ('sent', 'overdue')
+        GROUP BY inv.issue_date
+        ON CONFLICT (metric, bucket, currency) DO UPDATE SET value = value + excluded.value;
+    INSERT INTO dashboard_counters (metric, bucket, currency, value) SELECT 'unpaid', inv.issue_date, NEW.currency, 1 * SUM(i.amount)
+        FROM invoice_items i JOIN time_entries te ON te.id = i.time_entry_id
+        JOIN projects p ON p.id = te.project_id
+        JOIN invoices inv ON inv.id = i.invoice_id
+        WHERE te.project_id = NEW.id AND inv.status IN ('sent', 'overdue')
+        GROUP BY inv.issue_date
+        ON CONFLICT (metric, bucket, currency) DO UPDATE SET value = value + excluded.value;
+END
+    ''',
+    '''
+CREATE TRIGGER dashboard_counters_projects_bd BEFORE DELETE ON projects BEGIN
+    INSERT INTO dashboard_counters (metric, bucket, currency, value) SELECT 'unbilled', '', OLD.currency, -1 * SUM(te.duration_hours) * OLD.hourly_rate
+        FROM time_entries te
+        WHERE te.project_id = OLD.id AND te.status = 'confirmed' AND OLD.hourly_rate IS NOT NULL
+        GROUP BY te.project_id
+        ON CONFLICT (metric, bucket, currency) DO UPDATE SET value = value + excluded.value;
+    INSERT INTO dashboard_counters (metric, bucket, currency, value) SELECT 'unbilled_hours', '', OLD.currency, -1 * SUM(te.duration_hours)
+        FROM time_entries te
+        WHERE te.project_id = OLD.id AND te.status = 'confirmed' AND OLD.hourly_rate IS NULL
+        GROUP BY te.project_id
+        ON CONFLICT (metric, bucket, currency) DO UPDATE SET value = value + excluded.value;
+    INSERT INTO dashboard_counters (metric, bucket, currency, value) SELECT 'unpaid', inv.issue_date, OLD.currency, -1 * SUM(i.amount)
+        FROM invoice_items i JOIN time_entries te ON te.id = i.time_entry_id
+        JOIN projects p ON p.id = te.project_id
+        JOIN invoices inv ON inv.id = i.invoice_id
+        WHERE te.project_id = OLD.id AND inv.status IN ('sent', 'overdue')
+        GROUP BY inv.issue_date
+        ON CONFLICT (metric, bucket, currency) DO UPDATE SET value = value + excluded.value;
+    INSERT INTO dashboard_counters (metric, bucket, currency, value) SELECT 'unpaid', inv.issue_date, 'RUB', 1 * SUM(i.amount)
+        FROM invoice_items i JOIN time_entries te ON te.id = i.time_entry_id
+        JOIN projects p ON p.id = te.project_id
+        JOIN invoices inv ON inv.id = i.invoice_id
+        WHERE te.project_id = OLD.id AND inv.status IN ('sent', 'overdue')
+        GROUP BY inv.issue_date
+        ON CONFLICT (metric, bucket, currency) DO UPDATE SET value = value + excluded.value;
+END
+    ''',
+]
+
+INITIAL_VALUES = """
+SELECT 'hours' AS metric, date AS bucket, '' AS currency, SUM(duration_hours) AS value
+FROM time_entries GROUP BY date
+UNION ALL
+SELECT 'unbilled', '', p.currency, SUM(te.duration_hours * p.hourly_rate)
+FROM time_entries te JOIN projects p ON p.id = te.project_id
+WHERE te.status = 'confirmed' AND p.hourly_rate IS NOT NULL GROUP BY p.currency
+UNION ALL
+SELECT 'unbilled_hours', '', p.currency, SUM(te.duration_hours)
+FROM time_entries te JOIN projects p ON p.id = te.project_id
+WHERE te.status = 'confirmed' AND p.hourly_rate IS NULL GROUP BY p.currency
+UNION ALL
+SELECT 'unpaid', inv.issue_date, COALESCE(p.currency, 'RUB'), SUM(i.amount)
+FROM invoices inv
+JOIN invoice_items i ON i.invoice_id = inv.id
+LEFT JOIN time_entries te ON te.id = i.time_entry_id
+LEFT JOIN projects p ON p.id = te.project_id
+WHERE inv.status IN ('sent', 'overdue')
+GROUP BY inv.issue_date, COALESCE(p.currency, 'RUB')
+UNION ALL
+SELECT 'overdue', '', '', COUNT(*) FROM invoices WHERE status = 'overdue'
+"""
+
+
+def upgrade() -> None:
+    op.create_table('dashboard_counters',
+    sa.Column('metric', sa.String(length=32), nullable=False),
+    sa.Column('bucket', sa.String(length=10), nullable=False),
+    sa.Column('currency', sa.String(length=3), nullable=False),
+    sa.Column('value', sa.Numeric(precision=18, scale=4), nullable=False),
+    sa.PrimaryKeyConstraint('metric', 'bucket', 'currency')
+    )
+    for ddl in TRIGGERS:
+        op.execute(ddl)
+    op.execute(f'INSERT INTO dashboard_counters (metric, bucket, currency, value) {INITIAL_VALUES}')
+
+
+def downgrade() -> None:
+    for ddl in TRIGGERS:
+        name = ddl.split()[2]
+        op.execute(f'DROP TRIGGER IF EXISTS {name}')
+    op.drop_table('dashboard_counters')
@@ -0,0 +1,59 @@
+"""quarter_hour_precision
+
+time_entries.duration_hours и invoice_items.hours: NUMERIC(5,1) → NUMERIC(5,2),
+чтобы запись таймера хранила ровно четверти часа (0.25, 0.75).
+
+SQLite не умеет ALTER COLUMN — batch пересоздаёт таблицу: старая удаляется
+вместе со своими триггерами, а переименование новой не проходит, пока триггеры
+других таблиц (счётчики дашборда) ссылаются на удалённую. Поэтому на SQLite все
+триггеры сохраняются из sqlite_master, удаляются и после пересоздания таблиц
+создаются заново.
+
+Revision ID: d2f7c4e816a9
+Revises: c5d8a1f3e9b2
+Create Date: 2026-10-19 21:14:36.502817
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2f7c4e816a9'
+down_revision: Union[str, None] = 'c5d8a1f3e9b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COLUMNS = {
+    'time_entries': 'duration_hours',
+    'invoice_items': 'hours',
+}
+
+
+def _alter(old_type: sa.Numeric, new_type: sa.Numeric) -> None:
+    bind = op.get_bind()
+    triggers = []
+    if bind.dialect.name == 'sqlite':
+        triggers = bind.execute(
+            sa.text("SELECT name, sql FROM sqlite_master WHERE type = 'trigger'")
+        ).all()
+    for name, _ in triggers:
+        op.execute(f'DROP TRIGGER {name}')
+
+    for table, column in COLUMNS.items():
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(column, existing_type=old_type, type_=new_type, existing_nullable=False)
+
+    for _, ddl in triggers:
+        op.execute(ddl)
+
+
+def upgrade() -> None:
+    _alter(sa.Numeric(precision=5, scale=1), sa.Numeric(precision=5, scale=2))
+
+
+def downgrade() -> None:
+    _alter(sa.Numeric(precision=5, scale=2), sa.Numeric(precision=5, scale=1))
@@ -0,0 +1,33 @@
+"""exchange_rates
+
+Кэш официальных курсов валют (рублей за единицу) по датам.
+
+Revision ID: e3a9d5c17f42
+Revises: b7e2c94f1a36
+Create Date: 2026-10-19 15:02:44.871930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3a9d5c17f42'
+down_revision: Union[str, None] = 'b7e2c94f1a36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('exchange_rates',
+    sa.Column('currency', sa.String(length=3), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('rate', sa.Numeric(precision=18, scale=6), nullable=False),
+    sa.PrimaryKeyConstraint('currency', 'date')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('exchange_rates')
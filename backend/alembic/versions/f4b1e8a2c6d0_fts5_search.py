@@ -0,0 +1,58 @@
+"""fts5_search
+
+Полнотекстовый поиск: FTS5-индексы (external content) по клиентам
+(name, contact_person, inn), проектам (name, description) и описаниям
+записей времени, триггеры синхронизации и индексация существующих строк.
+
+Revision ID: f4b1e8a2c6d0
+Revises: e3a9d5c17f42
+Create Date: 2026-10-19 16:10:27.640115
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4b1e8a2c6d0'
+down_revision: Union[str, None] = 'e3a9d5c17f42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TOKENIZE = "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3 4'"
+
+FTS_TABLES = {
+    'clients_fts': ('clients', ('name', 'contact_person', 'inn')),
+    'projects_fts': ('projects', ('name', 'description')),
+    'time_entries_fts': ('time_entries', ('description',)),
+}
+
+
+def upgrade() -> None:
+    for fts, (source, columns) in FTS_TABLES.items():
+        cols = ', '.join(columns)
+        new_values = ', '.join(f'new.{c}' for c in columns)
+        old_values = ', '.join(f'old.{c}' for c in columns)
+        delete_old = f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES('delete', old.id, {old_values});"
+        insert_new = f'INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_values});'
+
+        op.execute(
+            f"CREATE VIRTUAL TABLE {fts} USING fts5("
+            f"{cols}, content = '{source}', content_rowid = 'id', {TOKENIZE})"
+        )
+        op.execute(f'CREATE TRIGGER {fts}_ai AFTER INSERT ON {source} BEGIN {insert_new} END')
+        op.execute(f'CREATE TRIGGER {fts}_ad AFTER DELETE ON {source} BEGIN {delete_old} END')
+        op.execute(
+            f'CREATE TRIGGER {fts}_au AFTER UPDATE OF {cols} ON {source} '
+            f'BEGIN {delete_old} {insert_new} END'
+        )
+        op.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    for fts in FTS_TABLES:
+        for suffix in ('ai', 'ad', 'au'):
+            op.execute(f'DROP TRIGGER IF EXISTS {fts}_{suffix}')
+        op.execute(f'DROP TABLE IF EXISTS {fts}')
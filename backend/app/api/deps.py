@@ -1,20 +1,138 @@
-
 import math
 
-from fastapi import Query
+from typing import Any
+
+from fastapi import Depends, HTTPException, Query, status
+from sqlalchemy import Select, func, select
+from sqlalchemy.orm import Query as OrmQuery, Session
+
+from app.core.config import settings
+from app.rates.service import RateService, get_rate_service
+from app.schemas.common import Page
+
+
+def report_currency(
+    currency: str | None = Query(
+        None,
+        min_length=3,
+        max_length=3,
+        description="Валюта сумм (ISO-код). По умолчанию — BASE_CURRENCY",
+    ),
+    rates: RateService = Depends(get_rate_service),
+) -> str:
+    """Валюта, в которую пересчитываются суммы отчётов и дашборда."""
+    if currency is None:
+        return settings.BASE_CURRENCY.upper()
+    currency = currency.upper()
+    if not rates.is_supported(currency):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Валюта {currency} не поддерживается: для неё нет официального курса",
+        )
+    return currency
 
 
 class PaginationParams:
-    """Dependency для пагинации: ?page=1&size=20."""
+    """Dependency для пагинации: ?page=1&size=20&include_total=true."""
 
     def __init__(
         self,
         page: int = Query(1, ge=1, description="Номер страницы (начиная с 1)"),
         size: int = Query(20, ge=1, le=100, description="Размер страницы (макс. 100)"),
+        include_total: bool = Query(
+            True,
+            description="Считать общее количество. false — без подсчёта (total и pages = null), только has_next",
+        ),
     ):
         self.page = page
         self.size = size
+        self.include_total = include_total
         self.offset = (page - 1) * size
 
     def pages(self, total: int) -> int:
         return math.ceil(total / self.size) if total else 0
+
+    def paginate(self, q: OrmQuery, *order_by) -> Page:
+        """
+        Страница + total одним запросом.
+
+        total считается оконной функцией COUNT(*) OVER () в том же SELECT,
+        что и страница, — без отдельного q.count() (который SQLAlchemy
+        оборачивает в подзапрос и заново вычисляет все фильтры).
+        При include_total=false выбирается size + 1 строк, лишняя строка
+        лишь сообщает, есть ли следующая страница.
+        """
+        q = q.order_by(*order_by)
+
+        if not self.include_total:
+            rows = q.offset(self.offset).limit(self.size + 1).all()
+            return Page.create(
+                items=rows[: self.size],
+                total=None,
+                page=self.page,
+                size=self.size,
+                has_next=len(rows) > self.size,
+            )
+
+        rows = (
+            q.add_columns(func.count().over().label("_total"))
+            .offset(self.offset)
+            .limit(self.size)
+            .all()
+        )
+        if rows:
+            total = rows[0]._total
+        elif self.offset == 0:
+            total = 0
+        else:
+            # Страница за пределами результата — окно пустое, считаем отдельно
+            total = q.order_by(None).count()
+
+        return Page.create(
+            items=[row[0] for row in rows],
+            total=total,
+            page=self.page,
+            size=self.size,
+        )
+
+    def paginate_rows(self, db: Session, stmt: Select, *order_by) -> dict[str, Any]:
+        """
+        Быстрый путь: то же, что paginate(), но для Core SELECT по колонкам.
+
+        Возвращает готовый к сериализации dict в форме Page, где items —
+        словари строк (без ORM-объектов и Pydantic-валидации).
+        """
+        stmt = stmt.order_by(*order_by)
+
+        if not self.include_total:
+            rows = db.execute(stmt.offset(self.offset).limit(self.size + 1)).mappings().all()
+            return self._page_dict([dict(r) for r in rows[: self.size]], None, len(rows) > self.size)
+
+        rows = db.execute(
+            stmt.add_columns(func.count().over().label("_total"))
+            .offset(self.offset)
+            .limit(self.size)
+        ).mappings().all()
+        if rows:
+            total = rows[0]["_total"]
+        elif self.offset == 0:
+            total = 0
+        else:
+            total = db.scalar(select(func.count()).select_from(stmt.order_by(None).subquery()))
+
+        items = []
+        for row in rows:
+            item = dict(row)
+            del item["_total"]
+            items.append(item)
+        return self._page_dict(items, total, self.offset + len(items) < total)
+
+    def _page_dict(self, items: list[dict], total: int | None, has_next: bool) -> dict[str, Any]:
+        return {
+            "items": items,
+            "total": total,
+            "page": self.page,
+            "size": self.size,
+            "pages": self.pages(total) if total is not None else None,
+            "has_next": has_next,
+        }
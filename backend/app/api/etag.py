@@ -0,0 +1,97 @@
+"""Условные GET-запросы (ETag / If-None-Match) по версиям таблиц."""
+
+import hashlib
+from datetime import date
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.models.data_version import read_versions
+
+
+def compute_etag(tables: tuple[str, ...]) -> str:
+    """
+    ETag = хэш версий таблиц, от которых зависит ответ.
+
+    В хэш входят версия приложения (сменился формат ответа — сменился ETag)
+    и текущая дата: дашборд считает «эту неделю» и просрочку от сегодняшнего
+    дня, поэтому с новым днём ответ должен пересчитаться даже без записей.
+    """
+    with SessionLocal() as db:
+        versions = read_versions(db, tables)
+    key = ";".join(
+        [settings.VERSION, date.today().isoformat()]
+        + [f"{name}={version}" for name, version in zip(tables, versions)]
+    )
+    return '"' + hashlib.blake2b(key.encode(), digest_size=8).hexdigest() + '"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class ETagMiddleware:
+    """
+    ETag и 304 Not Modified для GET-ресурсов, перечисленных в ``resources``.
+
+    ``resources`` — префикс пути → таблицы, от которых зависит ответ;
+    ``exclude`` — пути внутри этих префиксов без ETag (потоковые ответы).
+    ETag считается до вызова роута одним маленьким SELECT по data_versions,
+    поэтому при совпадении If-None-Match не выполняются ни тяжёлые запросы
+    роута, ни сериализация. Cache-Control: no-cache заставляет браузер
+    каждый раз переспрашивать сервер с If-None-Match.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        resources: dict[str, tuple[str, ...]],
+        exclude: tuple[str, ...] = (),
+    ) -> None:
+        self.app = app
+        self.resources = resources
+        self.exclude = exclude
+
+    def _tables_for(self, path: str) -> tuple[str, ...] | None:
+        if path in self.exclude:
+            return None
+        for prefix, tables in self.resources.items():
+            if path == prefix or path.startswith(prefix + "/"):
+                return tables
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+
+        tables = self._tables_for(scope["path"])
+        if tables is None:
+            await self.app(scope, receive, send)
+            return
+
+        etag = await run_in_threadpool(compute_etag, tables)
+        cache_headers = [
+            (b"etag", etag.encode()),
+            (b"cache-control", b"no-cache"),
+        ]
+
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        if if_none_match and _etag_matches(if_none_match, etag):
+            await send({"type": "http.response.start", "status": 304, "headers": cache_headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_etag(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                message["headers"] = list(message.get("headers", [])) + cache_headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
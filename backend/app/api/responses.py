@@ -0,0 +1,29 @@
+"""orjson-based JSON responses."""
+
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import ORJSONResponse
+
+
+def _default(value: Any) -> Any:
+    # Pydantic v2 сериализует Decimal в JSON строкой — повторяем это поведение,
+    # чтобы быстрый путь и обычный response_model отдавали одинаковый JSON
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class FastJSONResponse(ORJSONResponse):
+    """
+    Ответ по умолчанию для всего API.
+
+    Для обычных роутов FastAPI сначала приводит результат к JSON-совместимым
+    типам через response_model, а orjson лишь быстрее кодирует результат.
+    Быстрый путь списков (rows → dict) отдаёт содержимое напрямую: date/datetime/enum
+    orjson кодирует сам, Decimal — через _default.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
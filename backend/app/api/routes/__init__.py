@@ -8,6 +8,9 @@ from app.api.routes.time_entries import router as time_entries_router
 from app.api.routes.invoices import router as invoices_router
 from app.api.routes.dashboard import router as dashboard_router
 from app.api.routes.reports import router as reports_router
+from app.api.routes.search import router as search_router
+from app.api.routes.timers import router as timers_router
+from app.api.routes.ledger import router as ledger_router
 
 router = APIRouter()
 
@@ -19,3 +22,6 @@ router.include_router(time_entries_router, prefix="/time-entries", tags=["Зап
 router.include_router(invoices_router, prefix="/invoices", tags=["Счета"])
 router.include_router(dashboard_router, prefix="/dashboard", tags=["Дашборд"])
 router.include_router(reports_router, prefix="/reports", tags=["Отчёты"])
+router.include_router(search_router, prefix="/search", tags=["Поиск"])
+router.include_router(timers_router, prefix="/timers", tags=["Таймеры"])
+router.include_router(ledger_router, prefix="/ledger", tags=["Выгрузка"])
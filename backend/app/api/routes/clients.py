@@ -1,10 +1,12 @@
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.api.deps import PaginationParams
 from app.db.database import get_db
 from app.models.client import Client
+from app.models.fts import clients_fts, match_expression, matches
 from app.schemas.client import ClientCreate, ClientRead, ClientUpdate
 from app.schemas.common import Page
 
@@ -27,16 +29,16 @@ def _get_or_404(client_id: int, db: Session) -> Client:
     summary="Список клиентов",
 )
 def list_clients(
-    search: str | None = Query(None, description="Поиск по названию клиента"),
+    search: str | None = Query(
+        None, description="Поиск по названию, контактному лицу и ИНН (по началу слов)"
+    ),
     pagination: PaginationParams = Depends(),
     db: Session = Depends(get_db),
 ) -> Page[ClientRead]:
     q = db.query(Client)
-    if search:
-        q = q.filter(Client.name.ilike(f"%{search}%"))
-    total = q.count()
-    items = q.order_by(Client.name).offset(pagination.offset).limit(pagination.size).all()
-    return Page.create(items=items, total=total, page=pagination.page, size=pagination.size)
+    if search and (match := match_expression(search)):
+        q = q.filter(Client.id.in_(select(clients_fts.c.rowid).where(matches(clients_fts, match))))
+    return pagination.paginate(q, Client.name)
 
 
 @router.post(
@@ -2,21 +2,40 @@
 
 from __future__ import annotations
 
+import logging
 from datetime import date, timedelta
 from decimal import Decimal
+from typing import Any, AsyncIterator
 
+import orjson
 from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from sqlalchemy import func, or_
+from sqlalchemy import and_, or_
 from sqlalchemy.orm import Session, joinedload, selectinload
+from starlette.concurrency import run_in_threadpool
 
-from app.db.database import get_db
-from app.models.enums import InvoiceStatus, TimeEntryStatus
+from app.api.deps import report_currency
+from app.api.routes.timers import list_timers
+from app.core.broadcast import changes
+from app.core.cache import VersionedCache
+from app.db.database import SessionLocal, get_db
+from app.models.dashboard_counter import (
+    HOURS,
+    OVERDUE,
+    UNBILLED,
+    UNBILLED_HOURS,
+    UNPAID,
+    DashboardCounter,
+)
 from app.models.invoice import Invoice
-from app.models.invoice_item import InvoiceItem
 from app.models.lawyer_profile import LawyerProfile
 from app.models.project import Project
 from app.models.time_entry import TimeEntry
+from app.rates.service import RateService, RateUnavailableError, get_rate_service
+from app.schemas.timer import TimerRead
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -47,6 +66,7 @@ class RecentInvoice(BaseModel):
 
 
 class DashboardResponse(BaseModel):
+    currency: str  # валюта unbilled_amount / unpaid_amount
     hours_this_week: float
     hours_this_month: float
     unbilled_amount: float
@@ -58,68 +78,183 @@ class DashboardResponse(BaseModel):
 
 # ── Endpoint ──────────────────────────────────────────────────────────────────
 
+# Пересчёт только при изменении одной из таблиц (в любом воркере) или смене дня
+_DASHBOARD_CACHE: VersionedCache[DashboardResponse] = VersionedCache(
+    ("time_entries", "projects", "clients", "invoices", "invoice_items", "lawyer_profiles")
+)
+
+
 @router.get("", response_model=DashboardResponse, summary="Данные для дашборда")
-def get_dashboard(db: Session = Depends(get_db)) -> DashboardResponse:
+def get_dashboard(
+    currency: str = Depends(report_currency),
+    rates: RateService = Depends(get_rate_service),
+    db: Session = Depends(get_db),
+) -> DashboardResponse:
+    today = date.today()
+    return _DASHBOARD_CACHE.get_or_compute(
+        db, (currency, today), lambda: _build_dashboard(db, currency, rates, today)
+    )
+
+
+# ── Live stream (SSE) ─────────────────────────────────────────────────────────
+
+# Комментарий-пинг, чтобы прокси не закрывали простаивающее соединение
+_KEEPALIVE_SECONDS = 15.0
+
+
+@router.get(
+    "/stream",
+    response_class=StreamingResponse,
+    summary="Поток обновлений дашборда (SSE)",
+    description=(
+        "Server-Sent Events. Сначала `dashboard` — полный снимок (как GET /dashboard) "
+        "и `timers` — запущенные таймеры. Затем при изменениях: `delta` — только "
+        "изменившиеся поля дашборда, `timers` — новый список таймеров."
+    ),
+    responses={200: {"content": {"text/event-stream": {}}, "description": "Поток событий"}},
+)
+async def stream_dashboard(
+    currency: str = Depends(report_currency),
+    rates: RateService = Depends(get_rate_service),
+) -> StreamingResponse:
+    # Первый снимок — до начала потока, чтобы ошибка курса стала обычным 503
+    snapshot = await run_in_threadpool(_dashboard_snapshot, currency, rates)
+    return StreamingResponse(
+        _dashboard_events(snapshot, currency, rates),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _dashboard_events(
+    sent: dict[str, Any], currency: str, rates: RateService
+) -> AsyncIterator[str]:
+    async with changes.subscribe() as subscription:
+        yield _sse("dashboard", sent)
+        sent_timers = await run_in_threadpool(_timers_snapshot)
+        yield _sse("timers", sent_timers)
+        today = date.today()
+
+        while True:
+            tables = await subscription.wait(_KEEPALIVE_SECONDS)
+            # С новым днём меняются «эта неделя / этот месяц» — без записей в БД
+            new_day = date.today() != today
+            if not tables and not new_day:
+                yield ": ping\n\n"
+                continue
+
+            if new_day or not tables.isdisjoint(_DASHBOARD_CACHE.tables):
+                today = date.today()
+                try:
+                    current = await run_in_threadpool(_dashboard_snapshot, currency, rates)
+                except RateUnavailableError:
+                    logger.warning("Дашборд не пересчитан: нет курса %s", currency)
+                else:
+                    delta = {key: value for key, value in current.items() if sent.get(key) != value}
+                    if delta:
+                        yield _sse("delta", delta)
+                        sent = current
+
+            if "active_timers" in tables:
+                # Свой коммит приходит дважды (after_commit и опрос data_versions)
+                timers = await run_in_threadpool(_timers_snapshot)
+                if timers != sent_timers:
+                    yield _sse("timers", timers)
+                    sent_timers = timers
+
+
+def _sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {orjson.dumps(data).decode()}\n\n"
+
+
+def _dashboard_snapshot(currency: str, rates: RateService) -> dict[str, Any]:
+    # Общий кэш: при изменении все открытые потоки воркера получают
+    # один пересчёт на всех, а не по пересчёту на вкладку
     today = date.today()
+    with SessionLocal() as db:
+        dashboard = _DASHBOARD_CACHE.get_or_compute(
+            db, (currency, today), lambda: _build_dashboard(db, currency, rates, today)
+        )
+    return dashboard.model_dump(mode="json")
+
+
+def _timers_snapshot() -> list[dict[str, Any]]:
+    with SessionLocal() as db:
+        return [
+            TimerRead.model_validate(timer).model_dump(mode="json")
+            for timer in list_timers(project_id=None, db=db)
+        ]
+
+
+def _build_dashboard(db: Session, currency: str, rates: RateService, today: date) -> DashboardResponse:
     week_start = today - timedelta(days=today.weekday())
     month_start = today.replace(day=1)
 
-    # ── Hours this week
-    hours_week = float(
-        db.query(func.coalesce(func.sum(TimeEntry.duration_hours), 0))
-        .filter(TimeEntry.date >= week_start, TimeEntry.date <= today)
-        .scalar() or 0
+    # Метрики — из dashboard_counters (поддерживаются триггерами), без
+    # агрегатов по истории: десятки строк при любом объёме данных
+    counters = (
+        db.query(
+            DashboardCounter.metric,
+            DashboardCounter.bucket,
+            DashboardCounter.currency,
+            DashboardCounter.value,
+        )
+        .filter(
+            or_(
+                and_(
+                    DashboardCounter.metric == HOURS,
+                    DashboardCounter.bucket >= min(week_start, month_start).isoformat(),
+                    DashboardCounter.bucket <= today.isoformat(),
+                ),
+                DashboardCounter.metric.in_([UNBILLED, UNBILLED_HOURS, UNPAID, OVERDUE]),
+            )
+        )
+        .all()
     )
 
-    # ── Hours this month
-    hours_month = float(
-        db.query(func.coalesce(func.sum(TimeEntry.duration_hours), 0))
-        .filter(TimeEntry.date >= month_start, TimeEntry.date <= today)
-        .scalar() or 0
+    # ── Hours this week / this month
+    hours_week = sum(
+        float(value) for metric, bucket, _, value in counters
+        if metric == HOURS and bucket >= week_start.isoformat()
+    )
+    hours_month = sum(
+        float(value) for metric, bucket, _, value in counters
+        if metric == HOURS and bucket >= month_start.isoformat()
     )
 
-    # ── Unbilled amount (confirmed entries × rate)
+    # ── Unbilled amount (confirmed entries × rate), по курсу на сегодня.
+    # Часы проектов без ставки умножаются на ставку профиля здесь
     profile = db.query(LawyerProfile).first()
     default_rate = profile.default_hourly_rate if profile else Decimal("0")
 
-    confirmed_entries = (
-        db.query(TimeEntry)
-        .options(joinedload(TimeEntry.project))
-        .filter(TimeEntry.status == TimeEntryStatus.confirmed)
-        .all()
+    unbilled_by_currency: dict[str, Decimal] = {}
+    for metric, _, cur, value in counters:
+        if metric in (UNBILLED, UNBILLED_HOURS):
+            amount = Decimal(value) * (default_rate if metric == UNBILLED_HOURS else 1)
+            unbilled_by_currency[cur] = unbilled_by_currency.get(cur, Decimal(0)) + amount
+
+    # ── Unpaid amount (sent + overdue invoices), по курсу на дату счёта
+    unpaid_by_currency = [
+        (cur, date.fromisoformat(bucket), value)
+        for metric, bucket, cur, value in counters
+        if metric == UNPAID
+    ]
+
+    factors = rates.factors(
+        db,
+        {(cur, today) for cur in unbilled_by_currency}
+        | {(cur, day) for cur, day, _ in unpaid_by_currency},
+        currency,
     )
     unbilled_amount = sum(
-        float(e.duration_hours) * float(
-            e.project.hourly_rate
-            if (e.project and e.project.hourly_rate is not None)
-            else default_rate
-        )
-        for e in confirmed_entries
-    )
-
-    # ── Unpaid amount (sent + overdue invoices)
-    unpaid_invoices = (
-        db.query(Invoice)
-        .options(selectinload(Invoice.items))
-        .filter(Invoice.status.in_([InvoiceStatus.sent, InvoiceStatus.overdue]))
-        .all()
+        float(amount) * float(factors[(cur, today)]) for cur, amount in unbilled_by_currency.items()
     )
     unpaid_amount = sum(
-        sum(float(item.amount) for item in inv.items)
-        for inv in unpaid_invoices
+        float(amount) * float(factors[(cur, day)]) for cur, day, amount in unpaid_by_currency
     )
 
-    # ── Overdue count (explicitly overdue OR sent past due_date)
-    overdue_count = int(
-        db.query(func.count(Invoice.id))
-        .filter(
-            or_(
-                Invoice.status == InvoiceStatus.overdue,
-                (Invoice.status == InvoiceStatus.sent) & (Invoice.due_date < today),
-            )
-        )
-        .scalar() or 0
-    )
+    # ── Overdue count (статус ставит фоновая задача app.tasks.overdue)
+    overdue_count = int(sum(value for metric, _, _, value in counters if metric == OVERDUE))
 
     # ── Recent 5 time entries (with project + client)
     recent_entries_orm = (
@@ -171,6 +306,7 @@ def get_dashboard(db: Session = Depends(get_db)) -> DashboardResponse:
     ]
 
     return DashboardResponse(
+        currency=currency,
         hours_this_week=round(hours_week, 1),
         hours_this_month=round(hours_month, 1),
         unbilled_amount=round(unbilled_amount, 2),
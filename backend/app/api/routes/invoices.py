@@ -1,22 +1,30 @@
 
+import logging
 from datetime import date
 from decimal import Decimal
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
 from fastapi.responses import Response
+from sqlalchemy import select
 from sqlalchemy.orm import Session, selectinload
 
 from app.api.deps import PaginationParams
-from app.db.database import get_db
+from app.api.responses import FastJSONResponse
+from app.core.config import settings
+from app.db.database import SessionLocal, get_db
 from app.models.client import Client
 from app.models.enums import InvoiceStatus, TimeEntryStatus
 from app.models.invoice import Invoice
 from app.models.invoice_item import InvoiceItem
 from app.models.lawyer_profile import LawyerProfile
+from app.models.project import Project
 from app.models.time_entry import TimeEntry
 from app.schemas.common import Page
 from app.schemas.invoice import InvoiceCreateRequest, InvoiceRead, InvoiceUpdate
+from app.tasks.overdue import sent_status
+from app.pdf import storage as pdf_storage
 from app.pdf.generator import (
+    invoice_pdf_key,
     render_invoice_pdf,
     InvoiceData,
     InvoiceItemData,
@@ -24,6 +32,8 @@ from app.pdf.generator import (
     ClientData,
 )
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 _LOAD_ITEMS = (
@@ -33,6 +43,49 @@ _LOAD_ITEMS = (
 )
 
 
+# Колонки в порядке полей InvoiceRead / InvoiceItemRead — для быстрого пути списка
+_READ_COLUMNS = (
+    Invoice.id,
+    Invoice.client_id,
+    Invoice.invoice_number,
+    Invoice.issue_date,
+    Invoice.due_date,
+    Invoice.status,
+    Invoice.notes,
+    Invoice.created_at,
+)
+
+_ITEM_READ_COLUMNS = (
+    InvoiceItem.invoice_id,
+    InvoiceItem.id,
+    InvoiceItem.time_entry_id,
+    InvoiceItem.hours,
+    InvoiceItem.rate,
+    InvoiceItem.amount,
+    TimeEntry.date,
+    Project.name.label("project_name"),
+    TimeEntry.description,
+)
+
+
+def _items_by_invoice(db: Session, invoice_ids: list[int]) -> dict[int, list[dict]]:
+    """Позиции счетов одним запросом (с датой/проектом/описанием из записи времени)."""
+    result: dict[int, list[dict]] = {invoice_id: [] for invoice_id in invoice_ids}
+    if not invoice_ids:
+        return result
+    rows = db.execute(
+        select(*_ITEM_READ_COLUMNS)
+        .outerjoin(TimeEntry, TimeEntry.id == InvoiceItem.time_entry_id)
+        .outerjoin(Project, Project.id == TimeEntry.project_id)
+        .where(InvoiceItem.invoice_id.in_(invoice_ids))
+        .order_by(InvoiceItem.id)
+    ).mappings()
+    for row in rows:
+        item = dict(row)
+        result[item.pop("invoice_id")].append(item)
+    return result
+
+
 def _get_or_404(invoice_id: int, db: Session) -> Invoice:
     invoice = db.query(Invoice).options(_LOAD_ITEMS).filter(Invoice.id == invoice_id).first()
     if invoice is None:
@@ -63,26 +116,26 @@ def list_invoices(
     date_to: date | None = Query(None, description="Дата выставления — конец периода"),
     pagination: PaginationParams = Depends(),
     db: Session = Depends(get_db),
-) -> Page[InvoiceRead]:
-    q = db.query(Invoice).options(_LOAD_ITEMS)
+) -> FastJSONResponse:
+    # Быстрый путь: страница счетов и все их позиции — двумя запросами по
+    # колонкам, без ORM-объектов и Pydantic-валидации. Форма — Page[InvoiceRead].
+    stmt = select(*_READ_COLUMNS)
 
     if client_id is not None:
-        q = q.filter(Invoice.client_id == client_id)
+        stmt = stmt.where(Invoice.client_id == client_id)
     if invoice_status is not None:
-        q = q.filter(Invoice.status == invoice_status)
+        stmt = stmt.where(Invoice.status == invoice_status)
     if date_from is not None:
-        q = q.filter(Invoice.issue_date >= date_from)
+        stmt = stmt.where(Invoice.issue_date >= date_from)
     if date_to is not None:
-        q = q.filter(Invoice.issue_date <= date_to)
+        stmt = stmt.where(Invoice.issue_date <= date_to)
 
-    total = q.count()
-    items = (
-        q.order_by(Invoice.issue_date.desc(), Invoice.id.desc())
-        .offset(pagination.offset)
-        .limit(pagination.size)
-        .all()
-    )
-    return Page.create(items=items, total=total, page=pagination.page, size=pagination.size)
+    page = pagination.paginate_rows(db, stmt, Invoice.issue_date.desc(), Invoice.id.desc())
+    items = _items_by_invoice(db, [inv["id"] for inv in page["items"]])
+    for inv in page["items"]:
+        inv["items"] = items[inv["id"]]
+        inv["total_amount"] = sum((item["amount"] for item in inv["items"]), Decimal("0"))
+    return FastJSONResponse(page)
 
 
 @router.post(
@@ -103,6 +156,7 @@ def list_invoices(
 )
 def create_invoice(
     data: InvoiceCreateRequest,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
 ) -> Invoice:
     # Validate client
@@ -167,6 +221,8 @@ def create_invoice(
         entry.status = TimeEntryStatus.billed
 
     db.commit()
+    # Черновик обычно сразу открывают для проверки — PDF готовим заранее
+    background_tasks.add_task(_prerender_invoice_pdf, invoice.id)
 
     # Reload with items to satisfy response_model
     return db.query(Invoice).options(_LOAD_ITEMS).filter(Invoice.id == invoice.id).one()
@@ -234,25 +290,37 @@ def delete_invoice(invoice_id: int, db: Session = Depends(get_db)) -> None:
 
     db.delete(invoice)
     db.commit()
+    pdf_storage.discard(invoice_id)
 
 
 @router.post(
     "/{invoice_id}/send",
     response_model=InvoiceRead,
     summary="Отправить счёт",
-    description="Переводит счёт из статуса **draft** в **sent**.",
+    description=(
+        "Переводит счёт из статуса **draft** в **sent** "
+        "(в **overdue**, если срок оплаты уже прошёл). "
+        "PDF счёта рендерится в фоне после ответа — скачивание отдаёт готовый файл."
+    ),
     responses={
         404: {"description": "Счёт не найден"},
         409: {"description": "Счёт не в статусе draft"},
     },
 )
-def send_invoice(invoice_id: int, db: Session = Depends(get_db)) -> Invoice:
+def send_invoice(
+    invoice_id: int,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+) -> Invoice:
     invoice = _get_or_404(invoice_id, db)
     _require_draft(invoice)
 
-    invoice.status = InvoiceStatus.sent
+    invoice.status = sent_status(invoice.due_date)
     db.commit()
     db.refresh(invoice)
+    # Файл черновика с теми же данными подойдёт как есть (статус не в ключе);
+    # если его нет или данные менялись — рендер после ответа
+    background_tasks.add_task(_prerender_invoice_pdf, invoice.id)
     return invoice
 
 
@@ -260,19 +328,22 @@ def send_invoice(invoice_id: int, db: Session = Depends(get_db)) -> Invoice:
     "/{invoice_id}/pay",
     response_model=InvoiceRead,
     summary="Отметить счёт как оплаченный",
-    description="Переводит счёт из статуса **sent** в **paid**.",
+    description="Переводит счёт из статуса **sent** или **overdue** в **paid**.",
     responses={
         404: {"description": "Счёт не найден"},
-        409: {"description": "Счёт не в статусе sent"},
+        409: {"description": "Счёт не в статусе sent / overdue"},
     },
 )
 def pay_invoice(invoice_id: int, db: Session = Depends(get_db)) -> Invoice:
     invoice = _get_or_404(invoice_id, db)
 
-    if invoice.status != InvoiceStatus.sent:
+    if invoice.status not in (InvoiceStatus.sent, InvoiceStatus.overdue):
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
-            detail=f"Оплатить можно только счёт в статусе sent. Текущий статус: {invoice.status.value}",
+            detail=(
+                "Оплатить можно только счёт в статусе sent или overdue. "
+                f"Текущий статус: {invoice.status.value}"
+            ),
         )
 
     invoice.status = InvoiceStatus.paid
@@ -281,18 +352,7 @@ def pay_invoice(invoice_id: int, db: Session = Depends(get_db)) -> Invoice:
     return invoice
 
 
-@router.get(
-    "/{invoice_id}/pdf",
-    summary="Скачать счёт в PDF",
-    response_class=Response,
-    responses={
-        200: {"content": {"application/pdf": {}}, "description": "PDF-файл счёта"},
-        404: {"description": "Счёт не найден"},
-    },
-)
-def download_invoice_pdf(invoice_id: int, db: Session = Depends(get_db)) -> Response:
-    invoice = _get_or_404(invoice_id, db)
-
+def _invoice_pdf_data(db: Session, invoice: Invoice) -> tuple[InvoiceData, ProfileData, ClientData]:
     client = db.get(Client, invoice.client_id)
     if client is None:
         raise HTTPException(status_code=404, detail="Клиент не найден")
@@ -363,11 +423,54 @@ def download_invoice_pdf(invoice_id: int, db: Session = Depends(get_db)) -> Resp
         total_amount=sum(i.amount for i in items),
     )
 
-    pdf_bytes = render_invoice_pdf(
-        invoice=invoice_data,
-        profile=profile_data,
-        client=client_data,
-    )
+    return invoice_data, profile_data, client_data
+
+
+def _invoice_pdf(db: Session, invoice: Invoice) -> bytes:
+    """PDF из PDF_CACHE_DIR; при промахе — рендер и сохранение."""
+    invoice_data, profile_data, client_data = _invoice_pdf_data(db, invoice)
+    key = invoice_pdf_key(invoice_data, profile_data, client_data)
+
+    pdf_bytes = pdf_storage.load(invoice.id, key)
+    if pdf_bytes is None:
+        pdf_bytes = render_invoice_pdf(
+            invoice=invoice_data,
+            profile=profile_data,
+            client=client_data,
+        )
+        pdf_storage.save(invoice.id, key, pdf_bytes)
+    return pdf_bytes
+
+
+def _prerender_invoice_pdf(invoice_id: int) -> None:
+    """
+    Фоновая задача после ответа: отрендерить PDF заранее, чтобы первое
+    скачивание (обычно через секунды после отправки) отдало готовый файл.
+    """
+    if not settings.PDF_CACHE_DIR:
+        return
+    try:
+        with SessionLocal() as db:
+            invoice = db.query(Invoice).options(_LOAD_ITEMS).filter(Invoice.id == invoice_id).first()
+            if invoice is not None:
+                _invoice_pdf(db, invoice)
+    except Exception:
+        # Скачивание отрендерит синхронно — ошибка фона не должна теряться молча
+        logger.exception("Не удалось заранее отрендерить PDF счёта id=%d", invoice_id)
+
+
+@router.get(
+    "/{invoice_id}/pdf",
+    summary="Скачать счёт в PDF",
+    response_class=Response,
+    responses={
+        200: {"content": {"application/pdf": {}}, "description": "PDF-файл счёта"},
+        404: {"description": "Счёт не найден"},
+    },
+)
+def download_invoice_pdf(invoice_id: int, db: Session = Depends(get_db)) -> Response:
+    invoice = _get_or_404(invoice_id, db)
+    pdf_bytes = _invoice_pdf(db, invoice)
 
     filename = f"{invoice.invoice_number}.pdf"
     return Response(
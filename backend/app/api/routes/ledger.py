@@ -0,0 +1,59 @@
+"""Ledger export — time entries, invoices and items as Parquet / Arrow IPC."""
+
+from __future__ import annotations
+
+from datetime import date
+
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+
+from app.export.ledger import (
+    MEDIA_TYPES,
+    LedgerFormat,
+    LedgerTable,
+    require_pyarrow,
+    stream_table,
+)
+
+router = APIRouter()
+
+
+@router.get(
+    "/{table}",
+    summary="Выгрузка таблицы учёта (Parquet / Arrow IPC)",
+    description=(
+        "Записи времени, счета или позиции счетов с названиями клиента и проекта — "
+        "для pandas / Polars / DuckDB. Файл передаётся потоком, по row group на пачку "
+        "строк; память сервера не зависит от объёма. Период — по дате записи, "
+        "для счетов и позиций — по дате счёта. Выгрузка по месяцам в каталоги — "
+        "CLI `python -m app.export.ledger`."
+    ),
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "content": {media_type: {} for media_type in MEDIA_TYPES.values()},
+            "description": "Файл выгрузки",
+        },
+        501: {"description": "На сервере не установлен pyarrow"},
+    },
+)
+def export_ledger_table(
+    table: LedgerTable,
+    export_format: LedgerFormat = Query(LedgerFormat.parquet, alias="format", description="Формат файла"),
+    date_from: date | None = Query(None, description="Начало периода"),
+    date_to: date | None = Query(None, description="Конец периода"),
+) -> StreamingResponse:
+    try:
+        require_pyarrow()
+    except ImportError:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Выгрузка в Parquet / Arrow требует pyarrow на сервере",
+        )
+
+    filename = f"{table.value}.{export_format.value}"
+    return StreamingResponse(
+        stream_table(table, export_format, date_from, date_to),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
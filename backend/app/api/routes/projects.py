@@ -80,14 +80,7 @@ def list_projects(
         q = q.filter(Project.client_id == client_id)
     if status_filter is not None:
         q = q.filter(Project.status == status_filter)
-    total = q.count()
-    items = (
-        q.order_by(Project.created_at.desc())
-        .offset(pagination.offset)
-        .limit(pagination.size)
-        .all()
-    )
-    return Page.create(items=items, total=total, page=pagination.page, size=pagination.size)
+    return pagination.paginate(q, Project.created_at.desc())
 
 
 @router.post(
@@ -2,15 +2,36 @@
 
 from __future__ import annotations
 
-from datetime import date
+import enum
+from datetime import date, timedelta
 from decimal import Decimal
+from typing import Any, Iterator
 
-from fastapi import APIRouter, Depends, Query
-from fastapi.responses import Response
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
-from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import (
+    ColumnElement,
+    Date,
+    Integer,
+    String,
+    and_,
+    case,
+    cast,
+    extract,
+    func,
+    literal,
+    or_,
+    select,
+    type_coerce,
+)
+from sqlalchemy.orm import Session
 
+from app.api.deps import report_currency
+from app.core.cache import VersionedCache
+from app.core.config import settings
 from app.db.database import get_db
+from app.export.xlsx import XLSX_MEDIA_TYPE, XlsxStreamWriter
 from app.models.client import Client
 from app.models.enums import InvoiceStatus, TimeEntryStatus
 from app.models.invoice import Invoice
@@ -19,12 +40,21 @@ from app.models.lawyer_profile import LawyerProfile
 from app.models.project import Project
 from app.models.time_entry import TimeEntry
 from app.pdf.report_generator import (
+    AgingReportData,
+    AgingRow,
+    ComparisonClientRow,
+    ComparisonData,
+    ComparisonPeriod,
+    ComparisonProjectRow,
     InvoiceSummaryData,
     ReportClientRow,
     ReportData,
     ReportProjectRow,
+    render_aging_pdf,
+    render_comparison_pdf,
     render_report_pdf,
 )
+from app.rates.service import CURRENCY_SYMBOLS, RUB, RateService, get_rate_service
 
 router = APIRouter()
 
@@ -37,6 +67,8 @@ class ProjectBreakdown(BaseModel):
     entries_count: int
     hours: float
     amount: float
+    currency: str  # валюта проекта
+    original_amount: float  # сумма в валюте проекта
 
 
 class ClientBreakdown(BaseModel):
@@ -61,73 +93,173 @@ class ReportResponse(BaseModel):
     date_from: date
     date_to: date
     client_id: int | None
+    currency: str  # валюта всех сумм отчёта
     total_hours: float
     total_amount: float
     breakdown: list[ClientBreakdown]
     invoice_summary: InvoiceSummary
 
 
+class ReportFormat(str, enum.Enum):
+    json = "json"
+    xlsx = "xlsx"
+
+
+class Granularity(str, enum.Enum):
+    day = "day"
+    week = "week"  # ISO-неделя, начало — понедельник
+    month = "month"
+
+
+class TimeseriesPoint(BaseModel):
+    period_start: date
+    entries_count: int
+    hours: float
+    amount: float
+
+
+class TimeseriesResponse(BaseModel):
+    granularity: Granularity
+    date_from: date
+    date_to: date
+    currency: str  # валюта всех сумм
+    total_hours: float
+    total_amount: float
+    points: list[TimeseriesPoint]  # все периоды диапазона, пустые — с нулями
+
+
+class AgingBuckets(BaseModel):
+    """Неоплаченные суммы по дням просрочки (от due_date до as_of)."""
+
+    current: float  # срок оплаты ещё не наступил
+    days_0_30: float
+    days_31_60: float
+    days_61_90: float
+    days_90_plus: float
+    total: float
+
+
+class AgingClientRow(BaseModel):
+    client_id: int
+    client_name: str
+    invoices_count: int
+    amounts: AgingBuckets
+
+
+class AgingResponse(BaseModel):
+    as_of: date
+    client_id: int | None
+    currency: str  # валюта всех сумм
+    invoices_count: int
+    totals: AgingBuckets
+    clients: list[AgingClientRow]  # по убыванию суммы
+
+
+class ComparePeriod(BaseModel):
+    date_from: date
+    date_to: date
+    hours: float
+    amount: float
+
+
+class CompareProjectRow(BaseModel):
+    project_id: int
+    project_name: str
+    currency: str  # валюта проекта
+    hours: list[float]  # по периодам, в порядке periods
+    amount: list[float]
+
+
+class CompareClientRow(BaseModel):
+    client_id: int
+    client_name: str
+    hours: list[float]
+    amount: list[float]
+    projects: list[CompareProjectRow]
+
+
+class CompareResponse(BaseModel):
+    client_id: int | None
+    currency: str  # валюта всех сумм
+    periods: list[ComparePeriod]  # от ранних к поздним
+    breakdown: list[CompareClientRow]  # по убыванию часов в последнем периоде
+
+
+class PivotDimension(str, enum.Enum):
+    client = "client"  # client_id, client_name
+    project = "project"  # project_id, project_name
+    month = "month"  # первый день месяца
+    quarter = "quarter"  # первый день квартала
+    week = "week"  # понедельник ISO-недели
+    weekday = "weekday"  # 1 — понедельник … 7 — воскресенье
+    status = "status"  # статус записи
+    currency = "currency"  # валюта проекта
+
+
+class PivotMeasure(str, enum.Enum):
+    hours = "hours"
+    amount = "amount"  # в валюте отчёта, по курсу на дату работы
+    count = "count"  # число записей
+
+
+class PivotResponse(BaseModel):
+    group_by: list[PivotDimension]
+    measures: list[PivotMeasure]
+    date_from: date
+    date_to: date
+    currency: str  # валюта amount
+    totals: dict[str, float | int]  # меры по всем строкам
+    # Колонки измерений (см. PivotDimension) и мер; порядок — по измерениям
+    rows: list[dict[str, Any]]
+
+
 # ── Helpers ────────────────────────────────────────────────────────────────────
 
+# Отчёт пересчитывается, только если изменилась одна из таблиц (в любом воркере)
+_REPORT_CACHE: VersionedCache[ReportResponse] = VersionedCache(
+    ("time_entries", "projects", "clients", "invoices", "invoice_items", "lawyer_profiles")
+)
+
+
 def _build_report(
     db: Session,
     date_from: date,
     date_to: date,
     client_id: int | None,
+    currency: str,
+    rates: RateService,
+    engine: str | None = None,
 ) -> ReportResponse:
-    # Get default rate for projects that don't have their own
-    profile = db.query(LawyerProfile).first()
-    default_rate = profile.default_hourly_rate if profile else Decimal("0")
+    """
+    Отчёт в валюте currency.
 
-    # Time entries in period
-    entries_q = (
-        db.query(TimeEntry)
-        .options(joinedload(TimeEntry.project).joinedload(Project.client))
-        .filter(TimeEntry.date >= date_from, TimeEntry.date <= date_to)
-    )
-    if client_id is not None:
-        entries_q = entries_q.join(Project).filter(Project.client_id == client_id)
+    Суммы проектов в их валюте пересчитываются по курсу на дату работы.
+    Разбивку по клиентам и проектам считает движок engine (по умолчанию
+    REPORT_ENGINE): sql — GROUP BY в БД, columnar — app.analytics.columnar
+    по колонкам в памяти. Сводка по счетам — всегда SQL.
+    """
+    if (engine or settings.REPORT_ENGINE) == "columnar":
+        from app.analytics.columnar import entry_columns, project_totals
 
-    entries = entries_q.all()
+        project_rows = project_totals(
+            db, entry_columns(db), date_from, date_to, client_id, currency, rates
+        )
+    else:
+        project_rows = _project_rows_sql(db, date_from, date_to, client_id, currency, rates)
 
     # Group by client → project
     client_map: dict[int, dict] = {}
-    for e in entries:
-        if not e.project:
-            continue
-        project = e.project
-        client = project.client
-        if client is None:
-            continue
-
-        rate = project.hourly_rate if project.hourly_rate is not None else default_rate
-        amount = float(e.duration_hours) * float(rate)
-
-        cid = client.id
-        pid = project.id
-
-        if cid not in client_map:
-            client_map[cid] = {
-                "client_id": cid,
-                "client_name": client.name,
-                "hours": 0.0,
-                "amount": 0.0,
-                "projects": {},
-            }
-        if pid not in client_map[cid]["projects"]:
-            client_map[cid]["projects"][pid] = {
-                "project_id": pid,
-                "project_name": project.name,
-                "entries_count": 0,
-                "hours": 0.0,
-                "amount": 0.0,
-            }
-
-        client_map[cid]["hours"] += float(e.duration_hours)
-        client_map[cid]["amount"] += amount
-        client_map[cid]["projects"][pid]["hours"] += float(e.duration_hours)
-        client_map[cid]["projects"][pid]["amount"] += amount
-        client_map[cid]["projects"][pid]["entries_count"] += 1
+    for p in project_rows:
+        client = client_map.setdefault(p["client_id"], {
+            "client_id": p["client_id"],
+            "client_name": p["client_name"],
+            "hours": 0.0,
+            "amount": 0.0,
+            "projects": [],
+        })
+        client["hours"] += p["hours"]
+        client["amount"] += p["amount"]
+        client["projects"].append(p)
 
     breakdown = [
         ClientBreakdown(
@@ -142,9 +274,11 @@ def _build_report(
                     entries_count=p["entries_count"],
                     hours=round(p["hours"], 1),
                     amount=round(p["amount"], 2),
+                    currency=p["currency"],
+                    original_amount=round(p["original_amount"], 2),
                 )
                 for p in sorted(
-                    c["projects"].values(), key=lambda x: x["hours"], reverse=True
+                    c["projects"], key=lambda x: x["hours"], reverse=True
                 )
             ],
         )
@@ -156,42 +290,49 @@ def _build_report(
     total_hours = round(sum(c.hours for c in breakdown), 1)
     total_amount = round(sum(c.amount for c in breakdown), 2)
 
-    # Invoice summary in period
+    # Invoice summary in period: item sums per invoice and item currency
+    # (позиции без записи времени считаются рублёвыми)
+    item_currency = func.coalesce(Project.currency, RUB)
     inv_q = (
-        db.query(Invoice)
-        .options(selectinload(Invoice.items))
-        .filter(Invoice.issue_date >= date_from, Invoice.issue_date <= date_to)
+        select(
+            Invoice.id,
+            Invoice.status,
+            Invoice.issue_date,
+            item_currency.label("currency"),
+            func.coalesce(func.sum(InvoiceItem.amount), 0).label("amount"),
+        )
+        .outerjoin(InvoiceItem, InvoiceItem.invoice_id == Invoice.id)
+        .outerjoin(TimeEntry, TimeEntry.id == InvoiceItem.time_entry_id)
+        .outerjoin(Project, Project.id == TimeEntry.project_id)
+        .where(Invoice.issue_date >= date_from, Invoice.issue_date <= date_to)
+        .group_by(Invoice.id, Invoice.status, Invoice.issue_date, item_currency)
     )
     if client_id is not None:
-        inv_q = inv_q.filter(Invoice.client_id == client_id)
+        inv_q = inv_q.where(Invoice.client_id == client_id)
 
-    invoices = inv_q.all()
-    today = date.today()
+    inv_rows = db.execute(inv_q).all()
+    inv_factors = rates.factors(db, {(r.currency, r.issue_date) for r in inv_rows}, currency)
 
-    count_paid = sum(1 for inv in invoices if inv.status == InvoiceStatus.paid)
-    count_overdue = sum(
-        1 for inv in invoices
-        if inv.status == InvoiceStatus.overdue
-        or (inv.status == InvoiceStatus.sent and inv.due_date < today)
-    )
+    invoices: dict[int, dict] = {}
+    for r in inv_rows:
+        inv = invoices.setdefault(r.id, {"status": r.status, "amount": 0.0})
+        inv["amount"] += float(r.amount) * float(inv_factors[(r.currency, r.issue_date)])
+
+    count_paid = sum(1 for inv in invoices.values() if inv["status"] == InvoiceStatus.paid)
+    count_overdue = sum(1 for inv in invoices.values() if inv["status"] == InvoiceStatus.overdue)
     count_unpaid = sum(
-        1 for inv in invoices
-        if inv.status in (InvoiceStatus.sent, InvoiceStatus.overdue, InvoiceStatus.draft)
+        1 for inv in invoices.values()
+        if inv["status"] in (InvoiceStatus.sent, InvoiceStatus.overdue, InvoiceStatus.draft)
     )
     count_total = len(invoices)
 
-    total_invoiced = sum(
-        sum(float(item.amount) for item in inv.items) for inv in invoices
-    )
+    total_invoiced = sum(inv["amount"] for inv in invoices.values())
     total_paid = sum(
-        sum(float(item.amount) for item in inv.items)
-        for inv in invoices
-        if inv.status == InvoiceStatus.paid
+        inv["amount"] for inv in invoices.values() if inv["status"] == InvoiceStatus.paid
     )
     total_unpaid = sum(
-        sum(float(item.amount) for item in inv.items)
-        for inv in invoices
-        if inv.status in (InvoiceStatus.sent, InvoiceStatus.overdue)
+        inv["amount"] for inv in invoices.values()
+        if inv["status"] in (InvoiceStatus.sent, InvoiceStatus.overdue)
     )
 
     invoice_summary = InvoiceSummary(
@@ -208,6 +349,7 @@ def _build_report(
         date_from=date_from,
         date_to=date_to,
         client_id=client_id,
+        currency=currency,
         total_hours=total_hours,
         total_amount=total_amount,
         breakdown=breakdown,
@@ -215,16 +357,1059 @@ def _build_report(
     )
 
 
+def _project_rows_sql(
+    db: Session,
+    date_from: date,
+    date_to: date,
+    client_id: int | None,
+    currency: str,
+    rates: RateService,
+) -> list[dict]:
+    """
+    Суммы по (клиент, проект) для _build_report: записи агрегируются в SQL
+    до (проект, дата), курсы для всех пар (валюта, дата) запрашиваются одним
+    пакетом, затем один проход по строкам.
+    """
+    # Get default rate for projects that don't have their own
+    profile = db.query(LawyerProfile).first()
+    default_rate = profile.default_hourly_rate if profile else Decimal("0")
+
+    # Time entries in period, aggregated per project and day
+    entries_q = (
+        select(
+            Client.id.label("client_id"),
+            Client.name.label("client_name"),
+            Project.id.label("project_id"),
+            Project.name.label("project_name"),
+            Project.currency,
+            Project.hourly_rate,
+            TimeEntry.date,
+            func.count(TimeEntry.id).label("entries_count"),
+            func.sum(TimeEntry.duration_hours).label("hours"),
+        )
+        .join_from(TimeEntry, Project, TimeEntry.project_id == Project.id)
+        .join(Client, Client.id == TimeEntry.client_id)
+        .where(TimeEntry.date >= date_from, TimeEntry.date <= date_to)
+        .group_by(
+            Client.id, Client.name, Project.id, Project.name,
+            Project.currency, Project.hourly_rate, TimeEntry.date,
+        )
+    )
+    if client_id is not None:
+        entries_q = entries_q.where(TimeEntry.client_id == client_id)
+
+    rows = db.execute(entries_q).all()
+    factors = rates.factors(db, {(r.currency, r.date) for r in rows}, currency)
+
+    projects: dict[tuple[int, int], dict] = {}
+    for r in rows:
+        rate = r.hourly_rate if r.hourly_rate is not None else default_rate
+        hours = float(r.hours)
+        original_amount = hours * float(rate)
+        amount = original_amount * float(factors[(r.currency, r.date)])
+
+        project = projects.setdefault((r.client_id, r.project_id), {
+            "client_id": r.client_id,
+            "client_name": r.client_name,
+            "project_id": r.project_id,
+            "project_name": r.project_name,
+            "currency": r.currency,
+            "entries_count": 0,
+            "hours": 0.0,
+            "amount": 0.0,
+            "original_amount": 0.0,
+        })
+        project["entries_count"] += r.entries_count
+        project["hours"] += hours
+        project["amount"] += amount
+        project["original_amount"] += original_amount
+    return list(projects.values())
+
+
+def _cached_report(
+    db: Session,
+    date_from: date,
+    date_to: date,
+    client_id: int | None,
+    currency: str,
+    rates: RateService,
+) -> ReportResponse:
+    # date.today() в ключе: курсы на будущие даты периода берутся по последнему
+    # опубликованному и могут уточниться на следующий день
+    return _REPORT_CACHE.get_or_compute(
+        db,
+        (date_from, date_to, client_id, currency, date.today()),
+        lambda: _build_report(db, date_from, date_to, client_id, currency, rates),
+    )
+
+
+def _stream_report_xlsx(report: ReportResponse) -> Iterator[bytes]:
+    """
+    Книга отчёта: лист разбивки клиент → проект с итогами и лист счетов.
+    Данные — те же, что в JSON-ответе; кусок книги отдаётся после каждого клиента.
+    """
+    writer = XlsxStreamWriter()
+    writer.add_sheet(
+        "Отчёт",
+        ["Клиент", "Проект", "Записей", "Часы", f"Сумма, {report.currency}", "Валюта проекта", "Сумма в валюте проекта"],
+        widths=[32, 32, 9, 9, 16, 15, 22],
+    )
+    for client in report.breakdown:
+        writer.write_rows(
+            [
+                client.client_name, project.project_name, project.entries_count,
+                project.hours, project.amount, project.currency, project.original_amount,
+            ]
+            for project in client.projects
+        )
+        writer.write_rows(
+            [[f"{client.client_name} — итого", None, None, client.hours, client.amount]],
+            style=XlsxStreamWriter.STYLE_BOLD,
+        )
+        yield writer.drain()
+    writer.write_rows(
+        [["Итого", None, None, report.total_hours, report.total_amount]],
+        style=XlsxStreamWriter.STYLE_BOLD,
+    )
+
+    summary = report.invoice_summary
+    writer.add_sheet("Счета", ["Показатель", "Значение"], widths=[28, 16])
+    writer.write_rows([
+        ["Период с", report.date_from],
+        ["Период по", report.date_to],
+        ["Валюта", report.currency],
+        ["Счетов всего", summary.count_total],
+        ["Оплачено", summary.count_paid],
+        ["Не оплачено", summary.count_unpaid],
+        ["Просрочено", summary.count_overdue],
+        ["Выставлено на сумму", summary.total_invoiced],
+        ["Оплачено на сумму", summary.total_paid],
+        ["Не оплачено на сумму", summary.total_unpaid],
+    ])
+    yield writer.close()
+
+
+# ── Time series ────────────────────────────────────────────────────────────────
+
+# Больше точек графику не нужно (≈ 10 лет по дням)
+_MAX_POINTS = 4000
+
+_TIMESERIES_CACHE: VersionedCache[TimeseriesResponse] = VersionedCache(
+    ("time_entries", "projects", "lawyer_profiles")
+)
+
+
+def _period_start(day: date, granularity: Granularity) -> date:
+    if granularity == Granularity.week:
+        return day - timedelta(days=day.weekday())
+    if granularity == Granularity.month:
+        return day.replace(day=1)
+    return day
+
+
+def _next_period(start: date, granularity: Granularity) -> date:
+    if granularity == Granularity.week:
+        return start + timedelta(days=7)
+    if granularity == Granularity.month:
+        return (start + timedelta(days=32)).replace(day=1)
+    return start + timedelta(days=1)
+
+
+def _period_start_sql(column, granularity: Granularity, dialect: str) -> ColumnElement[date]:
+    """Начало периода для даты в SQL (совпадает с _period_start)."""
+    if granularity == Granularity.day:
+        return column
+    if dialect == "postgresql":
+        return cast(func.date_trunc(granularity.value, column), Date)
+    if granularity == Granularity.week:
+        # 'weekday 0' — ближайшее воскресенье не раньше даты, минус 6 дней — понедельник
+        return type_coerce(func.date(column, "weekday 0", "-6 days"), Date)
+    return type_coerce(func.date(column, "start of month"), Date)
+
+
+def _build_timeseries(
+    db: Session,
+    granularity: Granularity,
+    date_from: date,
+    date_to: date,
+    client_id: int | None,
+    project_id: int | None,
+    entry_status: TimeEntryStatus | None,
+    currency: str,
+    rates: RateService,
+) -> TimeseriesResponse:
+    """
+    Ряд по периодам одним GROUP BY: строки — периоды, а не записи.
+
+    Суммы в валюте отчёта агрегируются сразу по периоду. Суммы в других
+    валютах — по (период, дата), чтобы пересчитать по курсу на дату работы,
+    как в _build_report; таких строк не больше, чем дней в диапазоне.
+    """
+    profile = db.query(LawyerProfile).first()
+    default_rate = profile.default_hourly_rate if profile else Decimal("0")
+
+    period = _period_start_sql(TimeEntry.date, granularity, db.get_bind().dialect.name)
+    rate_date = case((Project.currency == currency, literal(None)), else_=TimeEntry.date)
+    stmt = (
+        select(
+            period.label("period_start"),
+            Project.currency,
+            rate_date.label("rate_date"),
+            func.count(TimeEntry.id).label("entries_count"),
+            func.sum(TimeEntry.duration_hours).label("hours"),
+            func.sum(
+                TimeEntry.duration_hours * func.coalesce(Project.hourly_rate, default_rate)
+            ).label("amount"),
+        )
+        .join_from(TimeEntry, Project, TimeEntry.project_id == Project.id)
+        .where(TimeEntry.date >= date_from, TimeEntry.date <= date_to)
+        .group_by(period, Project.currency, rate_date)
+    )
+    if client_id is not None:
+        stmt = stmt.where(TimeEntry.client_id == client_id)
+    if project_id is not None:
+        stmt = stmt.where(TimeEntry.project_id == project_id)
+    if entry_status is not None:
+        stmt = stmt.where(TimeEntry.status == entry_status)
+
+    rows = db.execute(stmt).all()
+    factors = rates.factors(
+        db, {(r.currency, r.rate_date) for r in rows if r.rate_date is not None}, currency
+    )
+
+    # Все периоды диапазона — пустые остаются нулевыми
+    points: dict[date, dict] = {}
+    start = _period_start(date_from, granularity)
+    while start <= date_to:
+        points[start] = {"entries_count": 0, "hours": 0.0, "amount": 0.0}
+        start = _next_period(start, granularity)
+
+    for r in rows:
+        point = points[r.period_start]
+        factor = factors[(r.currency, r.rate_date)] if r.rate_date is not None else 1
+        point["entries_count"] += r.entries_count
+        point["hours"] += float(r.hours)
+        point["amount"] += float(r.amount) * float(factor)
+
+    return TimeseriesResponse(
+        granularity=granularity,
+        date_from=date_from,
+        date_to=date_to,
+        currency=currency,
+        total_hours=round(sum(p["hours"] for p in points.values()), 1),
+        total_amount=round(sum(p["amount"] for p in points.values()), 2),
+        points=[
+            TimeseriesPoint(
+                period_start=period_start,
+                entries_count=p["entries_count"],
+                hours=round(p["hours"], 1),
+                amount=round(p["amount"], 2),
+            )
+            for period_start, p in points.items()
+        ],
+    )
+
+
+# ── Aging ──────────────────────────────────────────────────────────────────────
+
+_AGING_CACHE: VersionedCache[AgingResponse] = VersionedCache(
+    ("invoices", "invoice_items", "time_entries", "projects", "clients")
+)
+
+_AGING_BUCKETS = ("current", "days_0_30", "days_31_60", "days_61_90", "days_90_plus")
+
+
+def _build_aging(
+    db: Session,
+    as_of: date,
+    client_id: int | None,
+    currency: str,
+    rates: RateService,
+) -> AgingResponse:
+    """
+    Старение задолженности по sent/overdue-счетам одним запросом.
+
+    Суммы позиций по счёту и валюте — подзапрос; корзины — условные SUM
+    по due_date (границы — даты, поэтому работает индекс по статусу и сроку).
+    Строки группируются по клиенту и валюте; суммы не в валюте отчёта —
+    ещё и по дате счёта, чтобы пересчитать по курсу на эту дату, как на дашборде.
+    """
+    item_currency = func.coalesce(Project.currency, RUB)
+    items = (
+        select(
+            InvoiceItem.invoice_id,
+            item_currency.label("currency"),
+            func.sum(InvoiceItem.amount).label("amount"),
+            # Счёт с позициями в нескольких валютах даёт несколько строк —
+            # считаем его только в первой
+            case(
+                (func.row_number().over(
+                    partition_by=InvoiceItem.invoice_id, order_by=item_currency
+                ) == 1, 1),
+                else_=0,
+            ).label("is_first"),
+        )
+        .outerjoin(TimeEntry, TimeEntry.id == InvoiceItem.time_entry_id)
+        .outerjoin(Project, Project.id == TimeEntry.project_id)
+        .group_by(InvoiceItem.invoice_id, item_currency)
+        .subquery()
+    )
+
+    # Нижняя граница due_date каждой корзины (включительно); None — без границы
+    lower_bounds = (
+        as_of + timedelta(days=1),
+        as_of - timedelta(days=30),
+        as_of - timedelta(days=60),
+        as_of - timedelta(days=90),
+        None,
+    )
+    bucket_columns = []
+    upper = None
+    for name, lower in zip(_AGING_BUCKETS, lower_bounds):
+        conditions = []
+        if lower is not None:
+            conditions.append(Invoice.due_date >= lower)
+        if upper is not None:
+            conditions.append(Invoice.due_date < upper)
+        bucket_columns.append(
+            func.coalesce(func.sum(case((and_(*conditions), items.c.amount), else_=0)), 0).label(name)
+        )
+        upper = lower
+
+    rate_date = case((items.c.currency == currency, literal(None)), else_=Invoice.issue_date)
+    stmt = (
+        select(
+            Client.id.label("client_id"),
+            Client.name.label("client_name"),
+            items.c.currency,
+            rate_date.label("rate_date"),
+            func.sum(items.c.is_first).label("invoices_count"),
+            *bucket_columns,
+        )
+        .join_from(Invoice, items, items.c.invoice_id == Invoice.id)
+        .join(Client, Client.id == Invoice.client_id)
+        .where(Invoice.status.in_([InvoiceStatus.sent, InvoiceStatus.overdue]))
+        .group_by(Client.id, Client.name, items.c.currency, rate_date)
+    )
+    if client_id is not None:
+        stmt = stmt.where(Invoice.client_id == client_id)
+
+    rows = db.execute(stmt).all()
+    factors = rates.factors(
+        db, {(r.currency, r.rate_date) for r in rows if r.rate_date is not None}, currency
+    )
+
+    clients: dict[int, dict] = {}
+    for r in rows:
+        factor = float(factors[(r.currency, r.rate_date)]) if r.rate_date is not None else 1.0
+        client = clients.setdefault(
+            r.client_id,
+            {
+                "client_name": r.client_name,
+                "invoices_count": 0,
+                **{name: 0.0 for name in _AGING_BUCKETS},
+            },
+        )
+        client["invoices_count"] += r.invoices_count
+        for name in _AGING_BUCKETS:
+            client[name] += float(getattr(r, name)) * factor
+
+    def buckets(values: dict) -> AgingBuckets:
+        amounts = {name: round(values[name], 2) for name in _AGING_BUCKETS}
+        return AgingBuckets(**amounts, total=round(sum(values[name] for name in _AGING_BUCKETS), 2))
+
+    client_rows = sorted(
+        (
+            AgingClientRow(
+                client_id=cid,
+                client_name=c["client_name"],
+                invoices_count=c["invoices_count"],
+                amounts=buckets(c),
+            )
+            for cid, c in clients.items()
+        ),
+        key=lambda row: row.amounts.total,
+        reverse=True,
+    )
+
+    return AgingResponse(
+        as_of=as_of,
+        client_id=client_id,
+        currency=currency,
+        invoices_count=sum(c["invoices_count"] for c in clients.values()),
+        totals=buckets({name: sum(c[name] for c in clients.values()) for name in _AGING_BUCKETS}),
+        clients=client_rows,
+    )
+
+
+def _cached_aging(
+    db: Session,
+    as_of: date | None,
+    client_id: int | None,
+    currency: str,
+    rates: RateService,
+) -> AgingResponse:
+    as_of = as_of or date.today()
+    return _AGING_CACHE.get_or_compute(
+        db,
+        (as_of, client_id, currency, date.today()),
+        lambda: _build_aging(db, as_of, client_id, currency, rates),
+    )
+
+
+# ── Comparison ─────────────────────────────────────────────────────────────────
+
+_MAX_COMPARE_PERIODS = 12
+
+_COMPARE_CACHE: VersionedCache[CompareResponse] = VersionedCache(
+    ("time_entries", "projects", "clients", "lawyer_profiles")
+)
+
+
+def _add_months(first_day: date, months: int) -> date:
+    index = first_day.year * 12 + first_day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _previous_periods(date_from: date, date_to: date, count: int) -> list[tuple[date, date]]:
+    """
+    Период и count предыдущих такой же длины, от ранних к поздним.
+    Целые месяцы сдвигаются на месяцы (март → февраль, а не на 31 день).
+    """
+    whole_months = date_from.day == 1 and (date_to + timedelta(days=1)).day == 1
+    periods = []
+    for n in range(count, -1, -1):
+        if whole_months:
+            months = (date_to.year - date_from.year) * 12 + date_to.month - date_from.month + 1
+            start = _add_months(date_from, -n * months)
+            end = _add_months(start, months) - timedelta(days=1)
+        else:
+            shift = timedelta(days=n * ((date_to - date_from).days + 1))
+            start, end = date_from - shift, date_to - shift
+        periods.append((start, end))
+    return periods
+
+
+def _parse_period(value: str) -> tuple[date, date]:
+    try:
+        start, end = (date.fromisoformat(part) for part in value.split("..", 1))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Период «{value}»: ожидается YYYY-MM-DD..YYYY-MM-DD",
+        )
+    if end < start:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Период «{value}»: конец раньше начала",
+        )
+    return start, end
+
+
+def _build_comparison(
+    db: Session,
+    periods: tuple[tuple[date, date], ...],
+    client_id: int | None,
+    currency: str,
+    rates: RateService,
+) -> CompareResponse:
+    """
+    Отчёт по нескольким периодам одним запросом: номер периода — ещё одно
+    измерение GROUP BY (CASE по диапазонам дат). Пересчёт валют — как в
+    _build_report, по курсу на дату работы; суммы в валюте отчёта сразу
+    агрегируются по периоду.
+    """
+    profile = db.query(LawyerProfile).first()
+    default_rate = profile.default_hourly_rate if profile else Decimal("0")
+
+    in_period = [
+        and_(TimeEntry.date >= start, TimeEntry.date <= end) for start, end in periods
+    ]
+    period_index = case(*((condition, i) for i, condition in enumerate(in_period)))
+    rate_date = case((Project.currency == currency, literal(None)), else_=TimeEntry.date)
+    stmt = (
+        select(
+            period_index.label("period"),
+            Client.id.label("client_id"),
+            Client.name.label("client_name"),
+            Project.id.label("project_id"),
+            Project.name.label("project_name"),
+            Project.currency,
+            rate_date.label("rate_date"),
+            func.sum(TimeEntry.duration_hours).label("hours"),
+            func.sum(
+                TimeEntry.duration_hours * func.coalesce(Project.hourly_rate, default_rate)
+            ).label("amount"),
+        )
+        .join_from(TimeEntry, Project, TimeEntry.project_id == Project.id)
+        .join(Client, Client.id == TimeEntry.client_id)
+        .where(or_(*in_period))
+        .group_by(
+            period_index, Client.id, Client.name, Project.id, Project.name,
+            Project.currency, rate_date,
+        )
+    )
+    if client_id is not None:
+        stmt = stmt.where(TimeEntry.client_id == client_id)
+
+    rows = db.execute(stmt).all()
+    factors = rates.factors(
+        db, {(r.currency, r.rate_date) for r in rows if r.rate_date is not None}, currency
+    )
+
+    n = len(periods)
+    client_map: dict[int, dict] = {}
+    for r in rows:
+        factor = float(factors[(r.currency, r.rate_date)]) if r.rate_date is not None else 1.0
+        hours = float(r.hours)
+        amount = float(r.amount) * factor
+
+        client = client_map.setdefault(r.client_id, {
+            "client_name": r.client_name,
+            "hours": [0.0] * n,
+            "amount": [0.0] * n,
+            "projects": {},
+        })
+        project = client["projects"].setdefault(r.project_id, {
+            "project_name": r.project_name,
+            "currency": r.currency,
+            "hours": [0.0] * n,
+            "amount": [0.0] * n,
+        })
+        for target in (client, project):
+            target["hours"][r.period] += hours
+            target["amount"][r.period] += amount
+
+    def latest_first(item: tuple[int, dict]) -> tuple[float, ...]:
+        # По часам в последнем периоде, затем в предыдущих
+        return tuple(reversed(item[1]["hours"]))
+
+    breakdown = [
+        CompareClientRow(
+            client_id=cid,
+            client_name=c["client_name"],
+            hours=[round(h, 1) for h in c["hours"]],
+            amount=[round(a, 2) for a in c["amount"]],
+            projects=[
+                CompareProjectRow(
+                    project_id=pid,
+                    project_name=p["project_name"],
+                    currency=p["currency"],
+                    hours=[round(h, 1) for h in p["hours"]],
+                    amount=[round(a, 2) for a in p["amount"]],
+                )
+                for pid, p in sorted(c["projects"].items(), key=latest_first, reverse=True)
+            ],
+        )
+        for cid, c in sorted(client_map.items(), key=latest_first, reverse=True)
+    ]
+
+    return CompareResponse(
+        client_id=client_id,
+        currency=currency,
+        periods=[
+            ComparePeriod(
+                date_from=start,
+                date_to=end,
+                hours=round(sum(c["hours"][i] for c in client_map.values()), 1),
+                amount=round(sum(c["amount"][i] for c in client_map.values()), 2),
+            )
+            for i, (start, end) in enumerate(periods)
+        ],
+        breakdown=breakdown,
+    )
+
+
+def _comparison_periods(
+    period: list[str] | None = Query(
+        None,
+        description="Период YYYY-MM-DD..YYYY-MM-DD; параметр повторяется для каждого периода",
+    ),
+    date_from: date | None = Query(None, description="Начало периода (вместе с previous)"),
+    date_to: date | None = Query(None, description="Конец периода (вместе с previous)"),
+    previous: int = Query(
+        1, ge=1, le=_MAX_COMPARE_PERIODS - 1,
+        description="Сколько предыдущих периодов той же длины добавить к date_from..date_to",
+    ),
+) -> tuple[tuple[date, date], ...]:
+    """Периоды сравнения, отсортированные от ранних к поздним."""
+    if period:
+        periods = sorted(_parse_period(value) for value in period)
+    elif date_from is not None and date_to is not None:
+        if date_to < date_from:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="date_to раньше date_from",
+            )
+        periods = _previous_periods(date_from, date_to, previous)
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Укажите period (один или несколько) или date_from и date_to",
+        )
+
+    if len(periods) > _MAX_COMPARE_PERIODS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Не больше {_MAX_COMPARE_PERIODS} периодов",
+        )
+    for (_, prev_end), (next_start, _) in zip(periods, periods[1:]):
+        if next_start <= prev_end:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Периоды пересекаются",
+            )
+    return tuple(periods)
+
+
+def _cached_comparison(
+    db: Session,
+    periods: tuple[tuple[date, date], ...],
+    client_id: int | None,
+    currency: str,
+    rates: RateService,
+) -> CompareResponse:
+    return _COMPARE_CACHE.get_or_compute(
+        db,
+        (periods, client_id, currency, date.today()),
+        lambda: _build_comparison(db, periods, client_id, currency, rates),
+    )
+
+
+# ── Pivot ──────────────────────────────────────────────────────────────────────
+
+_MAX_PIVOT_DIMENSIONS = 3
+# Больше строк сводной таблице не нужно — это уже выгрузка, а не отчёт
+_MAX_PIVOT_ROWS = 5000
+
+_PIVOT_CACHE: VersionedCache[PivotResponse] = VersionedCache(
+    ("time_entries", "projects", "clients", "lawyer_profiles")
+)
+
+
+def _pivot_columns(
+    dimension: PivotDimension, dialect: str
+) -> list[tuple[str, ColumnElement[Any]]]:
+    """Колонки измерения: (имя в строке ответа, SQL-выражение для GROUP BY)."""
+    if dimension == PivotDimension.client:
+        return [("client_id", Client.id), ("client_name", Client.name)]
+    if dimension == PivotDimension.project:
+        return [("project_id", Project.id), ("project_name", Project.name)]
+    if dimension == PivotDimension.month:
+        return [("month", _period_start_sql(TimeEntry.date, Granularity.month, dialect))]
+    if dimension == PivotDimension.week:
+        return [("week", _period_start_sql(TimeEntry.date, Granularity.week, dialect))]
+    if dimension == PivotDimension.quarter:
+        if dialect == "postgresql":
+            quarter = cast(func.date_trunc("quarter", TimeEntry.date), Date)
+        else:
+            # Начало месяца минус (номер месяца − 1) % 3 месяцев
+            months_back = (cast(func.strftime("%m", TimeEntry.date), Integer) - 1) % 3
+            quarter = type_coerce(
+                func.date(TimeEntry.date, "start of month", "-" + cast(months_back, String) + " months"),
+                Date,
+            )
+        return [("quarter", quarter)]
+    if dimension == PivotDimension.weekday:
+        if dialect == "postgresql":
+            weekday = cast(extract("isodow", TimeEntry.date), Integer)
+        else:
+            # %w: 0 — воскресенье; приводим к ISO (1 — понедельник)
+            weekday = (cast(func.strftime("%w", TimeEntry.date), Integer) + 6) % 7 + 1
+        return [("weekday", weekday)]
+    if dimension == PivotDimension.status:
+        return [("status", TimeEntry.status)]
+    return [("currency", Project.currency)]
+
+
+def _build_pivot(
+    db: Session,
+    group_by: tuple[PivotDimension, ...],
+    measures: tuple[PivotMeasure, ...],
+    date_from: date,
+    date_to: date,
+    client_id: int | None,
+    project_id: int | None,
+    entry_status: TimeEntryStatus | None,
+    currency: str,
+    rates: RateService,
+) -> PivotResponse:
+    """
+    Сводная таблица одним GROUP BY по выбранным измерениям.
+
+    Для amount к измерениям добавляются валюта и дата курса (NULL для
+    валюты отчёта), как в _build_timeseries; курсы на все пары (валюта,
+    дата) запрашиваются заранее, и строки складываются в группы ответа на
+    лету. Выборка идёт пачками в порядке измерений и прерывается, как
+    только групп становится больше _MAX_PIVOT_ROWS.
+    """
+    dialect = db.get_bind().dialect.name
+    columns = [col for dimension in group_by for col in _pivot_columns(dimension, dialect)]
+    with_amount = PivotMeasure.amount in measures
+
+    def filtered(stmt):
+        stmt = stmt.join_from(TimeEntry, Project, TimeEntry.project_id == Project.id).where(
+            TimeEntry.date >= date_from, TimeEntry.date <= date_to
+        )
+        if PivotDimension.client in group_by:
+            stmt = stmt.join(Client, Client.id == TimeEntry.client_id)
+        if client_id is not None:
+            stmt = stmt.where(TimeEntry.client_id == client_id)
+        if project_id is not None:
+            stmt = stmt.where(TimeEntry.project_id == project_id)
+        if entry_status is not None:
+            stmt = stmt.where(TimeEntry.status == entry_status)
+        return stmt
+
+    group_exprs: list[ColumnElement[Any]] = [expr for _, expr in columns]
+    selected: list[ColumnElement[Any]] = [expr.label(name) for name, expr in columns]
+    selected += [
+        func.count(TimeEntry.id).label("count"),
+        func.coalesce(func.sum(TimeEntry.duration_hours), 0).label("hours"),
+    ]
+    factors: dict[tuple[str, date], Decimal] = {}
+    if with_amount:
+        profile = db.query(LawyerProfile).first()
+        default_rate = profile.default_hourly_rate if profile else Decimal("0")
+        rate_date = case((Project.currency == currency, literal(None)), else_=TimeEntry.date)
+        group_exprs += [Project.currency, rate_date]
+        selected += [
+            Project.currency,
+            rate_date.label("rate_date"),
+            func.coalesce(
+                func.sum(TimeEntry.duration_hours * func.coalesce(Project.hourly_rate, default_rate)),
+                0,
+            ).label("amount"),
+        ]
+        pairs = db.execute(
+            filtered(select(Project.currency, TimeEntry.date).distinct()).where(
+                Project.currency != currency
+            )
+        ).all()
+        factors = rates.factors(db, {(cur, day) for cur, day in pairs}, currency)
+
+    stmt = filtered(select(*selected))
+    # Без измерений и amount GROUP BY не нужен — одна строка итогов
+    if group_exprs:
+        stmt = stmt.group_by(*group_exprs).order_by(*group_exprs)
+
+    groups: dict[tuple, dict[str, Any]] = {}
+    for r in db.execute(stmt.execution_options(yield_per=1000)):
+        key = tuple(getattr(r, name) for name, _ in columns)
+        group = groups.get(key)
+        if group is None:
+            if len(groups) == _MAX_PIVOT_ROWS:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail=f"Больше {_MAX_PIVOT_ROWS} строк — уберите измерение или сократите период",
+                )
+            group = groups[key] = {"count": 0, "hours": 0.0, "amount": 0.0}
+        group["count"] += r.count
+        group["hours"] += float(r.hours)
+        if with_amount:
+            factor = factors[(r.currency, r.rate_date)] if r.rate_date is not None else 1
+            group["amount"] += float(r.amount) * float(factor)
+
+    def measure_values(group: dict[str, Any]) -> dict[str, float | int]:
+        result: dict[str, float | int] = {}
+        if PivotMeasure.hours in measures:
+            result["hours"] = round(group["hours"], 1)
+        if with_amount:
+            result["amount"] = round(group["amount"], 2)
+        if PivotMeasure.count in measures:
+            result["count"] = group["count"]
+        return result
+
+    rows = []
+    for key, group in groups.items():
+        row: dict[str, Any] = {
+            name: value.value if isinstance(value, enum.Enum) else value
+            for (name, _), value in zip(columns, key)
+        }
+        row.update(measure_values(group))
+        rows.append(row)
+
+    return PivotResponse(
+        group_by=list(group_by),
+        measures=list(measures),
+        date_from=date_from,
+        date_to=date_to,
+        currency=currency,
+        totals=measure_values({
+            field: sum(group[field] for group in groups.values())
+            for field in ("count", "hours", "amount")
+        }),
+        rows=rows,
+    )
+
+
 # ── Endpoints ──────────────────────────────────────────────────────────────────
 
-@router.get("", response_model=ReportResponse, summary="Отчёт по времени и биллингу")
+@router.get(
+    "",
+    response_model=ReportResponse,
+    summary="Отчёт по времени и биллингу",
+    description="format=xlsx — та же разбивка и сводка по счетам книгой Excel (потоком).",
+    responses={200: {"content": {XLSX_MEDIA_TYPE: {}}}},
+)
 def get_report(
     date_from: date = Query(..., description="Начало периода"),
     date_to: date = Query(..., description="Конец периода"),
     client_id: int | None = Query(None, description="Фильтр по клиенту"),
+    report_format: ReportFormat = Query(ReportFormat.json, alias="format", description="Формат ответа"),
+    currency: str = Depends(report_currency),
+    rates: RateService = Depends(get_rate_service),
     db: Session = Depends(get_db),
-) -> ReportResponse:
-    return _build_report(db, date_from, date_to, client_id)
+) -> ReportResponse | StreamingResponse:
+    report = _cached_report(db, date_from, date_to, client_id, currency, rates)
+    if report_format == ReportFormat.json:
+        return report
+    filename = f"report_{date_from}_{date_to}.xlsx"
+    return StreamingResponse(
+        _stream_report_xlsx(report),
+        media_type=XLSX_MEDIA_TYPE,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get(
+    "/timeseries",
+    response_model=TimeseriesResponse,
+    summary="Часы и суммы по дням / неделям / месяцам",
+    description=(
+        "Ряд для графика: по точке на каждый период диапазона, включая пустые. "
+        "Считается одним GROUP BY в БД — объём ответа зависит от числа периодов, "
+        "а не от числа записей."
+    ),
+    responses={422: {"description": "Неверный диапазон или слишком много точек"}},
+)
+def get_timeseries(
+    granularity: Granularity = Query(Granularity.month, description="Размер периода"),
+    date_from: date = Query(..., description="Начало периода"),
+    date_to: date = Query(..., description="Конец периода"),
+    client_id: int | None = Query(None, description="Фильтр по клиенту"),
+    project_id: int | None = Query(None, description="Фильтр по проекту"),
+    entry_status: TimeEntryStatus | None = Query(
+        None, alias="status", description="Фильтр по статусу записей"
+    ),
+    currency: str = Depends(report_currency),
+    rates: RateService = Depends(get_rate_service),
+    db: Session = Depends(get_db),
+) -> TimeseriesResponse:
+    if date_to < date_from:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="date_to раньше date_from",
+        )
+    step = {Granularity.day: 1, Granularity.week: 7, Granularity.month: 28}[granularity]
+    if (date_to - date_from).days // step + 1 > _MAX_POINTS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Больше {_MAX_POINTS} точек — увеличьте granularity или сократите период",
+        )
+
+    return _TIMESERIES_CACHE.get_or_compute(
+        db,
+        (granularity, date_from, date_to, client_id, project_id, entry_status, currency, date.today()),
+        lambda: _build_timeseries(
+            db, granularity, date_from, date_to, client_id, project_id, entry_status, currency, rates,
+        ),
+    )
+
+
+@router.get(
+    "/pivot",
+    response_model=PivotResponse,
+    summary="Сводная таблица по записям времени",
+    description=(
+        "Часы, суммы и число записей в разрезе до трёх измерений "
+        "(`group_by=client&group_by=month`). Считается одним GROUP BY; "
+        f"больше {_MAX_PIVOT_ROWS} строк — 422."
+    ),
+    responses={422: {"description": "Неверные измерения, диапазон или слишком много строк"}},
+)
+def get_pivot(
+    group_by: list[PivotDimension] = Query(
+        [], description="Измерения по порядку; параметр повторяется, не больше трёх"
+    ),
+    measure: list[PivotMeasure] = Query(
+        list(PivotMeasure), description="Меры; параметр повторяется"
+    ),
+    date_from: date = Query(..., description="Начало периода"),
+    date_to: date = Query(..., description="Конец периода"),
+    client_id: int | None = Query(None, description="Фильтр по клиенту"),
+    project_id: int | None = Query(None, description="Фильтр по проекту"),
+    entry_status: TimeEntryStatus | None = Query(
+        None, alias="status", description="Фильтр по статусу записей"
+    ),
+    currency: str = Depends(report_currency),
+    rates: RateService = Depends(get_rate_service),
+    db: Session = Depends(get_db),
+) -> PivotResponse:
+    if date_to < date_from:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="date_to раньше date_from",
+        )
+    # Нормализованный запрос — он же ключ кэша: повторы убраны, меры в
+    # каноническом порядке (порядок измерений задаёт порядок строк и остаётся)
+    dimensions = tuple(dict.fromkeys(group_by))
+    measures = tuple(m for m in PivotMeasure if m in measure)
+    if len(dimensions) > _MAX_PIVOT_DIMENSIONS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Не больше {_MAX_PIVOT_DIMENSIONS} измерений",
+        )
+
+    return _PIVOT_CACHE.get_or_compute(
+        db,
+        (dimensions, measures, date_from, date_to, client_id, project_id, entry_status, currency, date.today()),
+        lambda: _build_pivot(
+            db, dimensions, measures, date_from, date_to, client_id, project_id, entry_status,
+            currency, rates,
+        ),
+    )
+
+
+@router.get(
+    "/compare",
+    response_model=CompareResponse,
+    summary="Сравнение периодов",
+    description=(
+        "Часы и суммы по клиентам и проектам за несколько периодов: явный список "
+        "(`period=2026-01-01..2026-01-31&period=...`) или date_from..date_to и "
+        "`previous` предыдущих периодов той же длины. Значения по периодам — "
+        "списки в порядке `periods`."
+    ),
+    responses={422: {"description": "Неверные или пересекающиеся периоды"}},
+)
+def get_comparison(
+    periods: tuple[tuple[date, date], ...] = Depends(_comparison_periods),
+    client_id: int | None = Query(None, description="Фильтр по клиенту"),
+    currency: str = Depends(report_currency),
+    rates: RateService = Depends(get_rate_service),
+    db: Session = Depends(get_db),
+) -> CompareResponse:
+    return _cached_comparison(db, periods, client_id, currency, rates)
+
+
+@router.get(
+    "/compare/pdf",
+    summary="Скачать сравнение периодов в PDF",
+    response_class=Response,
+    responses={
+        200: {"content": {"application/pdf": {}}, "description": "PDF-отчёт"},
+        422: {"description": "Неверные или пересекающиеся периоды"},
+    },
+)
+def get_comparison_pdf(
+    periods: tuple[tuple[date, date], ...] = Depends(_comparison_periods),
+    client_id: int | None = Query(None, description="Фильтр по клиенту"),
+    currency: str = Depends(report_currency),
+    rates: RateService = Depends(get_rate_service),
+    db: Session = Depends(get_db),
+) -> Response:
+    comparison = _cached_comparison(db, periods, client_id, currency, rates)
+
+    client_name: str | None = None
+    if client_id is not None:
+        client = db.get(Client, client_id)
+        if client:
+            client_name = client.name
+
+    pdf_report = ComparisonData(
+        client_name=client_name,
+        currency_symbol=CURRENCY_SYMBOLS.get(currency, currency),
+        periods=[
+            ComparisonPeriod(date_from=p.date_from, date_to=p.date_to, hours=p.hours, amount=p.amount)
+            for p in comparison.periods
+        ],
+        breakdown=[
+            ComparisonClientRow(
+                client_name=c.client_name,
+                hours=c.hours,
+                amount=c.amount,
+                projects=[
+                    ComparisonProjectRow(
+                        project_name=p.project_name, hours=p.hours, amount=p.amount,
+                    )
+                    for p in c.projects
+                ],
+            )
+            for c in comparison.breakdown
+        ],
+    )
+
+    pdf_bytes = render_comparison_pdf(pdf_report)
+    first, last = comparison.periods[0], comparison.periods[-1]
+    filename = f"compare_{first.date_from}_{last.date_to}.pdf"
+    return Response(
+        content=pdf_bytes,
+        media_type="application/pdf",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get(
+    "/aging",
+    response_model=AgingResponse,
+    summary="Дебиторская задолженность по срокам",
+    description=(
+        "Неоплаченные (sent / overdue) счета по клиентам в корзинах по дням "
+        "просрочки на дату as_of: срок не наступил, 0–30, 31–60, 61–90, 90+."
+    ),
+)
+def get_aging(
+    as_of: date | None = Query(None, description="Дата расчёта (по умолчанию — сегодня)"),
+    client_id: int | None = Query(None, description="Фильтр по клиенту"),
+    currency: str = Depends(report_currency),
+    rates: RateService = Depends(get_rate_service),
+    db: Session = Depends(get_db),
+) -> AgingResponse:
+    return _cached_aging(db, as_of, client_id, currency, rates)
+
+
+@router.get(
+    "/aging/pdf",
+    summary="Скачать отчёт о задолженности в PDF",
+    response_class=Response,
+    responses={
+        200: {"content": {"application/pdf": {}}, "description": "PDF-отчёт"},
+    },
+)
+def get_aging_pdf(
+    as_of: date | None = Query(None, description="Дата расчёта (по умолчанию — сегодня)"),
+    client_id: int | None = Query(None, description="Фильтр по клиенту"),
+    currency: str = Depends(report_currency),
+    rates: RateService = Depends(get_rate_service),
+    db: Session = Depends(get_db),
+) -> Response:
+    aging = _cached_aging(db, as_of, client_id, currency, rates)
+
+    client_name: str | None = None
+    if client_id is not None:
+        client = db.get(Client, client_id)
+        if client:
+            client_name = client.name
+
+    def row(name: str, invoices_count: int, amounts: AgingBuckets) -> AgingRow:
+        return AgingRow(client_name=name, invoices_count=invoices_count, **amounts.model_dump())
+
+    pdf_report = AgingReportData(
+        as_of=aging.as_of,
+        client_name=client_name,
+        currency_symbol=CURRENCY_SYMBOLS.get(currency, currency),
+        totals=row("ИТОГО", aging.invoices_count, aging.totals),
+        rows=[row(c.client_name, c.invoices_count, c.amounts) for c in aging.clients],
+    )
+
+    pdf_bytes = render_aging_pdf(pdf_report)
+    filename = f"aging_{aging.as_of}.pdf"
+    return Response(
+        content=pdf_bytes,
+        media_type="application/pdf",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 @router.get(
@@ -239,9 +1424,11 @@ def get_report_pdf(
     date_from: date = Query(..., description="Начало периода"),
     date_to: date = Query(..., description="Конец периода"),
     client_id: int | None = Query(None, description="Фильтр по клиенту"),
+    currency: str = Depends(report_currency),
+    rates: RateService = Depends(get_rate_service),
     db: Session = Depends(get_db),
 ) -> Response:
-    report_data = _build_report(db, date_from, date_to, client_id)
+    report_data = _cached_report(db, date_from, date_to, client_id, currency, rates)
 
     # Resolve client name for PDF title
     client_name: str | None = None
@@ -254,6 +1441,7 @@ def get_report_pdf(
         date_from=date_from,
         date_to=date_to,
         client_name=client_name,
+        currency_symbol=CURRENCY_SYMBOLS.get(currency, currency),
         total_hours=report_data.total_hours,
         total_amount=report_data.total_amount,
         breakdown=[
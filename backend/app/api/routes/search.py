@@ -0,0 +1,137 @@
+"""Search endpoint — ranked full-text search over clients, projects and time entries."""
+
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import Date, Integer, Select, func, literal, literal_column, null, select, type_coerce, union_all
+from sqlalchemy.orm import Session
+
+from app.api.deps import PaginationParams
+from app.api.responses import FastJSONResponse
+from app.db.database import get_db
+from app.models.client import Client
+from app.models.fts import clients_fts, match_expression, matches, projects_fts, time_entries_fts
+from app.models.project import Project
+from app.models.time_entry import TimeEntry
+from app.schemas.common import Page
+from app.schemas.search import SearchHit, SearchType
+
+router = APIRouter()
+
+_SNIPPET_TOKENS = 12
+
+
+def _snippet(fts) -> object:
+    # -1: FTS5 сам выбирает колонку с лучшим совпадением
+    return func.snippet(literal_column(fts.name), -1, "<mark>", "</mark>", "…", _SNIPPET_TOKENS)
+
+
+def _bm25(fts, *weights: float) -> object:
+    # Веса колонок в порядке объявления FTS-таблицы
+    return func.bm25(literal_column(fts.name), *weights)
+
+
+def _client_hits(match: str, client_id: int | None) -> Select:
+    stmt = (
+        select(
+            literal(SearchType.client.value).label("type"),
+            Client.id.label("id"),
+            Client.name.label("title"),
+            _snippet(clients_fts).label("snippet"),
+            _bm25(clients_fts, 10.0, 5.0, 5.0).label("rank"),
+            Client.id.label("client_id"),
+            type_coerce(null(), Integer).label("project_id"),
+            type_coerce(null(), Date).label("date"),
+        )
+        .select_from(clients_fts)
+        .join(Client, Client.id == clients_fts.c.rowid)
+        .where(matches(clients_fts, match))
+    )
+    if client_id is not None:
+        stmt = stmt.where(Client.id == client_id)
+    return stmt
+
+
+def _project_hits(match: str, client_id: int | None) -> Select:
+    stmt = (
+        select(
+            literal(SearchType.project.value).label("type"),
+            Project.id.label("id"),
+            Project.name.label("title"),
+            _snippet(projects_fts).label("snippet"),
+            _bm25(projects_fts, 10.0, 2.0).label("rank"),
+            Project.client_id.label("client_id"),
+            Project.id.label("project_id"),
+            type_coerce(null(), Date).label("date"),
+        )
+        .select_from(projects_fts)
+        .join(Project, Project.id == projects_fts.c.rowid)
+        .where(matches(projects_fts, match))
+    )
+    if client_id is not None:
+        stmt = stmt.where(Project.client_id == client_id)
+    return stmt
+
+
+def _time_entry_hits(match: str, client_id: int | None) -> Select:
+    stmt = (
+        select(
+            literal(SearchType.time_entry.value).label("type"),
+            TimeEntry.id.label("id"),
+            Project.name.label("title"),
+            _snippet(time_entries_fts).label("snippet"),
+            _bm25(time_entries_fts).label("rank"),
+            TimeEntry.client_id.label("client_id"),
+            TimeEntry.project_id.label("project_id"),
+            TimeEntry.date.label("date"),
+        )
+        .select_from(time_entries_fts)
+        .join(TimeEntry, TimeEntry.id == time_entries_fts.c.rowid)
+        .join(Project, Project.id == TimeEntry.project_id)
+        .where(matches(time_entries_fts, match))
+    )
+    if client_id is not None:
+        stmt = stmt.where(TimeEntry.client_id == client_id)
+    return stmt
+
+
+_HIT_QUERIES = {
+    SearchType.client: _client_hits,
+    SearchType.project: _project_hits,
+    SearchType.time_entry: _time_entry_hits,
+}
+
+
+@router.get(
+    "",
+    response_model=Page[SearchHit],
+    summary="Полнотекстовый поиск",
+    description=(
+        "Поиск по клиентам (название, контакт, ИНН), проектам (название, описание) "
+        "и описаниям записей времени. Каждое слово запроса ищется как начало слова "
+        "(«догов» найдёт «договор»), слова объединяются по И. "
+        "Результаты отсортированы по релевантности (bm25)."
+    ),
+)
+def search(
+    q: str = Query(..., min_length=1, max_length=200, description="Поисковый запрос"),
+    types: list[SearchType] | None = Query(
+        None, alias="type", description="Искать только среди указанных типов"
+    ),
+    client_id: int | None = Query(None, description="Только по клиенту"),
+    pagination: PaginationParams = Depends(),
+    db: Session = Depends(get_db),
+) -> FastJSONResponse:
+    match = match_expression(q)
+    if match is None:
+        empty = Page.create(items=[], total=0, page=pagination.page, size=pagination.size)
+        return FastJSONResponse(empty.model_dump(mode="json"))
+
+    hits = union_all(
+        *(_HIT_QUERIES[t](match, client_id) for t in (types or SearchType))
+    ).subquery("hits")
+    return FastJSONResponse(
+        pagination.paginate_rows(
+            db, select(hits), hits.c.rank, hits.c.type, hits.c.id
+        )
+    )
@@ -1,18 +1,28 @@
 
 from datetime import date
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy import select
 from sqlalchemy.orm import Session, joinedload
 
 from app.api.deps import PaginationParams
+from app.api.responses import FastJSONResponse
 from app.db.database import get_db
+from app.export.xlsx import XLSX_MEDIA_TYPE
+from app.export.time_entries import export_statement, stream_csv, stream_ndjson, stream_xlsx
+from app.importers.time_entries import ImportEncodingError, import_time_entries
 from app.models.enums import TimeEntryStatus
 from app.models.project import Project
 from app.models.time_entry import TimeEntry
-from app.schemas.common import Page
+from app.schemas.common import ExportFormat, ImportEncoding, ImportFormat, Page
 from app.schemas.time_entry import (
+    BatchOperationResult,
+    BatchRequest,
+    BatchResponse,
     BulkConfirmRequest,
     BulkConfirmResponse,
+    ImportResponse,
     TimeEntryCreate,
     TimeEntryRead,
     TimeEntryUpdate,
@@ -20,6 +30,51 @@ from app.schemas.time_entry import (
 
 router = APIRouter()
 
+# Колонки в порядке полей TimeEntryRead — для быстрого пути списка
+_READ_COLUMNS = (
+    TimeEntry.date,
+    TimeEntry.duration_hours,
+    TimeEntry.description,
+    TimeEntry.id,
+    TimeEntry.project_id,
+    TimeEntry.client_id,
+    TimeEntry.status,
+    TimeEntry.created_at,
+    TimeEntry.updated_at,
+)
+
+
+class TimeEntryFilters:
+    """Dependency с фильтрами списка записей (общие для списка и экспорта)."""
+
+    def __init__(
+        self,
+        client_id: int | None = Query(None, description="Фильтр по клиенту"),
+        project_id: int | None = Query(None, description="Фильтр по проекту"),
+        date_from: date | None = Query(None, description="Дата начала периода (включительно)"),
+        date_to: date | None = Query(None, description="Дата конца периода (включительно)"),
+        entry_status: TimeEntryStatus | None = Query(None, alias="status", description="Фильтр по статусу"),
+    ):
+        self.client_id = client_id
+        self.project_id = project_id
+        self.date_from = date_from
+        self.date_to = date_to
+        self.entry_status = entry_status
+
+    def apply(self, q):
+        """Наложить фильтры на Query или Select."""
+        if self.client_id is not None:
+            q = q.filter(TimeEntry.client_id == self.client_id)
+        if self.project_id is not None:
+            q = q.filter(TimeEntry.project_id == self.project_id)
+        if self.date_from is not None:
+            q = q.filter(TimeEntry.date >= self.date_from)
+        if self.date_to is not None:
+            q = q.filter(TimeEntry.date <= self.date_to)
+        if self.entry_status is not None:
+            q = q.filter(TimeEntry.status == self.entry_status)
+        return q
+
 
 def _get_or_404(entry_id: int, db: Session) -> TimeEntry:
     entry = db.get(TimeEntry, entry_id)
@@ -31,6 +86,22 @@ def _get_or_404(entry_id: int, db: Session) -> TimeEntry:
     return entry
 
 
+def _ensure_editable(entry: TimeEntry) -> None:
+    if entry.status == TimeEntryStatus.billed:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Запись уже включена в счёт (billed) и не может быть изменена",
+        )
+
+
+def _ensure_deletable(entry: TimeEntry) -> None:
+    if entry.status != TimeEntryStatus.draft:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Можно удалить только запись в статусе draft. Текущий статус: {entry.status.value}",
+        )
+
+
 # ──────────────────────────────────────────────────────────────────────────────
 # NOTE: bulk-confirm is registered BEFORE /{id}/confirm to avoid routing
 # ambiguity (though FastAPI resolves by type, this is cleaner).
@@ -77,41 +148,192 @@ def bulk_confirm(
     )
 
 
+@router.post(
+    "/batch",
+    response_model=BatchResponse,
+    summary="Пакет операций create / update / delete",
+    description=(
+        "Выполняет смешанный список операций в одной транзакции. Проекты и записи "
+        "загружаются двумя IN-запросами на весь пакет. Правила одиночных операций "
+        "сохраняются: **billed**-запись нельзя изменить, удалить можно только **draft**. "
+        "Если хотя бы одна операция не прошла, ничего не применяется и возвращается 409 "
+        "с результатом по каждой операции."
+    ),
+    responses={409: {"model": BatchResponse, "description": "Пакет отклонён, изменения не применены"}},
+)
+def batch_time_entries(
+    data: BatchRequest,
+    db: Session = Depends(get_db),
+) -> BatchResponse | JSONResponse:
+    ops = data.operations
+
+    project_ids = {op.data.project_id for op in ops if op.op == "create"}
+    project_clients = dict(
+        db.query(Project.id, Project.client_id).filter(Project.id.in_(project_ids)).all()
+    ) if project_ids else {}
+
+    entry_ids = {op.id for op in ops if op.op != "create"}
+    entries = {
+        e.id: e for e in db.query(TimeEntry).filter(TimeEntry.id.in_(entry_ids)).all()
+    } if entry_ids else {}
+
+    results: list[BatchOperationResult] = []
+    touched: list[tuple[BatchOperationResult, TimeEntry]] = []
+    deleted_ids: set[int] = set()
+    failed = False
+
+    for index, op in enumerate(ops):
+        result = BatchOperationResult(index=index, op=op.op, status_code=status.HTTP_200_OK)
+        results.append(result)
+        try:
+            if op.op == "create":
+                client_id = project_clients.get(op.data.project_id)
+                if client_id is None:
+                    raise HTTPException(
+                        status_code=status.HTTP_404_NOT_FOUND,
+                        detail=f"Проект с id={op.data.project_id} не найден",
+                    )
+                entry = TimeEntry(**op.data.model_dump(), client_id=client_id)
+                db.add(entry)
+                result.status_code = status.HTTP_201_CREATED
+                touched.append((result, entry))
+                continue
+
+            result.id = op.id
+            entry = entries.get(op.id)
+            if entry is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Запись времени с id={op.id} не найдена",
+                )
+            if op.op == "update":
+                _ensure_editable(entry)
+                for field, value in op.data.model_dump(exclude_unset=True).items():
+                    setattr(entry, field, value)
+                touched.append((result, entry))
+            else:
+                _ensure_deletable(entry)
+                db.delete(entry)
+                # Последующие операции над этой записью получат 404
+                del entries[op.id]
+                deleted_ids.add(op.id)
+                result.status_code = status.HTTP_204_NO_CONTENT
+        except HTTPException as exc:
+            failed = True
+            result.status_code = exc.status_code
+            result.detail = exc.detail
+
+    if failed:
+        db.rollback()
+        for result in results:
+            result.entry = None
+        return JSONResponse(
+            status_code=status.HTTP_409_CONFLICT,
+            content=BatchResponse(applied=False, results=results).model_dump(mode="json"),
+        )
+
+    db.flush()
+    alive = [(result, entry) for result, entry in touched if entry.id not in deleted_ids]
+    ids = [entry.id for _, entry in alive]
+    db.commit()
+
+    # Один SELECT обновляет все объекты, истёкшие после commit
+    if ids:
+        db.query(TimeEntry).filter(TimeEntry.id.in_(ids)).all()
+    for result, entry in alive:
+        result.id = entry.id
+        result.entry = TimeEntryRead.model_validate(entry)
+
+    return BatchResponse(applied=True, results=results)
+
+
+@router.post(
+    "/import",
+    response_model=ImportResponse,
+    summary="Массовый импорт записей времени (CSV / NDJSON)",
+    description=(
+        "Файл читается потоково и обрабатывается пачками: валидация по схеме создания записи, "
+        "проверка проектов одним запросом на пачку, вставка через executemany. "
+        "Все пачки — в одной транзакции. Строки с ошибками пропускаются и возвращаются в `errors`; "
+        "при `atomic=true` любая ошибка отменяет весь импорт. "
+        "Колонки: `project_id`, `date`, `duration_hours`, `description` (остальные игнорируются). "
+        "Файл не в заданной кодировке — 422, импорт не выполняется."
+    ),
+    responses={422: {"description": "Ошибка параметров или кодировки файла"}},
+)
+def import_entries(
+    file: UploadFile = File(..., description="CSV с заголовком или NDJSON (по объекту на строку)"),
+    import_format: ImportFormat | None = Query(
+        None, alias="format", description="Формат файла; по умолчанию — по расширению/Content-Type"
+    ),
+    atomic: bool = Query(False, description="Всё или ничего: откатить импорт при любой ошибке"),
+    encoding: ImportEncoding = Query(ImportEncoding.utf8, description="Кодировка файла"),
+    db: Session = Depends(get_db),
+) -> ImportResponse:
+    if import_format is None:
+        name = (file.filename or "").lower()
+        is_ndjson = name.endswith((".ndjson", ".jsonl")) or "json" in (file.content_type or "")
+        import_format = ImportFormat.ndjson if is_ndjson else ImportFormat.csv
+
+    try:
+        result = import_time_entries(db, file.file, import_format, atomic=atomic, encoding=encoding)
+    except ImportEncodingError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)) from exc
+    db.commit()
+    return result
+
+
 @router.get(
     "",
     response_model=Page[TimeEntryRead],
     summary="Список записей времени",
 )
 def list_time_entries(
-    client_id: int | None = Query(None, description="Фильтр по клиенту (через проект)"),
-    project_id: int | None = Query(None, description="Фильтр по проекту"),
-    date_from: date | None = Query(None, description="Дата начала периода (включительно)"),
-    date_to: date | None = Query(None, description="Дата конца периода (включительно)"),
-    entry_status: TimeEntryStatus | None = Query(None, alias="status", description="Фильтр по статусу"),
+    filters: TimeEntryFilters = Depends(),
     pagination: PaginationParams = Depends(),
     db: Session = Depends(get_db),
-) -> Page[TimeEntryRead]:
-    q = db.query(TimeEntry)
-
-    if client_id is not None:
-        q = q.join(Project).filter(Project.client_id == client_id)
-    if project_id is not None:
-        q = q.filter(TimeEntry.project_id == project_id)
-    if date_from is not None:
-        q = q.filter(TimeEntry.date >= date_from)
-    if date_to is not None:
-        q = q.filter(TimeEntry.date <= date_to)
-    if entry_status is not None:
-        q = q.filter(TimeEntry.status == entry_status)
-
-    total = q.count()
-    items = (
-        q.order_by(TimeEntry.date.desc(), TimeEntry.id.desc())
-        .offset(pagination.offset)
-        .limit(pagination.size)
-        .all()
+) -> FastJSONResponse:
+    # Быстрый путь: строки колонок → dict → orjson, без ORM-объектов и
+    # Pydantic-валидации. Форма ответа та же, что у Page[TimeEntryRead].
+    stmt = filters.apply(select(*_READ_COLUMNS))
+    page = pagination.paginate_rows(db, stmt, TimeEntry.date.desc(), TimeEntry.id.desc())
+    return FastJSONResponse(page)
+
+
+@router.get(
+    "/export",
+    summary="Экспорт записей времени (CSV / NDJSON / XLSX)",
+    description=(
+        "Потоковая выгрузка всех записей по тем же фильтрам, что и список, "
+        "с названиями клиента и проекта. Память сервера не зависит от объёма выгрузки."
+    ),
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "content": {"text/csv": {}, "application/x-ndjson": {}, XLSX_MEDIA_TYPE: {}},
+            "description": "Файл выгрузки",
+        },
+    },
+)
+def export_time_entries(
+    export_format: ExportFormat = Query(ExportFormat.csv, alias="format", description="Формат выгрузки"),
+    filters: TimeEntryFilters = Depends(),
+) -> StreamingResponse:
+    stmt = filters.apply(export_statement())
+
+    if export_format == ExportFormat.ndjson:
+        body, media_type = stream_ndjson(stmt), "application/x-ndjson"
+    elif export_format == ExportFormat.xlsx:
+        body, media_type = stream_xlsx(stmt), XLSX_MEDIA_TYPE
+    else:
+        body, media_type = stream_csv(stmt), "text/csv; charset=utf-8"
+
+    filename = f"time_entries.{export_format.value}"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
-    return Page.create(items=items, total=total, page=pagination.page, size=pagination.size)
 
 
 @router.post(
@@ -122,12 +344,13 @@ def list_time_entries(
     responses={404: {"description": "Проект не найден"}},
 )
 def create_time_entry(data: TimeEntryCreate, db: Session = Depends(get_db)) -> TimeEntry:
-    if db.get(Project, data.project_id) is None:
+    project = db.get(Project, data.project_id)
+    if project is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Проект с id={data.project_id} не найден",
         )
-    entry = TimeEntry(**data.model_dump())
+    entry = TimeEntry(**data.model_dump(), client_id=project.client_id)
     db.add(entry)
     db.commit()
     db.refresh(entry)
@@ -150,12 +373,7 @@ def update_time_entry(
     db: Session = Depends(get_db),
 ) -> TimeEntry:
     entry = _get_or_404(entry_id, db)
-
-    if entry.status == TimeEntryStatus.billed:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="Запись уже включена в счёт (billed) и не может быть изменена",
-        )
+    _ensure_editable(entry)
 
     for field, value in data.model_dump(exclude_unset=True).items():
         setattr(entry, field, value)
@@ -177,12 +395,7 @@ def update_time_entry(
 )
 def delete_time_entry(entry_id: int, db: Session = Depends(get_db)) -> None:
     entry = _get_or_404(entry_id, db)
-
-    if entry.status != TimeEntryStatus.draft:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail=f"Можно удалить только запись в статусе draft. Текущий статус: {entry.status.value}",
-        )
+    _ensure_deletable(entry)
 
     db.delete(entry)
     db.commit()
@@ -0,0 +1,153 @@
+"""Timers — running work timers kept server-side, converted to time entries on stop."""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timezone
+from zoneinfo import ZoneInfo
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.database import get_db
+from app.models.active_timer import ActiveTimer
+from app.models.project import Project
+from app.models.time_entry import TimeEntry
+from app.schemas.time_entry import TimeEntryRead
+from app.schemas.timer import TimerRead, TimerStart, TimerStop
+
+router = APIRouter()
+
+
+def _utcnow() -> datetime:
+    # В БД — UTC без часового пояса
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _to_utc_naive(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _local_date(value: datetime) -> date:
+    # UTC из БД → дата в часовом поясе пользователя (TIMEZONE)
+    return value.replace(tzinfo=timezone.utc).astimezone(ZoneInfo(settings.TIMEZONE)).date()
+
+
+def _timer_not_found(timer_id: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f"Таймер с id={timer_id} не найден",
+    )
+
+
+@router.get(
+    "",
+    response_model=list[TimerRead],
+    summary="Запущенные таймеры",
+    description=(
+        "Все запущенные таймеры (можно фильтровать по проекту). Ответ меняется только "
+        "при старте/остановке таймеров — подходит для частого опроса с If-None-Match."
+    ),
+)
+def list_timers(
+    project_id: int | None = Query(None, description="Фильтр по проекту"),
+    db: Session = Depends(get_db),
+) -> list[ActiveTimer]:
+    q = db.query(ActiveTimer)
+    if project_id is not None:
+        q = q.filter(ActiveTimer.project_id == project_id)
+    return q.order_by(ActiveTimer.started_at, ActiveTimer.id).all()
+
+
+@router.post(
+    "",
+    response_model=TimerRead,
+    status_code=status.HTTP_201_CREATED,
+    summary="Запустить таймер",
+    responses={
+        404: {"description": "Проект не найден"},
+        422: {"description": "Время старта в будущем"},
+    },
+)
+def start_timer(data: TimerStart, db: Session = Depends(get_db)) -> ActiveTimer:
+    if db.get(Project, data.project_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Проект с id={data.project_id} не найден",
+        )
+    now = _utcnow()
+    started_at = _to_utc_naive(data.started_at) if data.started_at else now
+    if started_at > now:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Время старта таймера не может быть в будущем",
+        )
+    timer = ActiveTimer(
+        project_id=data.project_id,
+        description=data.description,
+        started_at=started_at,
+    )
+    db.add(timer)
+    db.commit()
+    db.refresh(timer)
+    return timer
+
+
+@router.post(
+    "/{timer_id}/stop",
+    response_model=TimeEntryRead,
+    status_code=status.HTTP_201_CREATED,
+    summary="Остановить таймер",
+    description=(
+        "Удаляет таймер и создаёт запись времени (draft) в одной транзакции. "
+        "Длительность округляется вверх до 15 минут, минимум 0.25 ч. "
+        "Дата записи по умолчанию — дата старта в часовом поясе TIMEZONE."
+    ),
+    responses={404: {"description": "Таймер не найден (или уже остановлен)"}},
+)
+def stop_timer(
+    timer_id: int,
+    data: TimerStop | None = None,
+    db: Session = Depends(get_db),
+) -> TimeEntry:
+    data = data or TimerStop()
+    now = _utcnow()
+
+    # DELETE ... RETURNING: из параллельных остановок одного таймера
+    # запись создаст только одна
+    timer = db.execute(
+        delete(ActiveTimer).where(ActiveTimer.id == timer_id).returning(ActiveTimer)
+    ).scalar_one_or_none()
+    if timer is None:
+        raise _timer_not_found(timer_id)
+
+    project = db.get(Project, timer.project_id)
+    entry = TimeEntry(
+        project_id=timer.project_id,
+        client_id=project.client_id,
+        date=data.date or _local_date(timer.started_at),
+        duration_hours=timer.billable_hours(now),
+        description=data.description if data.description is not None else timer.description,
+    )
+    db.add(entry)
+    db.commit()
+    db.refresh(entry)
+    return entry
+
+
+@router.delete(
+    "/{timer_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    response_model=None,
+    summary="Сбросить таймер",
+    description="Удаляет таймер без создания записи времени.",
+    responses={404: {"description": "Таймер не найден"}},
+)
+def discard_timer(timer_id: int, db: Session = Depends(get_db)) -> None:
+    result = db.execute(delete(ActiveTimer).where(ActiveTimer.id == timer_id))
+    if result.rowcount == 0:
+        raise _timer_not_found(timer_id)
+    db.commit()
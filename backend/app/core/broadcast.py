@@ -0,0 +1,116 @@
+"""
+Оповещение открытых SSE-потоков об изменениях таблиц.
+
+Два источника событий:
+
+* ``after_commit`` сессий этого процесса (app.models.data_version.on_commit) —
+  мгновенно, без запросов к БД;
+* опрос data_versions раз в LIVE_POLL_SECONDS — изменения, сделанные другими
+  воркерами gunicorn, фоновыми задачами или миграциями. Опрос идёт одной
+  задачей на воркер и только пока открыт хотя бы один поток.
+
+Подписчик получает множество изменившихся таблиц; повторные оповещения,
+пришедшие до того, как он их прочитал, склеиваются в одно.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.models.data_version import on_commit, read_all_versions
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    def __init__(self) -> None:
+        self._tables: set[str] = set()
+        self._event = asyncio.Event()
+
+    def _push(self, tables: frozenset[str]) -> None:
+        self._tables |= tables
+        self._event.set()
+
+    async def wait(self, timeout: float) -> set[str]:
+        """Изменившиеся таблицы; пустое множество — за ``timeout`` секунд изменений не было."""
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._event.clear()
+        tables, self._tables = self._tables, set()
+        return tables
+
+
+class ChangeBroadcaster:
+    def __init__(self, poll_interval: float) -> None:
+        self.poll_interval = poll_interval
+        self._subscriptions: set[Subscription] = set()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._watcher: asyncio.Task | None = None
+
+    @asynccontextmanager
+    async def subscribe(self) -> AsyncIterator[Subscription]:
+        subscription = Subscription()
+        self._loop = asyncio.get_running_loop()
+        self._subscriptions.add(subscription)
+        # done(): задача опроса завершилась (не должна, но тогда — перезапуск)
+        if (self._watcher is None or self._watcher.done()) and self.poll_interval > 0:
+            self._watcher = asyncio.create_task(self._watch())
+        try:
+            yield subscription
+        finally:
+            self._subscriptions.discard(subscription)
+            if not self._subscriptions and self._watcher is not None:
+                self._watcher.cancel()
+                self._watcher = None
+
+    def notify(self, tables: frozenset[str]) -> None:
+        """Оповестить подписчиков; можно вызывать из любого потока."""
+        loop = self._loop
+        if loop is None or not self._subscriptions:
+            return
+        try:
+            loop.call_soon_threadsafe(self._dispatch, tables)
+        except RuntimeError:
+            # Цикл событий уже закрыт (остановка воркера)
+            pass
+
+    def _dispatch(self, tables: frozenset[str]) -> None:
+        for subscription in list(self._subscriptions):
+            subscription._push(tables)
+
+    async def _watch(self) -> None:
+        # Первое удачное чтение — точка отсчёта. Ошибка любого чтения, в том
+        # числе первого, не завершает задачу: опрос повторится через интервал
+        last: dict[str, int] | None = None
+        while True:
+            try:
+                current = await run_in_threadpool(_read_all_versions)
+            except Exception:
+                logger.exception("Не удалось прочитать data_versions")
+            else:
+                if last is not None:
+                    changed = frozenset(
+                        name for name, version in current.items() if last.get(name) != version
+                    )
+                    if changed:
+                        self._dispatch(changed)
+                last = current
+            await asyncio.sleep(self.poll_interval)
+
+
+def _read_all_versions() -> dict[str, int]:
+    with SessionLocal() as db:
+        return read_all_versions(db)
+
+
+changes = ChangeBroadcaster(poll_interval=settings.LIVE_POLL_SECONDS)
+on_commit(changes.notify)
@@ -0,0 +1,51 @@
+"""
+Кэш в памяти воркера, согласованный между процессами через data_versions.
+
+Каждый воркер (gunicorn) держит свой кэш — без общего хранилища. Запись
+помнит версии таблиц, из которых она посчитана; при чтении версии
+сверяются одним SELECT по PK таблицы data_versions в той же сессии.
+Изменение в любом воркере увеличивает версию в БД в своей транзакции,
+поэтому устаревшая запись не отдаётся ни в одном процессе.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, TypeVar
+
+from sqlalchemy.orm import Session
+
+from app.models.data_version import read_versions
+
+V = TypeVar("V")
+
+
+class VersionedCache(Generic[V]):
+    def __init__(self, tables: tuple[str, ...], max_entries: int = 128) -> None:
+        self.tables = tables
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, tuple[tuple[int, ...], V]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, db: Session, key: Hashable, compute: Callable[[], V]) -> V:
+        versions = read_versions(db, self.tables)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == versions:
+                self._entries.move_to_end(key)
+                return entry[1]
+
+        # Считаем вне блокировки: параллельные промахи по одному ключу
+        # посчитают значение дважды, но не задержат остальные ключи
+        value = compute()
+        with self._lock:
+            self._entries[key] = (versions, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -7,6 +7,39 @@ class Settings(BaseSettings):
 
     DATABASE_URL: str = "sqlite:///./billing.db"
 
+    # Сверка ревизии БД с head миграций при старте: fail | warn | off
+    SCHEMA_CHECK: str = "fail"
+
+    # Валюта отчётов и дашборда; суммы проектов в других валютах
+    # пересчитываются по курсу ЦБ РФ
+    BASE_CURRENCY: str = "RUB"
+    # cbr — курсы с cbr.ru; fixture — из JSON-файла RATES_FIXTURE_PATH (без сети)
+    RATES_PROVIDER: str = "cbr"
+    RATES_FIXTURE_PATH: str | None = None
+
+    # Загрузить WeasyPrint и шрифты при старте, а не при первом PDF
+    # (по умолчанию — лениво: воркеры без PDF не платят памятью и временем старта)
+    PDF_PREWARM: bool = False
+    # Каталог готовых PDF счетов: рендер в фоне при создании и отправке счёта,
+    # скачивание отдаёт файл. Не задан — без кэша (рендер на каждый запрос);
+    # каталог — вне исходников, рядом с БД (в docker-compose — /app/data/pdf_cache)
+    PDF_CACHE_DIR: str | None = None
+
+    # Движок разбивки /reports: sql — GROUP BY в БД; columnar — колонки записей
+    # в памяти воркера и NumPy (pip install numpy), быстрее на многолетних периодах
+    REPORT_ENGINE: str = "sql"
+
+    # Часовой пояс пользователя (IANA): дата записи времени из таймера —
+    # локальная дата старта, а не дата по часам сервера (в контейнере — UTC)
+    TIMEZONE: str = "Europe/Moscow"
+
+    # Фоновый перевод просроченных счетов в overdue (при старте и ежедневно)
+    OVERDUE_SWEEPER_ENABLED: bool = True
+
+    # Как часто SSE-потоки воркера сверяют data_versions, чтобы заметить
+    # изменения из других воркеров (свои коммиты доходят сразу); 0 — не сверять
+    LIVE_POLL_SECONDS: float = 2.0
+
     CORS_ORIGINS: list[str] = [
         "http://localhost:3000",
         "http://frontend:3000",
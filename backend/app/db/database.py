@@ -1,11 +1,13 @@
-from sqlalchemy import create_engine
+from sqlalchemy import Connection, Table, create_engine
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
 
 from app.core.config import settings
 
 engine = create_engine(
     settings.DATABASE_URL,
-    connect_args={"check_same_thread": False},  # needed for SQLite
+    # needed for SQLite
+    connect_args={"check_same_thread": False} if settings.DATABASE_URL.startswith("sqlite") else {},
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -21,3 +23,13 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def upsert(connection: Connection, table: Table):
+    """
+    INSERT с ON CONFLICT для диалекта соединения (SQLite / PostgreSQL):
+    у обоих .on_conflict_do_nothing() / .on_conflict_do_update() одинаковы.
+    """
+    if connection.dialect.name == "postgresql":
+        return postgresql.insert(table)
+    return sqlite.insert(table)
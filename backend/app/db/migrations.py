@@ -0,0 +1,87 @@
+"""
+Версия схемы БД: быстрая проверка при старте и инициализация для разработки.
+
+Схемой управляет только Alembic (`alembic upgrade head` в Docker CMD).
+Приложение при старте не создаёт таблицы, а одним SELECT сверяет
+alembic_version с head из каталога миграций — без инспекции таблиц и без
+гонки DDL, когда одновременно стартует несколько воркеров.
+"""
+
+import logging
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import Engine, inspect, text
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+# Начальная миграция — схема, которую создавал прежний create_all при старте
+LEGACY_REVISION = "903e3eb82d87"
+
+
+class SchemaVersionError(RuntimeError):
+    """Ревизия БД не совпадает с head миграций."""
+
+
+def _alembic_config() -> Config:
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "alembic"))
+    return config
+
+
+def head_revision() -> str | None:
+    return ScriptDirectory.from_config(_alembic_config()).get_current_head()
+
+
+def current_revision(engine: Engine) -> str | None:
+    """Ревизия БД; None — база не под управлением Alembic (или пустая)."""
+    try:
+        with engine.connect() as conn:
+            return conn.scalar(text("SELECT version_num FROM alembic_version"))
+    except OperationalError:
+        return None
+
+
+def check_schema(engine: Engine) -> None:
+    """
+    Сверить ревизию БД с head. Поведение — SCHEMA_CHECK:
+    fail — SchemaVersionError (приложение не стартует), warn — предупреждение в лог,
+    off — без проверки.
+    """
+    if settings.SCHEMA_CHECK == "off":
+        return
+
+    current, head = current_revision(engine), head_revision()
+    if current == head:
+        return
+
+    message = (
+        f"Схема БД на ревизии {current or 'отсутствует'}, код ожидает {head}. "
+        "Выполните `alembic upgrade head` (для разработки: `python -m app.main --init-db`)"
+    )
+    if settings.SCHEMA_CHECK == "warn":
+        logger.warning(message)
+        return
+    raise SchemaVersionError(message)
+
+
+def init_db(engine: Engine) -> None:
+    """
+    Привести БД к head для разработки: `alembic upgrade head`.
+
+    База, созданная раньше через create_all (таблицы есть, alembic_version
+    нет), совпадает со схемой LEGACY_REVISION: она помечается этой ревизией
+    и догоняется обычным upgrade — со всеми колонками, индексами и
+    заполнением данных (FTS, счётчики дашборда) из последующих миграций.
+    """
+    config = _alembic_config()
+    if current_revision(engine) is None and inspect(engine).has_table("clients"):
+        command.stamp(config, LEGACY_REVISION)
+    command.upgrade(config, "head")
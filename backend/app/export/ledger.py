@@ -0,0 +1,337 @@
+"""
+Выгрузка учёта — записей времени, счетов и позиций счетов — в Parquet или
+Arrow IPC для аналитики вне приложения (pandas, Polars, DuckDB).
+
+Строки читаются пачками через yield_per и пишутся по пачке на row group
+(Parquet) или record batch (Arrow IPC): память не зависит от объёма
+таблицы. Таблицы денормализованы — рядом с id названия клиента и проекта.
+Деньги и часы — decimal той же точности, что в БД.
+
+Секционирование по дате (month / year) раскладывает файлы по каталогам в
+стиле Hive: ``time_entries/month=2026-01/part-0.parquet``. Выборка идёт в
+порядке даты, поэтому в каждый момент открыт один файл.
+
+pyarrow — необязательная зависимость, импортируется при первой выгрузке.
+
+CLI (из директории backend/):
+    python -m app.export.ledger out/
+    python -m app.export.ledger out/ --format arrow --partition month
+    python -m app.export.ledger out/ --date-from 2026-01-01 --date-to 2026-06-30
+"""
+
+from __future__ import annotations
+
+import enum
+from dataclasses import dataclass
+from datetime import date
+from itertools import groupby
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Iterator
+
+from sqlalchemy import ColumnElement, Select, String, func, select, type_coerce
+
+from app.db.database import SessionLocal
+from app.export.sink import ChunkSink
+from app.export.time_entries import _to_record, export_statement
+from app.models.client import Client
+from app.models.invoice import Invoice
+from app.models.invoice_item import InvoiceItem
+from app.models.project import Project
+from app.models.time_entry import TimeEntry
+from app.rates.service import RUB
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+# Строк на одну выборку из курсора и на один row group / record batch
+LEDGER_BATCH_SIZE = 20_000
+
+
+class LedgerTable(str, enum.Enum):
+    time_entries = "time_entries"
+    invoices = "invoices"
+    invoice_items = "invoice_items"
+
+
+class LedgerFormat(str, enum.Enum):
+    parquet = "parquet"
+    arrow = "arrow"  # Arrow IPC (feather v2)
+
+
+class LedgerPartition(str, enum.Enum):
+    month = "month"
+    year = "year"
+
+
+MEDIA_TYPES = {
+    LedgerFormat.parquet: "application/vnd.apache.parquet",
+    LedgerFormat.arrow: "application/vnd.apache.arrow.file",
+}
+
+
+def require_pyarrow() -> None:
+    """ImportError, если pyarrow не установлен — до начала потоковой выгрузки."""
+    import pyarrow  # noqa: F401
+
+
+@dataclass(frozen=True)
+class _TableSpec:
+    statement: Select  # с ORDER BY по дате секционирования
+    date_column: ColumnElement[date]  # для фильтра по периоду
+    date_field: str  # поле записи для секционирования
+    schema: pa.Schema
+    to_record: Callable[[Any], dict]
+
+
+def _spec(table: LedgerTable) -> _TableSpec:
+    import pyarrow as pa
+
+    money = pa.decimal128(14, 2)
+    if table == LedgerTable.time_entries:
+        return _TableSpec(
+            statement=export_statement(),
+            date_column=TimeEntry.date,
+            date_field="date",
+            schema=pa.schema([
+                ("id", pa.int64()),
+                ("date", pa.date32()),
+                ("client_id", pa.int64()),
+                ("client_name", pa.string()),
+                ("project_id", pa.int64()),
+                ("project_name", pa.string()),
+                ("description", pa.string()),
+                ("duration_hours", pa.decimal128(5, 2)),
+                ("rate", pa.decimal128(10, 2)),
+                ("amount", money),
+                ("currency", pa.string()),
+                ("status", pa.string()),
+                ("created_at", pa.timestamp("us")),
+                ("updated_at", pa.timestamp("us")),
+            ]),
+            to_record=_to_record,
+        )
+
+    if table == LedgerTable.invoices:
+        total = (
+            select(func.coalesce(func.sum(InvoiceItem.amount), 0))
+            .where(InvoiceItem.invoice_id == Invoice.id)
+            .scalar_subquery()
+        )
+        return _TableSpec(
+            statement=(
+                select(
+                    Invoice.id,
+                    Invoice.invoice_number,
+                    Invoice.client_id,
+                    Client.name.label("client_name"),
+                    Invoice.issue_date,
+                    Invoice.due_date,
+                    type_coerce(Invoice.status, String).label("status"),
+                    total.label("total_amount"),
+                    Invoice.notes,
+                    Invoice.created_at,
+                )
+                .join(Client, Client.id == Invoice.client_id)
+                .order_by(Invoice.issue_date, Invoice.id)
+            ),
+            date_column=Invoice.issue_date,
+            date_field="issue_date",
+            schema=pa.schema([
+                ("id", pa.int64()),
+                ("invoice_number", pa.string()),
+                ("client_id", pa.int64()),
+                ("client_name", pa.string()),
+                ("issue_date", pa.date32()),
+                ("due_date", pa.date32()),
+                ("status", pa.string()),
+                ("total_amount", money),
+                ("notes", pa.string()),
+                ("created_at", pa.timestamp("us")),
+            ]),
+            to_record=dict,
+        )
+
+    return _TableSpec(
+        statement=(
+            select(
+                InvoiceItem.id,
+                InvoiceItem.invoice_id,
+                Invoice.invoice_number,
+                Invoice.issue_date,
+                Invoice.client_id,
+                Client.name.label("client_name"),
+                InvoiceItem.time_entry_id,
+                TimeEntry.date.label("work_date"),
+                TimeEntry.project_id,
+                Project.name.label("project_name"),
+                # Позиции без записи времени считаются рублёвыми, как в отчётах
+                func.coalesce(Project.currency, RUB).label("currency"),
+                InvoiceItem.hours,
+                InvoiceItem.rate,
+                InvoiceItem.amount,
+            )
+            .join(Invoice, Invoice.id == InvoiceItem.invoice_id)
+            .join(Client, Client.id == Invoice.client_id)
+            .outerjoin(TimeEntry, TimeEntry.id == InvoiceItem.time_entry_id)
+            .outerjoin(Project, Project.id == TimeEntry.project_id)
+            .order_by(Invoice.issue_date, InvoiceItem.id)
+        ),
+        date_column=Invoice.issue_date,
+        date_field="issue_date",
+        schema=pa.schema([
+            ("id", pa.int64()),
+            ("invoice_id", pa.int64()),
+            ("invoice_number", pa.string()),
+            ("issue_date", pa.date32()),
+            ("client_id", pa.int64()),
+            ("client_name", pa.string()),
+            ("time_entry_id", pa.int64()),
+            ("work_date", pa.date32()),
+            ("project_id", pa.int64()),
+            ("project_name", pa.string()),
+            ("currency", pa.string()),
+            ("hours", pa.decimal128(5, 2)),
+            ("rate", pa.decimal128(10, 2)),
+            ("amount", money),
+        ]),
+        to_record=dict,
+    )
+
+
+def _iter_batches(
+    spec: _TableSpec, date_from: date | None, date_to: date | None
+) -> Iterator[list[dict]]:
+    """
+    Пачки записей по LEDGER_BATCH_SIZE. Собственная сессия: генератор
+    дочитывается после выхода из обработчика запроса.
+    """
+    stmt = spec.statement
+    if date_from is not None:
+        stmt = stmt.where(spec.date_column >= date_from)
+    if date_to is not None:
+        stmt = stmt.where(spec.date_column <= date_to)
+
+    db = SessionLocal()
+    try:
+        result = db.execute(stmt.execution_options(yield_per=LEDGER_BATCH_SIZE))
+        for partition in result.mappings().partitions():
+            yield [spec.to_record(row) for row in partition]
+    finally:
+        db.close()
+
+
+class _Writer:
+    """Общий интерфейс ParquetWriter и Arrow IPC file writer."""
+
+    def __init__(self, sink: Any, schema: pa.Schema, fmt: LedgerFormat) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self.schema = schema
+        if fmt == LedgerFormat.parquet:
+            self._writer = pq.ParquetWriter(sink, schema, compression="zstd")
+        else:
+            self._writer = pa.ipc.new_file(sink, schema)
+
+    def write(self, records: list[dict]) -> None:
+        import pyarrow as pa
+
+        self._writer.write_batch(pa.RecordBatch.from_pylist(records, schema=self.schema))
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+def stream_table(
+    table: LedgerTable,
+    fmt: LedgerFormat,
+    date_from: date | None = None,
+    date_to: date | None = None,
+) -> Iterator[bytes]:
+    """Один файл таблицы по кускам: после каждой пачки — её row group / batch."""
+    spec = _spec(table)
+    sink = ChunkSink()
+    writer = _Writer(sink, spec.schema, fmt)
+    for batch in _iter_batches(spec, date_from, date_to):
+        writer.write(batch)
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+def _partition_key(day: date, partition: LedgerPartition) -> str:
+    if partition == LedgerPartition.month:
+        return f"month={day:%Y-%m}"
+    return f"year={day:%Y}"
+
+
+def write_table(
+    out_dir: Path,
+    table: LedgerTable,
+    fmt: LedgerFormat,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    partition: LedgerPartition | None = None,
+) -> int:
+    """Записать таблицу в out_dir (файл или каталог секций); число строк."""
+    spec = _spec(table)
+    suffix = f".{fmt.value}"
+    rows = 0
+    writer: _Writer | None = None
+    current_key: str | None = None
+    try:
+        for batch in _iter_batches(spec, date_from, date_to):
+            rows += len(batch)
+            if partition is None:
+                if writer is None:
+                    out_dir.mkdir(parents=True, exist_ok=True)
+                    writer = _Writer(str(out_dir / f"{table.value}{suffix}"), spec.schema, fmt)
+                writer.write(batch)
+                continue
+
+            # Строки отсортированы по дате: секция меняется только вперёд
+            for key, records in groupby(
+                batch, key=lambda record: _partition_key(record[spec.date_field], partition)
+            ):
+                if key != current_key:
+                    if writer is not None:
+                        writer.close()
+                    directory = out_dir / table.value / key
+                    directory.mkdir(parents=True, exist_ok=True)
+                    writer = _Writer(str(directory / f"part-0{suffix}"), spec.schema, fmt)
+                    current_key = key
+                writer.write(list(records))
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(prog="python -m app.export.ledger")
+    parser.add_argument("out_dir", type=Path, help="Каталог для файлов выгрузки")
+    parser.add_argument(
+        "--format", dest="fmt", default=LedgerFormat.parquet.value,
+        choices=[f.value for f in LedgerFormat], help="parquet (по умолчанию) или arrow (Arrow IPC)",
+    )
+    parser.add_argument(
+        "--partition", default=None, choices=[p.value for p in LedgerPartition],
+        help="Разбить по месяцам / годам даты записи (счета и позиции — по дате счёта)",
+    )
+    parser.add_argument("--date-from", type=date.fromisoformat, default=None, help="Начало периода")
+    parser.add_argument("--date-to", type=date.fromisoformat, default=None, help="Конец периода")
+    parser.add_argument(
+        "--table", action="append", choices=[t.value for t in LedgerTable],
+        help="Только эта таблица (можно повторить); по умолчанию — все",
+    )
+    args = parser.parse_args()
+
+    fmt = LedgerFormat(args.fmt)
+    partition = LedgerPartition(args.partition) if args.partition else None
+    for table in [LedgerTable(t) for t in args.table] if args.table else list(LedgerTable):
+        started = time.perf_counter()
+        rows = write_table(args.out_dir, table, fmt, args.date_from, args.date_to, partition)
+        print(f"{table.value}: {rows} строк, {time.perf_counter() - started:.1f} с")
@@ -0,0 +1,34 @@
+"""Буфер для потоковых выгрузок, которые пишут в файловый объект."""
+
+from __future__ import annotations
+
+import io
+
+
+class ChunkSink(io.RawIOBase):
+    """
+    Файл только для записи: копит байты до drain(). Писатель (ParquetWriter,
+    zipfile) пишет в него, вызывающий код после каждой пачки строк отдаёт
+    накопленное в ответ. seek не поддерживается — zipfile переходит в
+    потоковый режим (data descriptor после данных каждого файла).
+    """
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
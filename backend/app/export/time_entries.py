@@ -0,0 +1,153 @@
+"""Streaming export of time entries (CSV / NDJSON / XLSX)."""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Iterator
+
+from sqlalchemy import Select, func, select
+
+from app.db.database import SessionLocal
+from app.export.xlsx import XlsxStreamWriter
+from app.models.client import Client
+from app.models.lawyer_profile import LawyerProfile
+from app.models.project import Project
+from app.models.time_entry import TimeEntry
+
+# Строк на одну выборку из курсора и на один chunk ответа
+EXPORT_BATCH_SIZE = 1000
+
+COLUMNS = [
+    "id",
+    "date",
+    "client_id",
+    "client_name",
+    "project_id",
+    "project_name",
+    "description",
+    "duration_hours",
+    "rate",
+    "amount",
+    "currency",
+    "status",
+    "created_at",
+    "updated_at",
+]
+
+
+def export_statement() -> Select:
+    """
+    SELECT записей с именами клиента/проекта и эффективной ставкой.
+    Фильтры накладываются вызывающим кодом (.filter(...)).
+    """
+    default_rate = (
+        select(LawyerProfile.default_hourly_rate)
+        .order_by(LawyerProfile.id)
+        .limit(1)
+        .scalar_subquery()
+    )
+    return (
+        select(
+            TimeEntry.id,
+            TimeEntry.date,
+            TimeEntry.client_id,
+            Client.name.label("client_name"),
+            TimeEntry.project_id,
+            Project.name.label("project_name"),
+            TimeEntry.description,
+            TimeEntry.duration_hours,
+            func.coalesce(Project.hourly_rate, default_rate, 0).label("rate"),
+            Project.currency,
+            TimeEntry.status,
+            TimeEntry.created_at,
+            TimeEntry.updated_at,
+        )
+        .join(Project, Project.id == TimeEntry.project_id)
+        .join(Client, Client.id == TimeEntry.client_id)
+        .order_by(TimeEntry.date, TimeEntry.id)
+    )
+
+
+def iter_rows(stmt: Select) -> Iterator[list[dict]]:
+    """
+    Пачки строк по EXPORT_BATCH_SIZE через yield_per (server-side cursor там,
+    где драйвер его поддерживает). Открывает собственную сессию: генератор
+    дочитывается уже после выхода из обработчика, когда сессия запроса закрыта.
+    """
+    db = SessionLocal()
+    try:
+        result = db.execute(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        for partition in result.mappings().partitions():
+            yield [_to_record(row) for row in partition]
+    finally:
+        db.close()
+
+
+def _to_record(row) -> dict:
+    hours = Decimal(row["duration_hours"])
+    rate = Decimal(row["rate"])
+    return {
+        "id": row["id"],
+        "date": row["date"],
+        "client_id": row["client_id"],
+        "client_name": row["client_name"],
+        "project_id": row["project_id"],
+        "project_name": row["project_name"],
+        "description": row["description"],
+        "duration_hours": hours,
+        "rate": rate,
+        "amount": (hours * rate).quantize(Decimal("0.01")),
+        "currency": row["currency"],
+        "status": row["status"].value,
+        "created_at": row["created_at"],
+        "updated_at": row["updated_at"],
+    }
+
+
+def stream_csv(stmt: Select) -> Iterator[bytes]:
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=COLUMNS)
+    # BOM — чтобы Excel сразу открыл кириллицу в UTF-8
+    buf.write("\ufeff")
+    writer.writeheader()
+    for batch in iter_rows(stmt):
+        writer.writerows(batch)
+        yield buf.getvalue().encode("utf-8")
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue().encode("utf-8")
+
+
+def _json_default(value: object) -> str:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def stream_ndjson(stmt: Select) -> Iterator[bytes]:
+    for batch in iter_rows(stmt):
+        yield "".join(
+            json.dumps(record, ensure_ascii=False, default=_json_default) + "\n"
+            for record in batch
+        ).encode("utf-8")
+
+
+# Ширины колонок листа XLSX, в символах (по порядку COLUMNS)
+_XLSX_WIDTHS = [8, 11, 9, 28, 10, 28, 48, 9, 10, 12, 8, 10, 19, 19]
+
+
+def stream_xlsx(stmt: Select) -> Iterator[bytes]:
+    """Один лист; после каждой пачки строк — сжатый кусок книги."""
+    writer = XlsxStreamWriter()
+    writer.add_sheet("time_entries", COLUMNS, widths=_XLSX_WIDTHS)
+    for batch in iter_rows(stmt):
+        writer.write_rows([record[column] for column in COLUMNS] for record in batch)
+        chunk = writer.drain()
+        if chunk:
+            yield chunk
+    yield writer.close()
@@ -0,0 +1,217 @@
+"""
+Потоковая запись XLSX без сторонних библиотек.
+
+Книга XLSX — ZIP с XML-частями. Лист пишется строка за строкой в zipfile
+поверх ChunkSink; вызывающий код забирает байты через drain() после каждой
+пачки строк, как в stream_csv. Ни лист, ни книга целиком в памяти не
+собираются — ни в виде объектов ячеек, ни в виде XML.
+
+Строки пишутся inline (t="inlineStr"), без sharedStrings.xml: общая таблица
+строк потребовала бы держать все значения до конца записи. Типы ячеек:
+str, int, float, Decimal, bool, date, datetime, None (пустая ячейка).
+"""
+
+from __future__ import annotations
+
+import re
+import zipfile
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Iterable, Sequence
+from xml.sax.saxutils import escape, quoteattr
+
+from app.export.sink import ChunkSink
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+_EPOCH = datetime(1899, 12, 30)
+# Символы, недопустимые в XML 1.0
+_ILLEGAL_XML = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f￾￿]")
+_SHEET_NAME_FORBIDDEN = re.compile(r"[\[\]:*?/\\]")
+
+_NS = 'xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"'
+_NS_R = 'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"'
+
+# Индексы в cellXfs (см. _STYLES)
+_STYLE_DATE = 1
+_STYLE_DATETIME = 2
+
+_STYLES = f"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<styleSheet {_NS}>
+<numFmts count="1"><numFmt numFmtId="164" formatCode="yyyy\\-mm\\-dd\\ hh:mm:ss"/></numFmts>
+<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font><font><b/><sz val="11"/><name val="Calibri"/></font></fonts>
+<fills count="2"><fill><patternFill patternType="none"/></fill><fill><patternFill patternType="gray125"/></fill></fills>
+<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>
+<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>
+<cellXfs count="4">
+<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>
+<xf numFmtId="14" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>
+<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>
+<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/>
+</cellXfs>
+<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>
+</styleSheet>"""
+
+
+def _column_letter(index: int) -> str:
+    letters = ""
+    index += 1
+    while index:
+        index, rest = divmod(index - 1, 26)
+        letters = chr(65 + rest) + letters
+    return letters
+
+
+class XlsxStreamWriter:
+    """
+    Книга из одного или нескольких листов, записываемых по очереди:
+
+        writer = XlsxStreamWriter()
+        writer.add_sheet("Записи", ["Дата", "Часы"])
+        writer.write_rows(rows)
+        yield writer.drain()
+        ...
+        yield writer.close()
+    """
+
+    # Стиль для write_rows(style=...): жирный шрифт (итоговые строки)
+    STYLE_BOLD = 3
+
+    def __init__(self) -> None:
+        self._sink = ChunkSink()
+        self._zip = zipfile.ZipFile(self._sink, "w", compression=zipfile.ZIP_DEFLATED)
+        self._sheets: list[str] = []
+        self._sheet = None
+        self._row = 0
+        self._letters: list[str] = []
+
+    def add_sheet(
+        self,
+        name: str,
+        header: Sequence[str] | None = None,
+        widths: Sequence[float] | None = None,
+    ) -> None:
+        """Начать новый лист (предыдущий закрывается). Заголовок — жирным, закреплён."""
+        self._close_sheet()
+        name = _SHEET_NAME_FORBIDDEN.sub(" ", name)[:31]
+        self._sheets.append(name)
+        self._sheet = self._zip.open(f"xl/worksheets/sheet{len(self._sheets)}.xml", "w")
+        self._row = 0
+
+        parts = [f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<worksheet {_NS} {_NS_R}>']
+        if header:
+            parts.append(
+                '<sheetViews><sheetView workbookViewId="0">'
+                '<pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/>'
+                "</sheetView></sheetViews>"
+            )
+        if widths:
+            parts.append("<cols>")
+            parts.extend(
+                f'<col min="{i}" max="{i}" width="{width}" customWidth="1"/>'
+                for i, width in enumerate(widths, start=1)
+            )
+            parts.append("</cols>")
+        parts.append("<sheetData>")
+        self._sheet.write("".join(parts).encode("utf-8"))
+        if header:
+            self.write_rows([header], style=self.STYLE_BOLD)
+
+    def write_rows(self, rows: Iterable[Sequence[Any]], style: int | None = None) -> None:
+        """Дописать строки в текущий лист; style — индекс cellXfs для всех ячеек."""
+        if self._sheet is None:
+            raise RuntimeError("Сначала add_sheet()")
+        parts = []
+        for values in rows:
+            self._row += 1
+            while len(self._letters) < len(values):
+                self._letters.append(_column_letter(len(self._letters)))
+            parts.append(f'<row r="{self._row}">')
+            for letter, value in zip(self._letters, values):
+                parts.append(self._cell(f"{letter}{self._row}", value, style))
+            parts.append("</row>")
+        self._sheet.write("".join(parts).encode("utf-8"))
+
+    def drain(self) -> bytes:
+        """Байты книги, записанные с прошлого вызова."""
+        return self._sink.drain()
+
+    def close(self) -> bytes:
+        """Дописать служебные части книги; возвращает остаток байтов."""
+        self._close_sheet()
+        sheets = "".join(
+            f'<sheet name={quoteattr(name)} sheetId="{i}" r:id="rId{i}"/>'
+            for i, name in enumerate(self._sheets, start=1)
+        )
+        self._zip.writestr(
+            "xl/workbook.xml",
+            f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f"<workbook {_NS} {_NS_R}><sheets>{sheets}</sheets></workbook>",
+        )
+        relationships = "".join(
+            f'<Relationship Id="rId{i}" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+            f'Target="worksheets/sheet{i}.xml"/>'
+            for i in range(1, len(self._sheets) + 1)
+        )
+        self._zip.writestr(
+            "xl/_rels/workbook.xml.rels",
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            f"{relationships}"
+            f'<Relationship Id="rId{len(self._sheets) + 1}" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+            'Target="styles.xml"/></Relationships>',
+        )
+        self._zip.writestr("xl/styles.xml", _STYLES)
+        self._zip.writestr(
+            "_rels/.rels",
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+            'Target="xl/workbook.xml"/></Relationships>',
+        )
+        overrides = "".join(
+            f'<Override PartName="/xl/worksheets/sheet{i}.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+            for i in range(1, len(self._sheets) + 1)
+        )
+        self._zip.writestr(
+            "[Content_Types].xml",
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/styles.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+            f"{overrides}</Types>",
+        )
+        self._zip.close()
+        return self.drain()
+
+    def _close_sheet(self) -> None:
+        if self._sheet is not None:
+            self._sheet.write(b"</sheetData></worksheet>")
+            self._sheet.close()
+            self._sheet = None
+
+    @staticmethod
+    def _cell(ref: str, value: Any, style: int | None) -> str:
+        s = f' s="{style}"' if style is not None else ""
+        if value is None:
+            return f'<c r="{ref}"{s}/>' if s else ""
+        if isinstance(value, bool):
+            return f'<c r="{ref}"{s} t="b"><v>{int(value)}</v></c>'
+        if isinstance(value, (int, float, Decimal)):
+            return f'<c r="{ref}"{s}><v>{value}</v></c>'
+        if isinstance(value, datetime):
+            serial = (value - _EPOCH).total_seconds() / 86400
+            return f'<c r="{ref}" s="{style or _STYLE_DATETIME}"><v>{serial}</v></c>'
+        if isinstance(value, date):
+            serial = (value - _EPOCH.date()).days
+            return f'<c r="{ref}" s="{style or _STYLE_DATE}"><v>{serial}</v></c>'
+        text = escape(_ILLEGAL_XML.sub("", str(value)))
+        return f'<c r="{ref}"{s} t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
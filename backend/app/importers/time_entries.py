@@ -0,0 +1,175 @@
+"""Streaming bulk import of time entries from CSV / NDJSON."""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+from itertools import islice
+from typing import BinaryIO, Iterator
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.models.project import Project
+from app.models.time_entry import TimeEntry
+from app.schemas.common import ImportEncoding, ImportFormat
+from app.schemas.time_entry import ImportResponse, ImportRowError, TimeEntryCreate
+
+# Строк на одну валидацию/вставку (executemany) и на один SAVEPOINT
+IMPORT_BATCH_SIZE = 1000
+# Сколько ошибок по строкам возвращать в ответе
+MAX_REPORTED_ERRORS = 1000
+
+# utf-8-sig: файл может начинаться с BOM (в т.ч. наш собственный экспорт)
+_CODECS = {ImportEncoding.utf8: "utf-8-sig", ImportEncoding.cp1251: "cp1251"}
+
+
+class ImportEncodingError(ValueError):
+    """Файл не декодируется в заданной кодировке; импорт отменяется целиком."""
+
+
+def _iter_csv(stream: BinaryIO, encoding: str) -> Iterator[tuple[int, dict | str]]:
+    text = io.TextIOWrapper(stream, encoding=encoding, newline="")
+    reader = csv.DictReader(text)
+    for n, row in enumerate(reader, start=1):
+        # Пустые ячейки CSV — отсутствующие значения
+        yield n, {k: (v if v != "" else None) for k, v in row.items() if k is not None}
+
+
+def _iter_ndjson(stream: BinaryIO, encoding: str) -> Iterator[tuple[int, dict | str]]:
+    text = io.TextIOWrapper(stream, encoding=encoding)
+    for n, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield n, f"Некорректный JSON: {exc.msg}"
+            continue
+        if not isinstance(record, dict):
+            yield n, "Ожидается JSON-объект"
+            continue
+        yield n, record
+
+
+def _format_validation_error(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in exc.errors()
+    )
+
+
+class TimeEntryImporter:
+    """
+    Импорт потока строк пачками:
+      1. валидация каждой строки через TimeEntryCreate;
+      2. project_id → client_id из кэша, недостающие проекты — одним IN-запросом на пачку;
+      3. вставка пачки одним executemany внутри SAVEPOINT.
+
+    Всё выполняется в одной транзакции; commit делает вызывающий код.
+    При atomic=True любая ошибка отменяет весь импорт.
+    """
+
+    def __init__(self, db: Session, atomic: bool = False):
+        self.db = db
+        self.atomic = atomic
+        self._project_clients: dict[int, int | None] = {}
+        self.imported = 0
+        self.error_count = 0
+        self.errors: list[ImportRowError] = []
+
+    def _error(self, row: int, detail: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(ImportRowError(row=row, detail=detail))
+
+    def _resolve_projects(self, project_ids: set[int]) -> None:
+        unknown = project_ids - self._project_clients.keys()
+        if not unknown:
+            return
+        found = dict(
+            self.db.query(Project.id, Project.client_id)
+            .filter(Project.id.in_(unknown))
+            .all()
+        )
+        for pid in unknown:
+            self._project_clients[pid] = found.get(pid)
+
+    def _process_batch(self, batch: list[tuple[int, dict | str]]) -> None:
+        valid: list[tuple[int, TimeEntryCreate]] = []
+        for n, record in batch:
+            if isinstance(record, str):
+                self._error(n, record)
+                continue
+            try:
+                valid.append((n, TimeEntryCreate.model_validate(record)))
+            except ValidationError as exc:
+                self._error(n, _format_validation_error(exc))
+
+        self._resolve_projects({data.project_id for _, data in valid})
+
+        rows = []
+        for n, data in valid:
+            client_id = self._project_clients.get(data.project_id)
+            if client_id is None:
+                self._error(n, f"Проект с id={data.project_id} не найден")
+                continue
+            rows.append({**data.model_dump(), "client_id": client_id})
+
+        if not rows or (self.atomic and self.error_count):
+            return
+
+        try:
+            with self.db.begin_nested():
+                self.db.execute(insert(TimeEntry), rows)
+        except SQLAlchemyError as exc:
+            first, last = batch[0][0], batch[-1][0]
+            self._error(first, f"Строки {first}–{last} не вставлены: {exc.__class__.__name__}")
+            return
+        self.imported += len(rows)
+
+    def run(self, records: Iterator[tuple[int, dict | str]]) -> ImportResponse:
+        # В atomic-режиме после первой ошибки вставки прекращаются, но файл
+        # дочитывается до конца, чтобы вернуть все ошибки разом
+        while batch := list(islice(records, IMPORT_BATCH_SIZE)):
+            self._process_batch(batch)
+
+        if self.atomic and self.error_count:
+            self.db.rollback()
+            self.imported = 0
+
+        return ImportResponse(
+            imported_count=self.imported,
+            error_count=self.error_count,
+            errors=sorted(self.errors, key=lambda e: e.row),
+            errors_truncated=self.error_count > len(self.errors),
+        )
+
+
+def import_time_entries(
+    db: Session,
+    stream: BinaryIO,
+    import_format: ImportFormat,
+    atomic: bool = False,
+    encoding: ImportEncoding = ImportEncoding.utf8,
+) -> ImportResponse:
+    """
+    ImportEncodingError, если файл не в кодировке encoding: декодирование
+    идёт потоком, поэтому уже вставленные пачки откатываются.
+    """
+    codec = _CODECS[encoding]
+    records = (
+        _iter_ndjson(stream, codec) if import_format == ImportFormat.ndjson else _iter_csv(stream, codec)
+    )
+    try:
+        return TimeEntryImporter(db, atomic=atomic).run(records)
+    except UnicodeDecodeError as exc:
+        db.rollback()
+        hint = ""
+        if encoding == ImportEncoding.utf8:
+            hint = " Для CSV из Excel с русской локалью укажите encoding=cp1251."
+        raise ImportEncodingError(
+            f"Файл не в кодировке {encoding.value} (байт 0x{exc.object[exc.start]:02x}).{hint}"
+        ) from exc
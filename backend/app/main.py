@@ -1,28 +1,33 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
+from app.api.etag import ETagMiddleware
+from app.api.responses import FastJSONResponse
 from app.api.routes import router
-from app.db.database import engine, Base
-
-
-def _create_tables() -> None:
-    """Import all models so SQLAlchemy registers them, then create tables."""
-    import app.models.client  # noqa: F401
-    import app.models.lawyer_profile  # noqa: F401
-    import app.models.project  # noqa: F401
-    import app.models.time_entry  # noqa: F401
-    import app.models.invoice  # noqa: F401
-    import app.models.invoice_item  # noqa: F401
-    Base.metadata.create_all(bind=engine)
+from app.db.database import engine
+from app.db.migrations import check_schema, init_db
+from app.models.dashboard_counter import recompute_counters, verify_counters
+from app.pdf.loader import prewarm as prewarm_pdf
+from app.rates.providers import UnsupportedCurrencyError
+from app.rates.service import RateUnavailableError
+from app.tasks.overdue import run_overdue_sweeper
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    _create_tables()
+    check_schema(engine)
+    if settings.PDF_PREWARM:
+        prewarm_pdf()
+    sweeper = asyncio.create_task(run_overdue_sweeper()) if settings.OVERDUE_SWEEPER_ENABLED else None
     yield
+    if sweeper is not None:
+        sweeper.cancel()
+        with suppress(asyncio.CancelledError):
+            await sweeper
 
 
 app = FastAPI(
@@ -30,6 +35,24 @@ app = FastAPI(
     version=settings.VERSION,
     description="Billing Assistant — учёт рабочего времени и биллинг юриста",
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
+)
+
+# ETag / 304 для ресурсов, которые фронтенд перезапрашивает при каждой навигации.
+# Значение — таблицы, от версий которых зависит ответ (см. app.models.data_version).
+# Добавляется раньше CORS, чтобы CORS-заголовки попадали и в ответы 304.
+app.add_middleware(
+    ETagMiddleware,
+    resources={
+        "/api/v1/dashboard": (
+            "time_entries", "projects", "clients", "invoices", "invoice_items", "lawyer_profiles",
+        ),
+        "/api/v1/profile": ("lawyer_profiles",),
+        "/api/v1/clients": ("clients",),
+        "/api/v1/projects": ("projects", "time_entries"),
+        "/api/v1/timers": ("active_timers",),
+    },
+    exclude=("/api/v1/dashboard/stream",),
 )
 
 app.add_middleware(
@@ -43,6 +66,60 @@ app.add_middleware(
 app.include_router(router, prefix="/api/v1")
 
 
+@app.exception_handler(RateUnavailableError)
+def rate_unavailable_handler(request: Request, exc: RateUnavailableError) -> FastJSONResponse:
+    return FastJSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": f"Не удалось получить курс валюты: {exc}"},
+    )
+
+
+@app.exception_handler(UnsupportedCurrencyError)
+def unsupported_currency_handler(request: Request, exc: UnsupportedCurrencyError) -> FastJSONResponse:
+    # Например, валюта проекта, для которой у провайдера нет курса
+    return FastJSONResponse(
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        content={"detail": str(exc)},
+    )
+
+
 @app.get("/health")
 def health_check():
     return {"status": "ok", "service": settings.PROJECT_NAME}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m app.main")
+    parser.add_argument(
+        "--init-db",
+        action="store_true",
+        help="Создать/обновить схему БД до head (alembic upgrade head) и выйти",
+    )
+    parser.add_argument(
+        "--verify-counters",
+        action="store_true",
+        help="Сверить счётчики дашборда с данными; код выхода 1 при расхождении",
+    )
+    parser.add_argument(
+        "--recompute-counters",
+        action="store_true",
+        help="Пересчитать счётчики дашборда с нуля",
+    )
+    args = parser.parse_args()
+    if args.init_db:
+        init_db(engine)
+    elif args.verify_counters:
+        with engine.connect() as connection:
+            mismatches = verify_counters(connection)
+        for (metric, bucket, currency), actual, expected in mismatches:
+            print(f"{metric} [{bucket or '-'} {currency or '-'}]: {actual} ≠ {expected}")
+        print("Счётчики сходятся" if not mismatches else f"Расхождений: {len(mismatches)}")
+        raise SystemExit(1 if mismatches else 0)
+    elif args.recompute_counters:
+        with engine.begin() as connection:
+            rows = recompute_counters(connection)
+        print(f"Счётчики пересчитаны: {rows} строк")
+    else:
+        parser.print_help()
@@ -5,21 +5,30 @@
 # Order matters: referenced models must be imported before referencing ones.
 
 from app.models.enums import InvoiceStatus, ProjectStatus, TimeEntryStatus  # noqa: F401
+from app.models.data_version import DataVersion  # noqa: F401
+from app.models.exchange_rate import ExchangeRate  # noqa: F401
 from app.models.lawyer_profile import LawyerProfile  # noqa: F401
 from app.models.client import Client  # noqa: F401
 from app.models.project import Project  # noqa: F401
 from app.models.time_entry import TimeEntry  # noqa: F401
 from app.models.invoice import Invoice  # noqa: F401
 from app.models.invoice_item import InvoiceItem  # noqa: F401
+from app.models.active_timer import ActiveTimer  # noqa: F401
+from app.models.dashboard_counter import DashboardCounter  # noqa: F401  — вместе с триггерами
+import app.models.fts  # noqa: F401  — FTS5-таблицы создаются вместе с create_all
 
 __all__ = [
     "InvoiceStatus",
     "ProjectStatus",
     "TimeEntryStatus",
+    "DataVersion",
+    "ExchangeRate",
     "LawyerProfile",
     "Client",
     "Project",
     "TimeEntry",
     "Invoice",
     "InvoiceItem",
+    "ActiveTimer",
+    "DashboardCounter",
 ]
@@ -0,0 +1,44 @@
+import math
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import DateTime, ForeignKey, Index, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.database import Base
+
+# Как в таймере фронтенда: вверх до 15 минут, минимум 0.25 ч
+_QUARTER_HOUR_MINUTES = 15
+
+
+class ActiveTimer(Base):
+    """
+    Запущенный таймер. Хранится только момент старта (UTC) — без
+    периодических записей; прошедшее время считается при чтении.
+    На одном проекте может идти несколько таймеров одновременно.
+    """
+
+    __tablename__ = "active_timers"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+
+    project_id: Mapped[int] = mapped_column(
+        ForeignKey("projects.id", ondelete="CASCADE"), nullable=False
+    )
+    description: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    # UTC без часового пояса (как func.now() в SQLite)
+    started_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_active_timers_project_id", "project_id"),
+    )
+
+    def billable_hours(self, now: datetime) -> Decimal:
+        """Прошедшее время, округлённое вверх до 15 минут (не меньше 0.25 ч)."""
+        minutes = max((now - self.started_at).total_seconds(), 0) / 60
+        quarters = max(math.ceil(minutes / _QUARTER_HOUR_MINUTES), 1)
+        return Decimal(quarters * _QUARTER_HOUR_MINUTES) / 60
+
+    def __repr__(self) -> str:
+        return f"<ActiveTimer id={self.id} project_id={self.project_id} started_at={self.started_at}>"
@@ -0,0 +1,268 @@
+"""
+Счётчики дашборда, поддерживаемые инкрементально.
+
+Вместо агрегатов по всей истории дашборд читает несколько строк
+dashboard_counters. Строки обновляют триггеры SQLite на time_entries,
+invoices, invoice_items и projects — в той же транзакции, что и запись,
+при любом способе записи (роуты, batch, импорт, фоновая задача overdue).
+
+Метрики (metric, bucket, currency → value):
+
+* ``hours``           — часы всех записей за день (bucket = дата);
+* ``unbilled``        — Σ часы × ставка проекта по confirmed-записям
+                        проектов с индивидуальной ставкой (по валютам);
+* ``unbilled_hours``  — Σ часы confirmed-записей проектов без ставки:
+                        сумму даёт умножение на ставку профиля при чтении,
+                        поэтому смена ставки профиля счётчики не трогает;
+* ``unpaid``          — Σ строк sent/overdue-счетов (bucket = дата счёта,
+                        валюта — проекта записи, иначе RUB);
+* ``overdue``         — число счетов в статусе overdue.
+
+Удаления обрабатываются триггерами BEFORE DELETE: связанные строки
+(проект, счёт) ещё на месте при любом порядке каскадного удаления.
+
+Как и у FTS (app.models.fts), batch_alter_table пересоздаёт таблицу без
+триггеров — после таких миграций нужно вызвать create_counter_triggers().
+Расхождение (например, после ручных правок БД) находит и исправляет
+``python -m app.main --verify-counters`` / ``--recompute-counters``.
+"""
+
+from decimal import Decimal
+
+from sqlalchemy import Connection, Numeric, String, event, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.database import Base
+
+HOURS = "hours"
+UNBILLED = "unbilled"
+UNBILLED_HOURS = "unbilled_hours"
+UNPAID = "unpaid"
+OVERDUE = "overdue"
+
+# Суммы накапливаются сложением/вычитанием REAL — допуск сверки
+_TOLERANCE = Decimal("0.005")
+
+
+class DashboardCounter(Base):
+    __tablename__ = "dashboard_counters"
+
+    metric: Mapped[str] = mapped_column(String(32), primary_key=True)
+    # Дата (YYYY-MM-DD) для hours / unpaid, иначе ''
+    bucket: Mapped[str] = mapped_column(String(10), primary_key=True, default="")
+    currency: Mapped[str] = mapped_column(String(3), primary_key=True, default="")
+    value: Mapped[Decimal] = mapped_column(Numeric(18, 4), nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<DashboardCounter {self.metric}[{self.bucket}, {self.currency}]={self.value}>"
+
+
+# ── Вклады строк в счётчики (SELECT-часть INSERT ... ON CONFLICT) ─────────────
+# {r} — NEW или OLD, {s} — знак. WHERE обязателен: без него SQLite путает
+# ON CONFLICT с условием JOIN.
+
+_UNPAID_STATUSES = "('sent', 'overdue')"
+
+
+def _entry_contribution(r: str, s: str) -> list[str]:
+    return [
+        f"SELECT '{HOURS}', {r}.date, '', {s} * {r}.duration_hours WHERE true",
+        f"SELECT '{UNBILLED}', '', p.currency, {s} * {r}.duration_hours * p.hourly_rate "
+        f"FROM projects p WHERE p.id = {r}.project_id AND {r}.status = 'confirmed' "
+        f"AND p.hourly_rate IS NOT NULL",
+        f"SELECT '{UNBILLED_HOURS}', '', p.currency, {s} * {r}.duration_hours "
+        f"FROM projects p WHERE p.id = {r}.project_id AND {r}.status = 'confirmed' "
+        f"AND p.hourly_rate IS NULL",
+    ]
+
+
+def _item_contribution(r: str, s: str) -> list[str]:
+    return [
+        f"SELECT '{UNPAID}', inv.issue_date, COALESCE(p.currency, 'RUB'), {s} * {r}.amount "
+        f"FROM invoices inv "
+        f"LEFT JOIN time_entries te ON te.id = {r}.time_entry_id "
+        f"LEFT JOIN projects p ON p.id = te.project_id "
+        f"WHERE inv.id = {r}.invoice_id AND inv.status IN {_UNPAID_STATUSES}",
+    ]
+
+
+def _invoice_contribution(r: str, s: str) -> list[str]:
+    return [
+        f"SELECT '{UNPAID}', {r}.issue_date, COALESCE(p.currency, 'RUB'), {s} * SUM(i.amount) "
+        f"FROM invoice_items i "
+        f"LEFT JOIN time_entries te ON te.id = i.time_entry_id "
+        f"LEFT JOIN projects p ON p.id = te.project_id "
+        f"WHERE i.invoice_id = {r}.id AND {r}.status IN {_UNPAID_STATUSES} "
+        f"GROUP BY COALESCE(p.currency, 'RUB')",
+        f"SELECT '{OVERDUE}', '', '', {s} WHERE {r}.status = 'overdue'",
+    ]
+
+
+def _project_unbilled(r: str, s: str) -> list[str]:
+    return [
+        f"SELECT '{UNBILLED}', '', {r}.currency, {s} * SUM(te.duration_hours) * {r}.hourly_rate "
+        f"FROM time_entries te WHERE te.project_id = {r}.id AND te.status = 'confirmed' "
+        f"AND {r}.hourly_rate IS NOT NULL GROUP BY te.project_id",
+        f"SELECT '{UNBILLED_HOURS}', '', {r}.currency, {s} * SUM(te.duration_hours) "
+        f"FROM time_entries te WHERE te.project_id = {r}.id AND te.status = 'confirmed' "
+        f"AND {r}.hourly_rate IS NULL GROUP BY te.project_id",
+    ]
+
+
+def _linked_items_unpaid(scope: str, currency: str, s: str) -> str:
+    """Строки неоплаченных счетов по записям ``scope`` в валюте ``currency``."""
+    return (
+        f"SELECT '{UNPAID}', inv.issue_date, {currency}, {s} * SUM(i.amount) "
+        f"FROM invoice_items i "
+        f"JOIN time_entries te ON te.id = i.time_entry_id "
+        f"JOIN projects p ON p.id = te.project_id "
+        f"JOIN invoices inv ON inv.id = i.invoice_id "
+        f"WHERE {scope} AND inv.status IN {_UNPAID_STATUSES} "
+        f"GROUP BY inv.issue_date"
+    )
+
+
+def _upsert(select: str) -> str:
+    return (
+        f"INSERT INTO dashboard_counters (metric, bucket, currency, value) {select} "
+        f"ON CONFLICT (metric, bucket, currency) DO UPDATE SET value = value + excluded.value;"
+    )
+
+
+def _trigger(name: str, timing: str, table: str, selects: list[str]) -> str:
+    body = " ".join(_upsert(select) for select in selects)
+    return f"CREATE TRIGGER IF NOT EXISTS {name} {timing} ON {table} BEGIN {body} END"
+
+
+# Имя триггера → DDL
+TRIGGERS: dict[str, str] = {
+    "dashboard_counters_time_entries_ai": _trigger(
+        "dashboard_counters_time_entries_ai", "AFTER INSERT", "time_entries",
+        _entry_contribution("NEW", "1"),
+    ),
+    "dashboard_counters_time_entries_au": _trigger(
+        "dashboard_counters_time_entries_au",
+        "AFTER UPDATE OF date, duration_hours, status, project_id", "time_entries",
+        _entry_contribution("OLD", "-1") + _entry_contribution("NEW", "1"),
+    ),
+    # ON DELETE SET NULL у invoice_items: строки удалённой записи считаются в RUB
+    "dashboard_counters_time_entries_bd": _trigger(
+        "dashboard_counters_time_entries_bd", "BEFORE DELETE", "time_entries",
+        _entry_contribution("OLD", "-1")
+        + [
+            _linked_items_unpaid("te.id = OLD.id", "p.currency", "-1"),
+            _linked_items_unpaid("te.id = OLD.id", "'RUB'", "1"),
+        ],
+    ),
+    "dashboard_counters_invoice_items_ai": _trigger(
+        "dashboard_counters_invoice_items_ai", "AFTER INSERT", "invoice_items",
+        _item_contribution("NEW", "1"),
+    ),
+    "dashboard_counters_invoice_items_au": _trigger(
+        "dashboard_counters_invoice_items_au",
+        "AFTER UPDATE OF amount, invoice_id, time_entry_id", "invoice_items",
+        _item_contribution("OLD", "-1") + _item_contribution("NEW", "1"),
+    ),
+    "dashboard_counters_invoice_items_bd": _trigger(
+        "dashboard_counters_invoice_items_bd", "BEFORE DELETE", "invoice_items",
+        _item_contribution("OLD", "-1"),
+    ),
+    "dashboard_counters_invoices_ai": _trigger(
+        "dashboard_counters_invoices_ai", "AFTER INSERT", "invoices",
+        _invoice_contribution("NEW", "1"),
+    ),
+    "dashboard_counters_invoices_au": _trigger(
+        "dashboard_counters_invoices_au", "AFTER UPDATE OF status, issue_date", "invoices",
+        _invoice_contribution("OLD", "-1") + _invoice_contribution("NEW", "1"),
+    ),
+    "dashboard_counters_invoices_bd": _trigger(
+        "dashboard_counters_invoices_bd", "BEFORE DELETE", "invoices",
+        _invoice_contribution("OLD", "-1"),
+    ),
+    "dashboard_counters_projects_au": _trigger(
+        "dashboard_counters_projects_au", "AFTER UPDATE OF hourly_rate, currency", "projects",
+        _project_unbilled("OLD", "-1")
+        + _project_unbilled("NEW", "1")
+        + [
+            _linked_items_unpaid("te.project_id = OLD.id", "OLD.currency", "-1"),
+            _linked_items_unpaid("te.project_id = NEW.id", "NEW.currency", "1"),
+        ],
+    ),
+    "dashboard_counters_projects_bd": _trigger(
+        "dashboard_counters_projects_bd", "BEFORE DELETE", "projects",
+        _project_unbilled("OLD", "-1")
+        + [
+            _linked_items_unpaid("te.project_id = OLD.id", "OLD.currency", "-1"),
+            _linked_items_unpaid("te.project_id = OLD.id", "'RUB'", "1"),
+        ],
+    ),
+}
+
+
+# ── Полный пересчёт ───────────────────────────────────────────────────────────
+
+_EXPECTED = f"""
+SELECT '{HOURS}' AS metric, date AS bucket, '' AS currency, SUM(duration_hours) AS value
+FROM time_entries GROUP BY date
+UNION ALL
+SELECT '{UNBILLED}', '', p.currency, SUM(te.duration_hours * p.hourly_rate)
+FROM time_entries te JOIN projects p ON p.id = te.project_id
+WHERE te.status = 'confirmed' AND p.hourly_rate IS NOT NULL GROUP BY p.currency
+UNION ALL
+SELECT '{UNBILLED_HOURS}', '', p.currency, SUM(te.duration_hours)
+FROM time_entries te JOIN projects p ON p.id = te.project_id
+WHERE te.status = 'confirmed' AND p.hourly_rate IS NULL GROUP BY p.currency
+UNION ALL
+SELECT '{UNPAID}', inv.issue_date, COALESCE(p.currency, 'RUB'), SUM(i.amount)
+FROM invoices inv
+JOIN invoice_items i ON i.invoice_id = inv.id
+LEFT JOIN time_entries te ON te.id = i.time_entry_id
+LEFT JOIN projects p ON p.id = te.project_id
+WHERE inv.status IN {_UNPAID_STATUSES}
+GROUP BY inv.issue_date, COALESCE(p.currency, 'RUB')
+UNION ALL
+SELECT '{OVERDUE}', '', '', COUNT(*) FROM invoices WHERE status = 'overdue'
+"""
+
+
+def _as_dict(rows) -> dict[tuple[str, str, str], Decimal]:
+    return {(m, b, c): Decimal(str(v or 0)) for m, b, c, v in rows}
+
+
+def recompute_counters(connection: Connection) -> int:
+    """Пересчитать все счётчики с нуля; вернуть число строк."""
+    connection.execute(text("DELETE FROM dashboard_counters"))
+    result = connection.execute(
+        text(f"INSERT INTO dashboard_counters (metric, bucket, currency, value) {_EXPECTED}")
+    )
+    return result.rowcount
+
+
+def verify_counters(connection: Connection) -> list[tuple[tuple[str, str, str], Decimal, Decimal]]:
+    """Расхождения [(ключ, в счётчиках, по данным)]; пустой список — всё сходится."""
+    actual = _as_dict(
+        connection.execute(text("SELECT metric, bucket, currency, value FROM dashboard_counters"))
+    )
+    expected = _as_dict(connection.execute(text(_EXPECTED)))
+    mismatches = []
+    for key in sorted(actual.keys() | expected.keys()):
+        have, want = actual.get(key, Decimal(0)), expected.get(key, Decimal(0))
+        if abs(have - want) > _TOLERANCE:
+            mismatches.append((key, have, want))
+    return mismatches
+
+
+def create_counter_triggers(connection: Connection) -> None:
+    for ddl in TRIGGERS.values():
+        connection.execute(text(ddl))
+
+
+def drop_counter_triggers(connection: Connection) -> None:
+    for name in TRIGGERS:
+        connection.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_triggers_after_create_all(target, connection: Connection, **kw) -> None:
+    if connection.dialect.name == "sqlite":
+        create_counter_triggers(connection)
@@ -0,0 +1,121 @@
+from typing import Callable
+
+from sqlalchemy import Connection, Integer, String, event, select
+from sqlalchemy.orm import Mapped, Session, mapped_column
+
+from app.db.database import Base, upsert
+
+_PENDING_KEY = "data_versions_pending"
+_CHANGED_KEY = "data_versions_changed"
+
+_commit_callbacks: list[Callable[[frozenset[str]], None]] = []
+
+
+class DataVersion(Base):
+    """
+    Счётчик изменений таблицы: увеличивается в той же транзакции, что и
+    запись в таблицу. Используется для ETag — пока версии таблиц, от
+    которых зависит ответ, не изменились, ответ тоже не изменился.
+    """
+
+    __tablename__ = "data_versions"
+
+    table_name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<DataVersion {self.table_name}={self.version}>"
+
+
+def read_versions(db: Session | Connection, tables: tuple[str, ...]) -> tuple[int, ...]:
+    """Текущие версии таблиц (0 — в таблицу ещё не писали) одним SELECT по PK."""
+    versions = dict(
+        db.execute(
+            select(DataVersion.table_name, DataVersion.version)
+            .where(DataVersion.table_name.in_(tables))
+        ).all()
+    )
+    return tuple(versions.get(name, 0) for name in tables)
+
+
+def read_all_versions(db: Session | Connection) -> dict[str, int]:
+    """Версии всех таблиц, в которые уже писали."""
+    return dict(db.execute(select(DataVersion.table_name, DataVersion.version)).all())
+
+
+def on_commit(callback: Callable[[frozenset[str]], None]) -> Callable[[frozenset[str]], None]:
+    """
+    Вызывать ``callback(tables)`` после каждого COMMIT сессии, изменившей таблицы.
+    Вызывается в потоке, выполнившем commit; исключения не должны вылетать наружу.
+    """
+    _commit_callbacks.append(callback)
+    return callback
+
+
+def mark_changed(connection: Connection, *tables: str) -> None:
+    """Отметить таблицы изменёнными; версии увеличатся в конце flush."""
+    connection.info.setdefault(_PENDING_KEY, set()).update(tables)
+
+
+def bump_versions(connection: Connection, tables: set[str]) -> None:
+    """+1 к версии каждой таблицы (строка создаётся при первой записи)."""
+    if not tables:
+        return
+    stmt = upsert(connection, DataVersion.__table__)
+    connection.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[DataVersion.__table__.c.table_name],
+            set_={"version": DataVersion.__table__.c.version + 1},
+        ),
+        [{"table_name": name, "version": 1} for name in sorted(tables)],
+    )
+
+
+# ── Учёт изменений ────────────────────────────────────────────────────────────
+# Маперные события срабатывают на каждую реально записанную строку, включая
+# каскадные удаления, поэтому здесь только копим имена таблиц в connection.info,
+# а версии увеличиваем одним запросом после flush.
+
+
+def _mark_row_changed(mapper, connection, target) -> None:
+    if mapper.local_table is not DataVersion.__table__:
+        mark_changed(connection, mapper.local_table.name)
+
+
+for _event_name in ("after_insert", "after_update", "after_delete"):
+    event.listen(Base, _event_name, _mark_row_changed, propagate=True)
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_after_flush(session: Session, flush_context) -> None:
+    connection = session.connection()
+    tables = connection.info.pop(_PENDING_KEY, set())
+    bump_versions(connection, tables)
+    session.info.setdefault(_CHANGED_KEY, set()).update(tables)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _bump_after_bulk_statement(orm_execute_state) -> None:
+    """Массовые insert()/update()/delete() через Session.execute минуют flush."""
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    table = orm_execute_state.statement.table
+    if table is DataVersion.__table__:
+        return
+    result = orm_execute_state.invoke_statement()
+    bump_versions(orm_execute_state.session.connection(), {table.name})
+    orm_execute_state.session.info.setdefault(_CHANGED_KEY, set()).add(table.name)
+    return result
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_after_commit(session: Session) -> None:
+    tables = session.info.pop(_CHANGED_KEY, None)
+    if tables:
+        for callback in _commit_callbacks:
+            callback(frozenset(tables))
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_after_rollback(session: Session) -> None:
+    session.info.pop(_CHANGED_KEY, None)
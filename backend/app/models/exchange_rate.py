@@ -0,0 +1,20 @@
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import Date, Numeric, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.database import Base
+
+
+class ExchangeRate(Base):
+    """Официальный курс валюты на дату: сколько рублей за 1 единицу."""
+
+    __tablename__ = "exchange_rates"
+
+    currency: Mapped[str] = mapped_column(String(3), primary_key=True)
+    date: Mapped[date] = mapped_column(Date, primary_key=True)
+    rate: Mapped[Decimal] = mapped_column(Numeric(18, 6), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<ExchangeRate {self.currency} {self.date}={self.rate}>"
@@ -0,0 +1,116 @@
+"""
+Полнотекстовый поиск SQLite FTS5.
+
+Индексы — external content таблицы FTS5 поверх clients, projects и
+time_entries: текст хранится только в исходных таблицах, FTS хранит индекс.
+Синхронизацию делают триггеры, поэтому индекс актуален при любом способе
+записи (ORM, массовый insert(), сырые UPDATE).
+
+В metadata эти таблицы не входят: их создаёт миграция, а при create_all —
+обработчик after_create ниже. Alembic их игнорирует (см. is_fts_table).
+
+Внимание: batch_alter_table пересоздаёт таблицу и удаляет её триггеры —
+после batch-миграций clients / projects / time_entries нужно вызвать
+create_fts() заново.
+"""
+
+import re
+
+from sqlalchemy import ColumnElement, Connection, column, event, literal_column, table, text
+from sqlalchemy.sql.expression import TableClause
+
+from app.db.database import Base
+
+# unicode61 приводит к нижнему регистру и кириллицу; prefix-индексы ускоряют
+# запросы вида «догов*» на 2–4 первых символа
+_TOKENIZE = "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3 4'"
+
+# FTS-таблица → (исходная таблица, индексируемые колонки)
+FTS_TABLES: dict[str, tuple[str, tuple[str, ...]]] = {
+    "clients_fts": ("clients", ("name", "contact_person", "inn")),
+    "projects_fts": ("projects", ("name", "description")),
+    "time_entries_fts": ("time_entries", ("description",)),
+}
+
+# Лёгкие описания для SELECT ... MATCH (без регистрации в metadata)
+clients_fts = table("clients_fts", column("rowid"), *map(column, FTS_TABLES["clients_fts"][1]))
+projects_fts = table("projects_fts", column("rowid"), *map(column, FTS_TABLES["projects_fts"][1]))
+time_entries_fts = table(
+    "time_entries_fts", column("rowid"), *map(column, FTS_TABLES["time_entries_fts"][1])
+)
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def match_expression(query: str) -> str | None:
+    """
+    Пользовательский ввод → выражение FTS5 MATCH.
+
+    Каждое слово ищется как префикс («догов» найдёт «договор», «договора»),
+    слова объединяются по И. Слова берутся в кавычки, поэтому операторы
+    FTS5 (OR, NEAR, *, ") во вводе не интерпретируются.
+    None — во вводе нет ни одного слова.
+    """
+    tokens = _TOKEN_RE.findall(query)
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def matches(fts: TableClause, expression: str) -> ColumnElement[bool]:
+    """``<fts> MATCH :expression`` для WHERE."""
+    return literal_column(fts.name).op("MATCH")(expression)
+
+
+def is_fts_table(name: str) -> bool:
+    """FTS-таблица или её служебная (_data, _idx, _docsize, _config)."""
+    return any(name == fts or name.startswith(fts + "_") for fts in FTS_TABLES)
+
+
+def _ddl(fts: str, source: str, columns: tuple[str, ...]) -> list[str]:
+    cols = ", ".join(columns)
+    new_values = ", ".join(f"new.{c}" for c in columns)
+    old_values = ", ".join(f"old.{c}" for c in columns)
+    delete_old = (
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES('delete', old.id, {old_values});"
+    )
+    insert_new = f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_values});"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{cols}, content = '{source}', content_rowid = 'id', {_TOKENIZE})",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {source} BEGIN {insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {source} BEGIN {delete_old} END",
+        # Только при изменении индексируемых колонок: смена статуса записи
+        # времени не трогает индекс
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {source} "
+        f"BEGIN {delete_old} {insert_new} END",
+    ]
+
+
+def create_fts(connection: Connection) -> None:
+    """
+    Создать недостающие FTS-таблицы и триггеры (идемпотентно).
+    Только что созданная таблица сразу индексирует существующие строки.
+    """
+    for fts, (source, columns) in FTS_TABLES.items():
+        exists = connection.scalar(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": fts},
+        )
+        for statement in _ddl(fts, source, columns):
+            connection.execute(text(statement))
+        if not exists:
+            connection.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+
+
+def drop_fts(connection: Connection) -> None:
+    for fts in FTS_TABLES:
+        for suffix in ("ai", "ad", "au"):
+            connection.execute(text(f"DROP TRIGGER IF EXISTS {fts}_{suffix}"))
+        connection.execute(text(f"DROP TABLE IF EXISTS {fts}"))
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_fts_after_create_all(target, connection: Connection, **kw) -> None:
+    if connection.dialect.name == "sqlite":
+        create_fts(connection)
@@ -37,7 +37,6 @@ class Invoice(Base):
         nullable=False,
         default=InvoiceStatus.draft,
         server_default=InvoiceStatus.draft.value,
-        index=True,
     )
 
     notes: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -49,14 +48,20 @@ class Invoice(Base):
     # Relationships
     client: Mapped["Client"] = relationship("Client", back_populates="invoices")
     items: Mapped[list["InvoiceItem"]] = relationship(
-        "InvoiceItem", back_populates="invoice", cascade="all, delete-orphan"
+        "InvoiceItem",
+        back_populates="invoice",
+        cascade="all, delete-orphan",
+        order_by="InvoiceItem.id",
     )
 
     __table_args__ = (
-        Index("ix_invoices_client_id", "client_id"),
-        Index("ix_invoices_status", "status"),
         Index("ix_invoices_issue_date", "issue_date"),
-        Index("ix_invoices_due_date", "due_date"),
+        # Список счетов клиента: client_id + status, сортировка по issue_date
+        Index("ix_invoices_client_status_issue_date", "client_id", "status", "issue_date"),
+        # Список счетов по статусу без клиента, сортировка по issue_date
+        Index("ix_invoices_status_issue_date", "status", "issue_date"),
+        # Фоновый перевод в overdue (status = sent AND due_date < today) и подсчёт по статусу
+        Index("ix_invoices_status_due_date", "status", "due_date"),
     )
 
     def __repr__(self) -> str:
@@ -1,3 +1,4 @@
+from datetime import date as date_type
 from decimal import Decimal
 from typing import TYPE_CHECKING
 
@@ -27,7 +28,7 @@ class InvoiceItem(Base):
     )
 
     # Количество часов (копируется из TimeEntry или задаётся вручную)
-    hours: Mapped[Decimal] = mapped_column(Numeric(5, 1), nullable=False)
+    hours: Mapped[Decimal] = mapped_column(Numeric(5, 2), nullable=False)
     # Ставка руб/час на момент выставления счёта (фиксируется)
     rate: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
     # Сумма = hours * rate; хранится явно для защиты от изменения ставки
@@ -40,10 +41,27 @@ class InvoiceItem(Base):
     )
 
     __table_args__ = (
-        Index("ix_invoice_items_invoice_id", "invoice_id"),
+        # Покрывающий: суммы счетов (SUM(amount) GROUP BY invoice_id) без чтения таблицы
+        Index("ix_invoice_items_invoice_amount", "invoice_id", "amount"),
         Index("ix_invoice_items_time_entry_id", "time_entry_id"),
     )
 
+    # ── Данные связанной записи времени (для InvoiceItemRead) ─────────────────
+    # Для ручных строк без TimeEntry — None.
+
+    @property
+    def date(self) -> date_type | None:
+        return self.time_entry.date if self.time_entry is not None else None
+
+    @property
+    def description(self) -> str | None:
+        return self.time_entry.description if self.time_entry is not None else None
+
+    @property
+    def project_name(self) -> str | None:
+        te = self.time_entry
+        return te.project.name if te is not None and te.project is not None else None
+
     def __repr__(self) -> str:
         return (
             f"<InvoiceItem id={self.id} invoice_id={self.invoice_id} "
@@ -39,7 +39,6 @@ class Project(Base):
         nullable=False,
         default=ProjectStatus.active,
         server_default=ProjectStatus.active.value,
-        index=True,
     )
 
     created_at: Mapped[datetime] = mapped_column(
@@ -2,15 +2,18 @@ from datetime import date, datetime
 from decimal import Decimal
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Date, DateTime, Enum, ForeignKey, Index, Numeric, Text, func
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import Date, DateTime, Enum, ForeignKey, Index, Numeric, Text, func, select
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Mapped, mapped_column, object_session, relationship
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.db.database import Base
+from app.models.data_version import mark_changed
 from app.models.enums import TimeEntryStatus
+from app.models.project import Project
 
 if TYPE_CHECKING:
     from app.models.invoice_item import InvoiceItem
-    from app.models.project import Project
 
 
 class TimeEntry(Base):
@@ -23,13 +26,19 @@ class TimeEntry(Base):
     project_id: Mapped[int] = mapped_column(
         ForeignKey("projects.id", ondelete="CASCADE"), nullable=False
     )
+    # Денормализованный Project.client_id: фильтр по клиенту без JOIN projects.
+    # Заполняется автоматически (before_insert) и синхронизируется при смене клиента проекта.
+    client_id: Mapped[int] = mapped_column(
+        ForeignKey("clients.id", ondelete="CASCADE"), nullable=False
+    )
 
     # Дата выполнения работы
     date: Mapped[date] = mapped_column(Date, nullable=False)
 
-    # Длительность с точностью до 0.1 ч (NUMERIC(5,1) — до 9999.9 часов)
+    # Длительность с точностью до 0.01 ч (NUMERIC(5,2) — до 999.99 часов);
+    # таймер пишет ровно четверти часа
     duration_hours: Mapped[Decimal] = mapped_column(
-        Numeric(5, 1), nullable=False
+        Numeric(5, 2), nullable=False
     )
 
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -39,7 +48,6 @@ class TimeEntry(Base):
         nullable=False,
         default=TimeEntryStatus.draft,
         server_default=TimeEntryStatus.draft.value,
-        index=True,
     )
 
     created_at: Mapped[datetime] = mapped_column(
@@ -60,11 +68,23 @@ class TimeEntry(Base):
     )
 
     __table_args__ = (
-        Index("ix_time_entries_project_id", "project_id"),
         Index("ix_time_entries_date", "date"),
-        Index("ix_time_entries_status", "status"),
-        # Составной индекс для типичного запроса «все записи проекта за период»
+        # Составной индекс для типичного запроса «все записи проекта за период»;
+        # его префикс заменяет отдельный индекс по project_id
         Index("ix_time_entries_project_date", "project_id", "date"),
+        # Записи клиента за период (список, отчёты) — один range scan
+        Index("ix_time_entries_client_date", "client_id", "date"),
+        # Статус + период (дашборд, отчёты, фильтры списка). project_id и
+        # duration_hours включены, чтобы суммы по статусу читались из индекса
+        Index(
+            "ix_time_entries_status_date",
+            "status", "date", "project_id", "duration_hours",
+        ),
+        # Статистика проекта (_compute_stats): project_id + status, покрывающий
+        Index(
+            "ix_time_entries_project_status",
+            "project_id", "status", "duration_hours",
+        ),
     )
 
     def __repr__(self) -> str:
@@ -72,3 +92,51 @@ class TimeEntry(Base):
             f"<TimeEntry id={self.id} project_id={self.project_id} "
             f"date={self.date} hours={self.duration_hours}>"
         )
+
+
+def _project_client_id(connection, project_id: int) -> int | None:
+    return connection.scalar(
+        select(Project.client_id).where(Project.id == project_id)
+    )
+
+
+@event.listens_for(TimeEntry, "before_insert")
+def _fill_client_id(mapper, connection, target: TimeEntry) -> None:
+    """Если client_id не передан явно — берём его из проекта."""
+    if target.client_id is None:
+        target.client_id = _project_client_id(connection, target.project_id)
+
+
+@event.listens_for(TimeEntry, "before_update")
+def _sync_client_id_on_project_change(mapper, connection, target: TimeEntry) -> None:
+    """Запись перенесли в другой проект — обновляем client_id."""
+    if inspect(target).attrs.project_id.history.has_changes():
+        target.client_id = _project_client_id(connection, target.project_id)
+
+
+@event.listens_for(Project, "after_update")
+def _propagate_project_client_id(mapper, connection, target: Project) -> None:
+    """
+    Проект переназначен другому клиенту — переносим client_id во все его
+    записи времени одним UPDATE в той же транзакции.
+
+    UPDATE идёт мимо ORM: версию time_entries в data_versions отмечаем сами,
+    а уже загруженным в сессию записям проставляем новое значение как
+    сохранённое — иначе до expire они показывали бы прежнего клиента.
+    """
+    if not inspect(target).attrs.client_id.history.has_changes():
+        return
+    connection.execute(
+        TimeEntry.__table__.update()
+        .where(TimeEntry.__table__.c.project_id == target.id)
+        .values(client_id=target.client_id)
+    )
+    mark_changed(connection, TimeEntry.__tablename__)
+
+    session = object_session(target)
+    if session is None:
+        return
+    for obj in session.identity_map.values():
+        # Только загруженное состояние: expired-запись и так перечитается из БД
+        if isinstance(obj, TimeEntry) and inspect(obj).dict.get("project_id") == target.id:
+            set_committed_value(obj, "client_id", target.client_id)
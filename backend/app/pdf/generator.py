@@ -2,14 +2,16 @@
 
 from __future__ import annotations
 
+import hashlib
 import locale
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from datetime import date
 from decimal import Decimal
 from pathlib import Path
 
 from jinja2 import Environment, BaseLoader
-from weasyprint import HTML, CSS
+
+from app.pdf.loader import html_class
 
 # ── Font paths (DejaVu Sans — full Cyrillic support, ships with Ubuntu/Debian)
 _FONT_DIR = Path("/usr/share/fonts/truetype/dejavu")
@@ -488,7 +490,7 @@ body {
         <div class="desc-main">Юридические услуги</div>
         {% endif %}
       </td>
-      <td class="hours">{{ item.hours | fmt_num(1) }}</td>
+      <td class="hours">{{ item.hours | fmt_num(2) }}</td>
       <td class="rate">{{ item.rate | fmt_money }}</td>
       <td class="sum">{{ item.amount | fmt_money }}</td>
     </tr>
@@ -501,7 +503,7 @@ body {
   <table class="totals-table">
     <tr>
       <td class="t-label">Итого часов:</td>
-      <td class="t-value">{{ total_hours | fmt_num(1) }} ч</td>
+      <td class="t-value">{{ total_hours | fmt_num(2) }} ч</td>
     </tr>
     <tr class="total-final">
       <td class="t-label">ИТОГО К ОПЛАТЕ:</td>
@@ -564,6 +566,22 @@ def _fmt_num(value: Decimal | float | str, decimals: int = 1) -> str:
 
 # ── Public API ────────────────────────────────────────────────────────────────
 
+def invoice_pdf_key(
+    invoice: InvoiceData,
+    profile: ProfileData,
+    client: ClientData,
+) -> str:
+    """
+    Отпечаток входных данных PDF счёта (вместе с шаблоном) — ключ дискового кэша.
+
+    Статус в шаблоне не выводится, поэтому не входит в ключ: переходы
+    sent → overdue → paid не сбрасывают готовый файл.
+    """
+    digest = hashlib.sha256(_TEMPLATE.encode("utf-8"))
+    digest.update(repr((replace(invoice, status=""), profile, client)).encode("utf-8"))
+    return digest.hexdigest()[:32]
+
+
 def render_invoice_pdf(
     invoice: InvoiceData,
     profile: ProfileData,
@@ -587,5 +605,5 @@ def render_invoice_pdf(
         logo_path=profile.logo_path,
     )
 
-    pdf_bytes: bytes = HTML(string=html_str).write_pdf()
+    pdf_bytes: bytes = html_class()(string=html_str).write_pdf()
     return pdf_bytes
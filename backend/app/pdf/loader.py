@@ -0,0 +1,36 @@
+"""
+Ленивая загрузка WeasyPrint.
+
+Импорт weasyprint тянет Pango/cairo через cffi: это заметное время старта
+и десятки мегабайт памяти в каждом воркере. Генераторы PDF получают класс
+HTML через html_class() — библиотека загружается при первом рендере, а не
+при импорте роутов. prewarm() заранее загружает её и шрифты (PDF_PREWARM).
+"""
+
+from __future__ import annotations
+
+from functools import cache
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from weasyprint import HTML
+
+_FONT_REGULAR = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
+
+_WARMUP_HTML = f"""<!DOCTYPE html>
+<html><head><style>
+@font-face {{ font-family: 'DejaVu Sans'; src: url('file://{_FONT_REGULAR}'); }}
+body {{ font-family: 'DejaVu Sans', sans-serif; }}
+</style></head><body>Счёт № 0</body></html>"""
+
+
+@cache
+def html_class() -> type[HTML]:
+    from weasyprint import HTML
+
+    return HTML
+
+
+def prewarm() -> None:
+    """Импортировать WeasyPrint и отрендерить пустую страницу (загрузка шрифтов)."""
+    html_class()(string=_WARMUP_HTML).write_pdf()
@@ -8,7 +8,8 @@ from decimal import Decimal
 from pathlib import Path
 
 from jinja2 import BaseLoader, Environment
-from weasyprint import HTML
+
+from app.pdf.loader import html_class
 
 _FONT_DIR = Path("/usr/share/fonts/truetype/dejavu")
 _FONT_REGULAR = _FONT_DIR / "DejaVuSans.ttf"
@@ -53,6 +54,59 @@ class ReportData:
     total_amount: float
     breakdown: list[ReportClientRow] = field(default_factory=list)
     invoice_summary: InvoiceSummaryData | None = None
+    currency_symbol: str = "₽"
+
+
+@dataclass
+class AgingRow:
+    client_name: str
+    invoices_count: int
+    current: float
+    days_0_30: float
+    days_31_60: float
+    days_61_90: float
+    days_90_plus: float
+    total: float
+
+
+@dataclass
+class AgingReportData:
+    as_of: date
+    client_name: str | None  # None = all clients
+    totals: AgingRow
+    rows: list[AgingRow] = field(default_factory=list)
+    currency_symbol: str = "₽"
+
+
+@dataclass
+class ComparisonPeriod:
+    date_from: date
+    date_to: date
+    hours: float
+    amount: float
+
+
+@dataclass
+class ComparisonProjectRow:
+    project_name: str
+    hours: list[float]  # по периодам
+    amount: list[float]
+
+
+@dataclass
+class ComparisonClientRow:
+    client_name: str
+    hours: list[float]
+    amount: list[float]
+    projects: list[ComparisonProjectRow] = field(default_factory=list)
+
+
+@dataclass
+class ComparisonData:
+    client_name: str | None  # None = all clients
+    periods: list[ComparisonPeriod]
+    breakdown: list[ComparisonClientRow] = field(default_factory=list)
+    currency_symbol: str = "₽"
 
 
 # ── Jinja2 filters ─────────────────────────────────────────────────────────────
@@ -73,9 +127,10 @@ def _fmt_num(value: float | Decimal | str, decimals: int = 1) -> str:
     return f"{float(value):.{decimals}f}"
 
 
-# ── HTML Template ──────────────────────────────────────────────────────────────
+# ── HTML Templates ─────────────────────────────────────────────────────────────
 
-_TEMPLATE = """<!DOCTYPE html>
+# Общий <head> со стилями для всех отчётов
+_HEAD = """<!DOCTYPE html>
 <html lang="ru">
 <head>
 <meta charset="utf-8">
@@ -326,7 +381,9 @@ body {
 }
 </style>
 </head>
-<body>
+"""
+
+_TEMPLATE = _HEAD + """<body>
 
 <!-- ── Header ─────────────────────────────────────────────────────────────── -->
 <div class="report-header">
@@ -352,7 +409,7 @@ body {
   </div>
   <div class="summary-card">
     <div class="summary-card-label">Сумма к биллингу</div>
-    <div class="summary-card-value accent">{{ report.total_amount | fmt_money }} ₽</div>
+    <div class="summary-card-value accent">{{ report.total_amount | fmt_money }} {{ report.currency_symbol }}</div>
   </div>
   {% if report.invoice_summary %}
   <div class="summary-card">
@@ -361,7 +418,7 @@ body {
   </div>
   <div class="summary-card">
     <div class="summary-card-label">Оплачено</div>
-    <div class="summary-card-value">{{ report.invoice_summary.total_paid | fmt_money }} ₽</div>
+    <div class="summary-card-value">{{ report.invoice_summary.total_paid | fmt_money }} {{ report.currency_symbol }}</div>
   </div>
   {% endif %}
 </div>
@@ -376,7 +433,7 @@ body {
       <th class="num">№</th>
       <th>Клиент / Проект</th>
       <th class="hours r">Часы</th>
-      <th class="amount r">Сумма, ₽</th>
+      <th class="amount r">Сумма, {{ report.currency_symbol }}</th>
     </tr>
   </thead>
   <tbody>
@@ -406,7 +463,7 @@ body {
       <td></td>
       <td>ИТОГО</td>
       <td class="td-r">{{ report.total_hours | fmt_num(1) }} ч</td>
-      <td class="td-r">{{ report.total_amount | fmt_money }} ₽</td>
+      <td class="td-r">{{ report.total_amount | fmt_money }} {{ report.currency_symbol }}</td>
     </tr>
   </tfoot>
 </table>
@@ -421,7 +478,7 @@ body {
     <tr>
       <th>Статус</th>
       <th class="r">Количество</th>
-      <th class="r">Сумма, ₽</th>
+      <th class="r">Сумма, {{ report.currency_symbol }}</th>
     </tr>
   </thead>
   <tbody>
@@ -463,21 +520,189 @@ body {
 """
 
 
+_AGING_TEMPLATE = _HEAD + """<body>
+
+<div class="report-header">
+  <div>
+    <div class="report-title">Дебиторская задолженность по срокам</div>
+    {% if report.client_name %}
+    <div class="report-subtitle">Клиент: {{ report.client_name }}</div>
+    {% else %}
+    <div class="report-subtitle">Все клиенты · отправленные и просроченные счета</div>
+    {% endif %}
+  </div>
+  <div class="report-period">
+    <strong>{{ report.as_of | fmt_date }}</strong>
+    Дней просрочки на дату
+  </div>
+</div>
+
+<div class="summary-row">
+  <div class="summary-card">
+    <div class="summary-card-label">Не оплачено</div>
+    <div class="summary-card-value accent">{{ report.totals.total | fmt_money }} {{ report.currency_symbol }}</div>
+  </div>
+  <div class="summary-card">
+    <div class="summary-card-label">Счетов</div>
+    <div class="summary-card-value">{{ report.totals.invoices_count }}</div>
+  </div>
+  <div class="summary-card">
+    <div class="summary-card-label">Просрочено более 90 дней</div>
+    <div class="summary-card-value">{{ report.totals.days_90_plus | fmt_money }} {{ report.currency_symbol }}</div>
+  </div>
+</div>
+
+{% if report.rows %}
+<div class="section-title">Суммы по дням просрочки, {{ report.currency_symbol }}</div>
+
+<table class="breakdown-table">
+  <thead>
+    <tr>
+      <th>Клиент</th>
+      <th class="r">Счетов</th>
+      <th class="r">Срок не наступил</th>
+      <th class="r">0–30</th>
+      <th class="r">31–60</th>
+      <th class="r">61–90</th>
+      <th class="r">90+</th>
+      <th class="amount r">Итого</th>
+    </tr>
+  </thead>
+  <tbody>
+    {% for row in report.rows %}
+    <tr class="project-row">
+      <td>{{ row.client_name }}</td>
+      <td class="td-r">{{ row.invoices_count }}</td>
+      <td class="td-r">{{ row.current | fmt_money }}</td>
+      <td class="td-r">{{ row.days_0_30 | fmt_money }}</td>
+      <td class="td-r">{{ row.days_31_60 | fmt_money }}</td>
+      <td class="td-r">{{ row.days_61_90 | fmt_money }}</td>
+      <td class="td-r"><span {% if row.days_90_plus %}class="status-unpaid"{% endif %}>{{ row.days_90_plus | fmt_money }}</span></td>
+      <td class="td-r"><strong>{{ row.total | fmt_money }}</strong></td>
+    </tr>
+    {% endfor %}
+  </tbody>
+  <tfoot>
+    <tr class="grand-total">
+      <td>ИТОГО</td>
+      <td class="td-r">{{ report.totals.invoices_count }}</td>
+      <td class="td-r">{{ report.totals.current | fmt_money }}</td>
+      <td class="td-r">{{ report.totals.days_0_30 | fmt_money }}</td>
+      <td class="td-r">{{ report.totals.days_31_60 | fmt_money }}</td>
+      <td class="td-r">{{ report.totals.days_61_90 | fmt_money }}</td>
+      <td class="td-r">{{ report.totals.days_90_plus | fmt_money }}</td>
+      <td class="td-r">{{ report.totals.total | fmt_money }}</td>
+    </tr>
+  </tfoot>
+</table>
+{% endif %}
+
+<div class="report-footer">
+  Сформировано: {{ generated_at | fmt_date }}
+</div>
+
+</body>
+</html>
+"""
+
+
+# Колонка на период: сумма, под ней часы
+_COMPARISON_TEMPLATE = _HEAD + """<body>
+
+<div class="report-header">
+  <div>
+    <div class="report-title">Сравнение периодов</div>
+    {% if report.client_name %}
+    <div class="report-subtitle">Клиент: {{ report.client_name }}</div>
+    {% else %}
+    <div class="report-subtitle">Все клиенты</div>
+    {% endif %}
+  </div>
+  <div class="report-period">
+    <strong>{{ report.periods[0].date_from | fmt_date }} — {{ report.periods[-1].date_to | fmt_date }}</strong>
+    Периодов: {{ report.periods | length }}
+  </div>
+</div>
+
+{% macro cells(hours, amount) -%}
+{% for i in range(report.periods | length) %}
+<td class="td-r">{{ amount[i] | fmt_money }}<br><span style="font-size:7.5pt; opacity:0.7;">{{ hours[i] | fmt_num(1) }} ч</span></td>
+{% endfor %}
+{%- endmacro %}
+
+<div class="section-title">Суммы, {{ report.currency_symbol }} · часы</div>
+
+<table class="breakdown-table">
+  <thead>
+    <tr>
+      <th>Клиент / Проект</th>
+      {% for period in report.periods %}
+      <th class="r">{{ period.date_from | fmt_date }}<br>{{ period.date_to | fmt_date }}</th>
+      {% endfor %}
+    </tr>
+  </thead>
+  <tbody>
+    {% for client in report.breakdown %}
+    <tr class="client-row">
+      <td>{{ client.client_name }}</td>
+      {{ cells(client.hours, client.amount) }}
+    </tr>
+    {% for proj in client.projects %}
+    <tr class="project-row">
+      <td>{{ proj.project_name }}</td>
+      {{ cells(proj.hours, proj.amount) }}
+    </tr>
+    {% endfor %}
+    {% endfor %}
+  </tbody>
+  <tfoot>
+    <tr class="grand-total">
+      <td>ИТОГО</td>
+      {% for period in report.periods %}
+      <td class="td-r">{{ period.amount | fmt_money }}<br><span style="font-size:7.5pt;">{{ period.hours | fmt_num(1) }} ч</span></td>
+      {% endfor %}
+    </tr>
+  </tfoot>
+</table>
+
+<div class="report-footer">
+  Сформировано: {{ generated_at | fmt_date }}
+</div>
+
+</body>
+</html>
+"""
+
+
 # ── Public API ─────────────────────────────────────────────────────────────────
 
-def render_report_pdf(report: ReportData) -> bytes:
-    """Render a report as PDF bytes."""
+def _render_pdf(template: str, report) -> bytes:
     from datetime import date as _date
     env = Environment(loader=BaseLoader(), autoescape=True)
     env.filters["fmt_date"] = _fmt_date
     env.filters["fmt_money"] = _fmt_money
     env.filters["fmt_num"] = _fmt_num
 
-    html_str = env.from_string(_TEMPLATE).render(
+    html_str = env.from_string(template).render(
         report=report,
         generated_at=_date.today(),
         font_regular=_FONT_REGULAR.as_uri(),
         font_bold=_FONT_BOLD.as_uri(),
     )
 
-    return HTML(string=html_str).write_pdf()
+    return html_class()(string=html_str).write_pdf()
+
+
+def render_report_pdf(report: ReportData) -> bytes:
+    """Render a report as PDF bytes."""
+    return _render_pdf(_TEMPLATE, report)
+
+
+def render_aging_pdf(report: AgingReportData) -> bytes:
+    """Render a receivables aging report as PDF bytes."""
+    return _render_pdf(_AGING_TEMPLATE, report)
+
+
+def render_comparison_pdf(report: ComparisonData) -> bytes:
+    """Render a multi-period comparison as PDF bytes."""
+    return _render_pdf(_COMPARISON_TEMPLATE, report)
@@ -0,0 +1,65 @@
+"""
+Дисковый кэш готовых PDF счетов (PDF_CACHE_DIR).
+
+Файл — ``{invoice_id}-{key}.pdf``, где key — отпечаток входных данных
+(invoice_pdf_key). Изменились позиции, реквизиты клиента или профиля —
+меняется ключ, старый файл не находится и заменяется при следующей записи.
+Поэтому кэш не нужно сбрасывать из обработчиков изменений и он общий для
+всех воркеров: достаточно общего каталога.
+
+Запись атомарна (временный файл + os.replace): параллельный читатель видит
+либо прежний файл, либо новый целиком.
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+from pathlib import Path
+
+from app.core.config import settings
+
+
+def _cache_dir() -> Path | None:
+    return Path(settings.PDF_CACHE_DIR) if settings.PDF_CACHE_DIR else None
+
+
+def load(invoice_id: int, key: str) -> bytes | None:
+    """Готовый PDF или None (нет файла, кэш выключен)."""
+    directory = _cache_dir()
+    if directory is None:
+        return None
+    try:
+        return (directory / f"{invoice_id}-{key}.pdf").read_bytes()
+    except FileNotFoundError:
+        return None
+
+
+def save(invoice_id: int, key: str, pdf_bytes: bytes) -> None:
+    """Сохранить PDF и удалить файлы этого счёта с другими ключами."""
+    directory = _cache_dir()
+    if directory is None:
+        return
+    directory.mkdir(parents=True, exist_ok=True)
+    target = directory / f"{invoice_id}-{key}.pdf"
+    fd, tmp_name = tempfile.mkstemp(dir=directory, prefix=f".{invoice_id}-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as tmp:
+            tmp.write(pdf_bytes)
+        os.replace(tmp_name, target)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+    for stale in directory.glob(f"{invoice_id}-*.pdf"):
+        if stale != target:
+            stale.unlink(missing_ok=True)
+
+
+def discard(invoice_id: int) -> None:
+    """Удалить файлы счёта (счёт удалён)."""
+    directory = _cache_dir()
+    if directory is None:
+        return
+    for path in directory.glob(f"{invoice_id}-*.pdf"):
+        path.unlink(missing_ok=True)
@@ -0,0 +1,130 @@
+"""
+Источники курсов валют.
+
+Провайдер отдаёт официальные курсы одной валюты за диапазон дат одним
+запросом: {дата установления курса → рублей за 1 единицу валюты}.
+Дни без установленного курса (выходные, праздники) в ответе отсутствуют —
+их заполняет RateService последним известным курсом.
+"""
+
+from __future__ import annotations
+
+import json
+import urllib.request
+import xml.etree.ElementTree as ET
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Protocol
+
+
+class RateProviderError(Exception):
+    """Провайдер недоступен или вернул некорректный ответ."""
+
+
+class UnsupportedCurrencyError(Exception):
+    """
+    Провайдер не устанавливает курс этой валюты. Не RateProviderError:
+    это ошибка запроса (422), а не недоступность провайдера.
+    """
+
+
+class RateProvider(Protocol):
+    def fetch(self, currency: str, date_from: date, date_to: date) -> dict[date, Decimal]:
+        """Курсы currency (RUB за 1 единицу) за [date_from, date_to]."""
+        ...
+
+    def currencies(self) -> frozenset[str]:
+        """ISO-коды валют, для которых провайдер знает курсы."""
+        ...
+
+
+class CbrProvider:
+    """
+    Официальные курсы ЦБ РФ (XML-сервисы cbr.ru).
+
+    XML_dynamic.asp отдаёт динамику курса за произвольный период одним
+    запросом, но принимает внутренний код валюты ЦБ (R01235 для USD) —
+    соответствие ISO-кодам загружается один раз из XML_valFull.asp.
+    """
+
+    BASE_URL = "https://www.cbr.ru/scripts"
+
+    def __init__(self, timeout: float = 10.0) -> None:
+        self.timeout = timeout
+        self._codes: dict[str, str] | None = None
+
+    def _get(self, url: str) -> ET.Element:
+        try:
+            with urllib.request.urlopen(url, timeout=self.timeout) as resp:
+                return ET.fromstring(resp.read())
+        except (OSError, ET.ParseError) as exc:
+            raise RateProviderError(f"ЦБ РФ: {url}: {exc}") from exc
+
+    def _load_codes(self) -> dict[str, str]:
+        if self._codes is None:
+            root = self._get(f"{self.BASE_URL}/XML_valFull.asp")
+            self._codes = {
+                iso: item.get("ID", "").strip()
+                for item in root.iter("Item")
+                if (iso := item.findtext("ISO_Char_Code", "").strip())
+            }
+        return self._codes
+
+    def currencies(self) -> frozenset[str]:
+        return frozenset(self._load_codes())
+
+    def _cbr_code(self, currency: str) -> str:
+        try:
+            return self._load_codes()[currency]
+        except KeyError:
+            raise UnsupportedCurrencyError(f"ЦБ РФ не устанавливает курс валюты {currency}") from None
+
+    def fetch(self, currency: str, date_from: date, date_to: date) -> dict[date, Decimal]:
+        root = self._get(
+            f"{self.BASE_URL}/XML_dynamic.asp"
+            f"?date_req1={date_from:%d/%m/%Y}&date_req2={date_to:%d/%m/%Y}"
+            f"&VAL_NM_RQ={self._cbr_code(currency)}"
+        )
+        rates: dict[date, Decimal] = {}
+        for record in root.iter("Record"):
+            day = datetime.strptime(record.get("Date", ""), "%d.%m.%Y").date()
+            value = Decimal(record.findtext("Value", "0").replace(",", "."))
+            nominal = Decimal(record.findtext("Nominal", "1"))
+            rates[day] = value / nominal
+        return rates
+
+
+class FixtureProvider:
+    """
+    Курсы из локального JSON-файла — для работы без сети и для тестов.
+
+    Формат: {"2026-01-09": {"USD": 78.23, "EUR": 91.05}, ...}
+    (рублей за 1 единицу валюты на дату).
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._data: dict[date, dict[str, Decimal]] | None = None
+
+    def _load(self) -> dict[date, dict[str, Decimal]]:
+        if self._data is None:
+            try:
+                raw = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as exc:
+                raise RateProviderError(f"Файл курсов {self.path}: {exc}") from exc
+            self._data = {
+                date.fromisoformat(day): {cur: Decimal(str(rate)) for cur, rate in rates.items()}
+                for day, rates in raw.items()
+            }
+        return self._data
+
+    def currencies(self) -> frozenset[str]:
+        return frozenset(cur for rates in self._load().values() for cur in rates)
+
+    def fetch(self, currency: str, date_from: date, date_to: date) -> dict[date, Decimal]:
+        return {
+            day: rates[currency]
+            for day, rates in self._load().items()
+            if date_from <= day <= date_to and currency in rates
+        }
@@ -0,0 +1,233 @@
+"""
+Сервис курсов: LRU в процессе → таблица exchange_rates → провайдер.
+
+Все запросы пакетные: вызывающий код собирает пары (валюта, дата) за весь
+отчёт и получает курсы одним вызовом — один SELECT по exchange_rates и не
+больше одного запроса к провайдеру на валюту.
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, timedelta
+from decimal import Decimal
+from functools import lru_cache
+from typing import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.database import upsert
+from app.models.exchange_rate import ExchangeRate
+from app.rates.providers import (
+    CbrProvider,
+    FixtureProvider,
+    RateProvider,
+    RateProviderError,
+    UnsupportedCurrencyError,
+)
+
+logger = logging.getLogger(__name__)
+
+RUB = "RUB"
+
+# Курс на выходной/праздник = последний установленный; 14 дней покрывают
+# новогодние каникулы
+LOOKBACK = timedelta(days=14)
+
+# После ошибки провайдера не обращаться к нему столько секунд: запросы не ждут
+# таймаут cbr.ru каждый раз, а сразу берут последний сохранённый курс
+PROVIDER_RETRY_SECONDS = 300.0
+
+CURRENCY_SYMBOLS = {"RUB": "₽", "USD": "$", "EUR": "€"}
+
+RatePair = tuple[str, date]
+
+
+class RateUnavailableError(Exception):
+    """Курса нет у провайдера, а в БД нет ни одного курса на эту дату или раньше."""
+
+
+class RateService:
+    def __init__(self, provider: RateProvider, cache_size: int = 4096) -> None:
+        self.provider = provider
+        self.cache_size = cache_size
+        self._cache: OrderedDict[RatePair, Decimal] = OrderedDict()
+        self._lock = threading.Lock()
+        self._provider_error: RateProviderError | None = None
+        self._provider_retry_at = 0.0
+
+    # ── LRU ──────────────────────────────────────────────────────────────────
+
+    def _cache_get(self, key: RatePair) -> Decimal | None:
+        with self._lock:
+            rate = self._cache.get(key)
+            if rate is not None:
+                self._cache.move_to_end(key)
+            return rate
+
+    def _cache_put(self, rates: dict[RatePair, Decimal]) -> None:
+        with self._lock:
+            self._cache.update(rates)
+            for key in rates:
+                self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    # ── Public API ───────────────────────────────────────────────────────────
+
+    def is_supported(self, currency: str) -> bool:
+        """
+        False — провайдер точно не знает валюту. Пока провайдер недоступен,
+        ответить нельзя: True, а пересчёт возьмёт сохранённые курсы.
+        """
+        if currency == RUB:
+            return True
+        if not self._provider_available():
+            return True
+        try:
+            return currency in self.provider.currencies()
+        except RateProviderError as exc:
+            self._provider_failed(exc)
+            return True
+
+    def rates_to_rub(self, db: Session, pairs: Iterable[RatePair]) -> dict[RatePair, Decimal]:
+        """Рублей за 1 единицу валюты для каждой пары (валюта, дата)."""
+        result: dict[RatePair, Decimal] = {}
+        missing: set[RatePair] = set()
+        for currency, day in pairs:
+            if currency == RUB:
+                result[(currency, day)] = Decimal("1")
+            elif (rate := self._cache_get((currency, day))) is not None:
+                result[(currency, day)] = rate
+            else:
+                missing.add((currency, day))
+
+        if missing:
+            stored = self._load_stored(db, missing)
+            self._cache_put(stored)
+            result.update(stored)
+            missing -= stored.keys()
+        if missing:
+            result.update(self._fetch(db, missing))
+        return result
+
+    def factors(
+        self, db: Session, pairs: Iterable[RatePair], target: str
+    ) -> dict[RatePair, Decimal]:
+        """Множитель перевода суммы из валюты пары в target на дату пары."""
+        pairs = set(pairs)
+        rub = self.rates_to_rub(db, pairs | {(target, day) for _, day in pairs})
+        return {
+            (currency, day): (
+                Decimal("1") if currency == target else rub[(currency, day)] / rub[(target, day)]
+            )
+            for currency, day in pairs
+        }
+
+    # ── Storage / provider ───────────────────────────────────────────────────
+
+    def _load_stored(self, db: Session, pairs: set[RatePair]) -> dict[RatePair, Decimal]:
+        days = [day for _, day in pairs]
+        rows = db.execute(
+            select(ExchangeRate.currency, ExchangeRate.date, ExchangeRate.rate).where(
+                ExchangeRate.currency.in_({currency for currency, _ in pairs}),
+                ExchangeRate.date.between(min(days), max(days)),
+            )
+        ).all()
+        return {(cur, day): rate for cur, day, rate in rows if (cur, day) in pairs}
+
+    def _provider_available(self) -> bool:
+        return time.monotonic() >= self._provider_retry_at
+
+    def _provider_failed(self, exc: RateProviderError) -> None:
+        logger.warning("Провайдер курсов недоступен, используются сохранённые курсы: %s", exc)
+        self._provider_error = exc
+        self._provider_retry_at = time.monotonic() + PROVIDER_RETRY_SECONDS
+
+    def _fetch_published(self, currency: str, date_from: date, date_to: date) -> dict[date, Decimal]:
+        """
+        Курсы провайдера; {} — провайдер недоступен (сейчас или недавно).
+        Пауза в обращениях — только при сбое связи или ответа: неизвестная
+        валюта (UnsupportedCurrencyError) — ошибка запроса, а не провайдера.
+        """
+        if not self._provider_available():
+            return {}
+        try:
+            return self.provider.fetch(currency, date_from, date_to)
+        except RateProviderError as exc:
+            self._provider_failed(exc)
+            return {}
+
+    def _stored_history(self, db: Session, currency: str, until: date) -> tuple[list[date], list[Decimal]]:
+        rows = db.execute(
+            select(ExchangeRate.date, ExchangeRate.rate)
+            .where(ExchangeRate.currency == currency, ExchangeRate.date <= until)
+            .order_by(ExchangeRate.date)
+        ).all()
+        return [day for day, _ in rows], [rate for _, rate in rows]
+
+    def _fetch(self, db: Session, pairs: set[RatePair]) -> dict[RatePair, Decimal]:
+        by_currency: dict[str, list[date]] = {}
+        for currency, day in pairs:
+            by_currency.setdefault(currency, []).append(day)
+
+        result: dict[RatePair, Decimal] = {}
+        to_store: dict[RatePair, Decimal] = {}
+        for currency, days in by_currency.items():
+            published = self._fetch_published(currency, min(days) - LOOKBACK, max(days))
+            published_days = sorted(published)
+            stored: tuple[list[date], list[Decimal]] | None = None
+
+            for day in days:
+                idx = bisect.bisect_right(published_days, day)
+                if idx:
+                    rate = published[published_days[idx - 1]]
+                    result[(currency, day)] = rate
+                    # Дни позже последнего опубликованного курса не сохраняем:
+                    # курс на них ещё может быть установлен
+                    if day <= published_days[-1]:
+                        to_store[(currency, day)] = rate
+                    continue
+                # Провайдер недоступен — последний известный курс из БД
+                # (одна выборка истории валюты на все такие дни)
+                if stored is None:
+                    stored = self._stored_history(db, currency, max(days))
+                stored_days, stored_rates = stored
+                idx = bisect.bisect_right(stored_days, day)
+                if not idx:
+                    error = self._provider_error
+                    raise RateUnavailableError(
+                        f"Нет курса {currency} на {day:%d.%m.%Y}"
+                        + (f" ({error})" if error else "")
+                    ) from error
+                result[(currency, day)] = stored_rates[idx - 1]
+
+        if to_store:
+            self._store(db, to_store)
+            self._cache_put(to_store)
+        return result
+
+    def _store(self, db: Session, rates: dict[RatePair, Decimal]) -> None:
+        # Отдельная транзакция: курсы сохраняются и при GET-запросах,
+        # не смешиваясь с изменениями сессии вызывающего кода
+        with db.get_bind().begin() as conn:
+            conn.execute(
+                upsert(conn, ExchangeRate.__table__).on_conflict_do_nothing(),
+                [{"currency": cur, "date": day, "rate": rate} for (cur, day), rate in rates.items()],
+            )
+
+
+@lru_cache(maxsize=None)
+def get_rate_service() -> RateService:
+    """Сервис курсов по настройкам (один на процесс — общий LRU)."""
+    if settings.RATES_PROVIDER == "fixture":
+        if not settings.RATES_FIXTURE_PATH:
+            raise RuntimeError("RATES_PROVIDER=fixture требует RATES_FIXTURE_PATH")
+        return RateService(FixtureProvider(settings.RATES_FIXTURE_PATH))
+    return RateService(CbrProvider())
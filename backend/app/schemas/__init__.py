@@ -9,8 +9,13 @@ from app.schemas.project import (
     ProjectUpdate,
 )
 from app.schemas.time_entry import (
+    BatchOperationResult,
+    BatchRequest,
+    BatchResponse,
     BulkConfirmRequest,
     BulkConfirmResponse,
+    ImportResponse,
+    ImportRowError,
     TimeEntryCreate,
     TimeEntryRead,
     TimeEntryUpdate,
@@ -22,6 +27,9 @@ from app.schemas.invoice import (
     InvoiceUpdate,
 )
 
+from app.schemas.search import SearchHit, SearchType
+from app.schemas.timer import TimerRead, TimerStart, TimerStop
+
 __all__ = [
     "Page",
     "LawyerProfileRead",
@@ -34,8 +42,13 @@ __all__ = [
     "ProjectRead",
     "ProjectStats",
     "ProjectUpdate",
+    "BatchOperationResult",
+    "BatchRequest",
+    "BatchResponse",
     "BulkConfirmRequest",
     "BulkConfirmResponse",
+    "ImportResponse",
+    "ImportRowError",
     "TimeEntryCreate",
     "TimeEntryRead",
     "TimeEntryUpdate",
@@ -43,4 +56,9 @@ __all__ = [
     "InvoiceItemRead",
     "InvoiceRead",
     "InvoiceUpdate",
+    "SearchHit",
+    "SearchType",
+    "TimerRead",
+    "TimerStart",
+    "TimerStop",
 ]
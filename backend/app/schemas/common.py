@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import enum
 import math
 from typing import Generic, Sequence, TypeVar
 
@@ -8,27 +9,49 @@ from pydantic import BaseModel
 T = TypeVar("T")
 
 
+class ExportFormat(str, enum.Enum):
+    csv = "csv"
+    ndjson = "ndjson"
+    xlsx = "xlsx"
+
+
+class ImportFormat(str, enum.Enum):
+    csv = "csv"
+    ndjson = "ndjson"
+
+
+class ImportEncoding(str, enum.Enum):
+    utf8 = "utf-8"  # с BOM или без
+    cp1251 = "cp1251"  # CSV из Excel с русской локалью
+
+
 class Page(BaseModel, Generic[T]):
     """Универсальный paginated-ответ."""
 
     items: list[T]
-    total: int
+    total: int | None
+    """Общее количество; null, если запрошено include_total=false."""
     page: int
     size: int
-    pages: int
+    pages: int | None
+    has_next: bool
 
     @classmethod
     def create(
         cls,
         items: Sequence,
-        total: int,
+        total: int | None,
         page: int,
         size: int,
+        has_next: bool | None = None,
     ) -> "Page[T]":
+        if has_next is None:
+            has_next = total is not None and page * size < total
         return cls(
             items=list(items),
             total=total,
             page=page,
             size=size,
-            pages=math.ceil(total / size) if total else 0,
+            pages=(math.ceil(total / size) if total else 0) if total is not None else None,
+            has_next=has_next,
         )
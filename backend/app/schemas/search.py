@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import enum
+from datetime import date
+
+from pydantic import BaseModel
+
+# Поле SearchHit.date иначе перекрыло бы тип при разрешении аннотаций
+_Date = date
+
+
+class SearchType(str, enum.Enum):
+    client = "client"
+    project = "project"
+    time_entry = "time_entry"
+
+
+class SearchHit(BaseModel):
+    """Результат поиска: клиент, проект или запись времени."""
+
+    type: SearchType
+    id: int
+    title: str
+    """Название клиента / проекта; для записи времени — название проекта."""
+    snippet: str
+    """Фрагмент с совпадением, найденные слова обёрнуты в <mark>…</mark>."""
+    rank: float
+    """bm25: чем меньше, тем релевантнее."""
+    client_id: int
+    project_id: int | None
+    date: _Date | None
+    """Дата записи времени (для остальных типов — null)."""
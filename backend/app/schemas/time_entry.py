@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from datetime import date, datetime
 from decimal import Decimal
+from typing import Annotated, Literal, Union
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -17,7 +18,7 @@ class TimeEntryBase(BaseModel):
     date: _Date
     duration_hours: Decimal = Field(
         gt=0,
-        description="Длительность в часах с точностью до 0.1",
+        description="Длительность в часах с точностью до 0.01",
     )
     description: str | None = None
 
@@ -35,6 +36,7 @@ class TimeEntryUpdate(BaseModel):
 class TimeEntryRead(TimeEntryBase):
     id: int
     project_id: int
+    client_id: int
     status: TimeEntryStatus
     created_at: datetime
     updated_at: datetime
@@ -52,3 +54,61 @@ class BulkConfirmResponse(BaseModel):
     skipped_ids: list[int] = Field(
         description="Id записей, пропущенных (не в статусе draft)"
     )
+
+
+class ImportRowError(BaseModel):
+    row: int = Field(description="Номер строки данных в файле (с 1, без заголовка CSV)")
+    detail: str
+
+
+class ImportResponse(BaseModel):
+    imported_count: int
+    error_count: int
+    errors: list[ImportRowError] = Field(
+        description="Ошибки по строкам (не более первых 1000)"
+    )
+    errors_truncated: bool = False
+
+
+class BatchCreateOperation(BaseModel):
+    op: Literal["create"]
+    data: TimeEntryCreate
+
+
+class BatchUpdateOperation(BaseModel):
+    op: Literal["update"]
+    id: int
+    data: TimeEntryUpdate
+
+
+class BatchDeleteOperation(BaseModel):
+    op: Literal["delete"]
+    id: int
+
+
+BatchOperation = Annotated[
+    Union[BatchCreateOperation, BatchUpdateOperation, BatchDeleteOperation],
+    Field(discriminator="op"),
+]
+
+
+class BatchRequest(BaseModel):
+    operations: list[BatchOperation] = Field(
+        min_length=1,
+        max_length=500,
+        description="Операции выполняются по порядку в одной транзакции",
+    )
+
+
+class BatchOperationResult(BaseModel):
+    index: int = Field(description="Позиция операции в запросе (с 0)")
+    op: str
+    id: int | None = Field(None, description="Id записи (для create — id созданной)")
+    status_code: int = Field(description="HTTP-статус, который вернула бы одиночная операция")
+    detail: str | None = None
+    entry: TimeEntryRead | None = Field(None, description="Запись после create/update")
+
+
+class BatchResponse(BaseModel):
+    applied: bool = Field(description="false — была ошибка, ни одна операция не применена")
+    results: list[BatchOperationResult]
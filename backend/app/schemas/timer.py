@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timezone
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+# См. комментарий в schemas/time_entry.py: поле `date` не должно перекрывать тип
+_Date = date
+
+
+class TimerStart(BaseModel):
+    project_id: int
+    description: str | None = None
+    started_at: datetime | None = Field(
+        None,
+        description="Момент старта (по умолчанию — сейчас). Без часового пояса считается UTC",
+    )
+
+
+class TimerStop(BaseModel):
+    description: str | None = Field(
+        None, description="Описание записи (по умолчанию — описание таймера)"
+    )
+    date: _Date | None = Field(
+        None, description="Дата записи (по умолчанию — дата старта таймера)"
+    )
+
+
+class TimerRead(BaseModel):
+    id: int
+    project_id: int
+    description: str | None
+    started_at: datetime
+    """UTC; прошедшее время клиент считает сам — ответ не меняется каждую секунду."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    @field_validator("started_at")
+    @classmethod
+    def _as_utc(cls, value: datetime) -> datetime:
+        return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
@@ -0,0 +1,90 @@
+"""
+Фоновая задача: перевод просроченных счетов в статус overdue.
+
+Счёт в статусе sent с due_date < сегодня становится overdue одним UPDATE
+(индекс ix_invoices_status_due_date). Задача запускается при старте
+приложения и затем ежедневно в начале суток, поэтому при чтении статус
+уже не нужно вычислять сравнением дат — достаточно status = 'overdue'.
+
+Под gunicorn задача работает в мастере (start_overdue_thread из
+gunicorn.conf.py), воркеры её не запускают; под одиночным uvicorn — в
+lifespan приложения (run_overdue_sweeper).
+"""
+
+import asyncio
+import logging
+import threading
+from datetime import date, datetime, time, timedelta
+
+from sqlalchemy import update
+from starlette.concurrency import run_in_threadpool
+
+from app.db.database import SessionLocal
+from app.models.enums import InvoiceStatus
+from app.models.invoice import Invoice
+
+logger = logging.getLogger(__name__)
+
+# Запуск чуть позже полуночи — с запасом на расхождение часов
+_RUN_AT = time(0, 0, 5)
+
+
+def sent_status(due_date: date, today: date | None = None) -> InvoiceStatus:
+    """
+    Статус отправляемого счёта: overdue, если срок уже прошёл (то же правило,
+    что у mark_overdue_invoices) — иначе счёт ждал бы ночного запуска в sent.
+    """
+    today = today or date.today()
+    return InvoiceStatus.overdue if due_date < today else InvoiceStatus.sent
+
+
+def mark_overdue_invoices(today: date | None = None) -> int:
+    """Перевести sent-счета с истёкшим сроком в overdue; вернуть их количество."""
+    today = today or date.today()
+    with SessionLocal() as db:
+        result = db.execute(
+            update(Invoice)
+            .where(Invoice.status == InvoiceStatus.sent, Invoice.due_date < today)
+            .values(status=InvoiceStatus.overdue)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+    return result.rowcount
+
+
+def _seconds_until_next_run(now: datetime) -> float:
+    next_run = datetime.combine(now.date() + timedelta(days=1), _RUN_AT)
+    return (next_run - now).total_seconds()
+
+
+def _sweep() -> None:
+    try:
+        count = mark_overdue_invoices()
+        if count:
+            logger.info("Просрочено счетов: %d", count)
+    except Exception:
+        # Ошибка одного запуска не должна останавливать расписание
+        logger.exception("Не удалось обновить просроченные счета")
+
+
+async def run_overdue_sweeper() -> None:
+    """Сразу и затем ежедневно; работает до отмены (lifespan)."""
+    while True:
+        await run_in_threadpool(_sweep)
+        await asyncio.sleep(_seconds_until_next_run(datetime.now()))
+
+
+def start_overdue_thread() -> threading.Event:
+    """
+    То же расписание в фоновом потоке текущего процесса (мастер gunicorn).
+    Возвращает событие: set() останавливает поток.
+    """
+    stop = threading.Event()
+
+    def loop() -> None:
+        while not stop.is_set():
+            _sweep()
+            stop.wait(_seconds_until_next_run(datetime.now()))
+
+    threading.Thread(target=loop, name="overdue-sweeper", daemon=True).start()
+    return stop
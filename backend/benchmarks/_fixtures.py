@@ -0,0 +1,119 @@
+"""Синтетические данные для бенчмарков (отдельная SQLite-база во временном файле)."""
+
+from __future__ import annotations
+
+import os
+import random
+import tempfile
+from datetime import date, timedelta
+from decimal import Decimal
+
+from sqlalchemy import Engine, create_engine, insert
+
+from app.db.database import Base
+import app.models  # noqa: F401 — register all tables
+from app.models.client import Client
+from app.models.enums import InvoiceStatus, TimeEntryStatus
+from app.models.invoice import Invoice
+from app.models.invoice_item import InvoiceItem
+from app.models.lawyer_profile import LawyerProfile
+from app.models.project import Project
+from app.models.time_entry import TimeEntry
+
+_CHUNK = 5_000
+
+
+def make_engine(path: str | None = None) -> Engine:
+    """Пустая база с актуальной схемой (create_all)."""
+    if path is None:
+        fd, path = tempfile.mkstemp(suffix=".db", prefix="bench_")
+        os.close(fd)
+        os.unlink(path)
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+def populate(
+    engine: Engine,
+    *,
+    clients: int = 50,
+    projects_per_client: int = 4,
+    entries: int = 200_000,
+    invoices: int = 10_000,
+    seed: int = 42,
+) -> None:
+    """Заполнить базу: клиенты → проекты → записи времени → счета с позициями."""
+    rnd = random.Random(seed)
+    start = date.today() - timedelta(days=5 * 365)
+    span = 5 * 365
+
+    with engine.begin() as conn:
+        conn.execute(insert(LawyerProfile), [dict(
+            full_name="Бенчмарк", company_name="Бенчмарк", inn="0", address="-",
+            bank_name="-", bik="0", checking_account="0", correspondent_account="0",
+            email="-", phone="-", default_hourly_rate=Decimal("5000.00"),
+        )])
+        conn.execute(insert(Client), [
+            dict(id=i, name=f"Клиент {i:04d}", contact_person=f"Контакт {i}", inn=f"77{i:08d}")
+            for i in range(1, clients + 1)
+        ])
+        project_ids = []
+        project_rows = []
+        pid = 0
+        for cid in range(1, clients + 1):
+            for _ in range(projects_per_client):
+                pid += 1
+                project_ids.append((pid, cid))
+                project_rows.append(dict(
+                    id=pid, client_id=cid, name=f"Проект {pid:05d}",
+                    hourly_rate=Decimal(rnd.choice([4000, 5000, 6000, 7500])) if rnd.random() > 0.2 else None,
+                ))
+        conn.execute(insert(Project), project_rows)
+
+        statuses = [TimeEntryStatus.draft, TimeEntryStatus.confirmed, TimeEntryStatus.billed]
+        weights = [0.1, 0.2, 0.7]
+        batch = []
+        for i in range(1, entries + 1):
+            p, c = rnd.choice(project_ids)
+            batch.append(dict(
+                id=i,
+                project_id=p,
+                client_id=c,
+                date=start + timedelta(days=rnd.randrange(span)),
+                duration_hours=Decimal(rnd.randrange(1, 80)) / 10,
+                description=f"Работа по проекту {p}, запись {i}",
+                status=rnd.choices(statuses, weights)[0],
+            ))
+            if len(batch) >= _CHUNK:
+                conn.execute(insert(TimeEntry), batch)
+                batch = []
+        if batch:
+            conn.execute(insert(TimeEntry), batch)
+
+        inv_statuses = [InvoiceStatus.draft, InvoiceStatus.sent, InvoiceStatus.paid, InvoiceStatus.overdue]
+        inv_rows, item_rows = [], []
+        item_id = 0
+        for i in range(1, invoices + 1):
+            issue = start + timedelta(days=rnd.randrange(span))
+            inv_rows.append(dict(
+                id=i,
+                client_id=rnd.randrange(1, clients + 1),
+                invoice_number=f"INV-{i:04d}",
+                issue_date=issue,
+                due_date=issue + timedelta(days=14),
+                status=rnd.choices(inv_statuses, [0.05, 0.15, 0.75, 0.05])[0],
+            ))
+            for _ in range(rnd.randrange(1, 8)):
+                item_id += 1
+                hours = Decimal(rnd.randrange(1, 80)) / 10
+                item_rows.append(dict(
+                    id=item_id, invoice_id=i, time_entry_id=None,
+                    hours=hours, rate=Decimal("5000.00"), amount=hours * 5000,
+                ))
+        for n in range(0, len(inv_rows), _CHUNK):
+            conn.execute(insert(Invoice), inv_rows[n:n + _CHUNK])
+        for n in range(0, len(item_rows), _CHUNK):
+            conn.execute(insert(InvoiceItem), item_rows[n:n + _CHUNK])
+
+        conn.exec_driver_sql("ANALYZE")
@@ -0,0 +1,174 @@
+"""
+Бенчмарк индексов: планы запросов и время выполнения до/после миграции
+5c2a8e41d7b9 (route_driven_indexes).
+
+Запросы повторяют форму запросов из роутов (дашборд, отчёты,
+_compute_stats, list_invoices, list_time_entries).
+
+Запуск (из директории backend/):
+    python -m benchmarks.bench_indexes
+    python -m benchmarks.bench_indexes --entries 500000 --repeat 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import Engine, func, select
+
+from app.models.enums import InvoiceStatus, TimeEntryStatus
+from app.models.invoice import Invoice
+from app.models.invoice_item import InvoiceItem
+from app.models.project import Project
+from app.models.time_entry import TimeEntry
+from benchmarks._fixtures import make_engine, populate
+
+# Индексы из initial_schema (903e3eb82d87), которые затрагивает миграция
+_BEFORE = {
+    "time_entries": [
+        ("ix_time_entries_date", ["date"]),
+        ("ix_time_entries_project_date", ["project_id", "date"]),
+        ("ix_time_entries_project_id", ["project_id"]),
+        ("ix_time_entries_status", ["status"]),
+    ],
+    "invoices": [
+        ("ix_invoices_client_id", ["client_id"]),
+        ("ix_invoices_due_date", ["due_date"]),
+        ("ix_invoices_issue_date", ["issue_date"]),
+        ("ix_invoices_status", ["status"]),
+    ],
+    "invoice_items": [
+        ("ix_invoice_items_invoice_id", ["invoice_id"]),
+        ("ix_invoice_items_time_entry_id", ["time_entry_id"]),
+    ],
+}
+
+_AFTER = {
+    "time_entries": [
+        ("ix_time_entries_date", ["date"]),
+        ("ix_time_entries_project_date", ["project_id", "date"]),
+        ("ix_time_entries_client_date", ["client_id", "date"]),
+        ("ix_time_entries_status_date", ["status", "date", "project_id", "duration_hours"]),
+        ("ix_time_entries_project_status", ["project_id", "status", "duration_hours"]),
+    ],
+    "invoices": [
+        ("ix_invoices_issue_date", ["issue_date"]),
+        ("ix_invoices_client_status_issue_date", ["client_id", "status", "issue_date"]),
+        ("ix_invoices_status_issue_date", ["status", "issue_date"]),
+        ("ix_invoices_status_due_date", ["status", "due_date"]),
+    ],
+    "invoice_items": [
+        ("ix_invoice_items_invoice_amount", ["invoice_id", "amount"]),
+        ("ix_invoice_items_time_entry_id", ["time_entry_id"]),
+    ],
+}
+
+
+def _queries() -> dict[str, object]:
+    today = date.today()
+    year_ago = today - timedelta(days=365)
+    month_start = today.replace(day=1)
+    item_totals = (
+        select(InvoiceItem.invoice_id, func.sum(InvoiceItem.amount).label("total"))
+        .group_by(InvoiceItem.invoice_id)
+        .subquery()
+    )
+    return {
+        "dashboard: hours this month": select(func.sum(TimeEntry.duration_hours)).where(
+            TimeEntry.date >= month_start, TimeEntry.date <= today
+        ),
+        "dashboard: unbilled (confirmed × rate)": select(
+            func.sum(TimeEntry.duration_hours * func.coalesce(Project.hourly_rate, 5000))
+        ).join(Project).where(TimeEntry.status == TimeEntryStatus.confirmed),
+        "dashboard: unpaid invoices total": select(func.sum(InvoiceItem.amount)).join(Invoice).where(
+            Invoice.status.in_([InvoiceStatus.sent, InvoiceStatus.overdue])
+        ),
+        "dashboard: overdue count": select(func.count(Invoice.id)).where(
+            Invoice.status == InvoiceStatus.sent, Invoice.due_date < today
+        ),
+        "time entries: status + date range page": select(TimeEntry).where(
+            TimeEntry.status == TimeEntryStatus.confirmed,
+            TimeEntry.date >= year_ago, TimeEntry.date <= today,
+        ).order_by(TimeEntry.date.desc(), TimeEntry.id.desc()).limit(20),
+        "_compute_stats(project_id=7)": select(
+            func.sum(TimeEntry.duration_hours),
+            func.sum(TimeEntry.duration_hours).filter(TimeEntry.status == TimeEntryStatus.confirmed),
+            func.sum(TimeEntry.duration_hours).filter(TimeEntry.status != TimeEntryStatus.billed),
+        ).where(TimeEntry.project_id == 7),
+        "list_invoices(client_id, status) page": select(Invoice).where(
+            Invoice.client_id == 3, Invoice.status == InvoiceStatus.paid
+        ).order_by(Invoice.issue_date.desc(), Invoice.id.desc()).limit(20),
+        "list_invoices(status) page": select(Invoice).where(
+            Invoice.status == InvoiceStatus.sent
+        ).order_by(Invoice.issue_date.desc(), Invoice.id.desc()).limit(20),
+        "report: invoice totals in period": select(Invoice.status, func.sum(item_totals.c.total)).join(
+            item_totals, item_totals.c.invoice_id == Invoice.id
+        ).where(Invoice.issue_date >= year_ago, Invoice.issue_date <= today).group_by(Invoice.status),
+    }
+
+
+def _apply_index_set(engine: Engine, index_set: dict[str, list[tuple[str, list[str]]]]) -> None:
+    with engine.begin() as conn:
+        for table in index_set:
+            existing = conn.exec_driver_sql(
+                "SELECT name FROM sqlite_master WHERE type='index' AND tbl_name=? AND sql IS NOT NULL",
+                (table,),
+            ).scalars().all()
+            for name in existing:
+                conn.exec_driver_sql(f'DROP INDEX "{name}"')
+            for name, cols in index_set[table]:
+                conn.exec_driver_sql(f'CREATE INDEX "{name}" ON {table} ({", ".join(cols)})')
+        conn.exec_driver_sql("ANALYZE")
+
+
+def _compile(stmt, engine: Engine) -> str:
+    return str(stmt.compile(engine, compile_kwargs={"literal_binds": True}))
+
+
+def _run(engine: Engine, label: str, repeat: int) -> dict[str, float]:
+    timings: dict[str, float] = {}
+    print(f"\n══ {label} " + "═" * (70 - len(label)))
+    with engine.connect() as conn:
+        for name, stmt in _queries().items():
+            sql = _compile(stmt, engine)
+            plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}").all()
+            samples = []
+            for _ in range(repeat):
+                t0 = time.perf_counter()
+                conn.exec_driver_sql(sql).all()
+                samples.append(time.perf_counter() - t0)
+            timings[name] = statistics.median(samples) * 1000
+            print(f"\n{name}  —  {timings[name]:.2f} ms")
+            for row in plan:
+                print(f"    {row[-1]}")
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=200_000, help="Количество записей времени")
+    parser.add_argument("--invoices", type=int, default=10_000, help="Количество счетов")
+    parser.add_argument("--repeat", type=int, default=10, help="Повторов на запрос (берётся медиана)")
+    args = parser.parse_args()
+
+    engine = make_engine()
+    print(f"Заполнение базы: {args.entries} записей, {args.invoices} счетов…")
+    populate(engine, entries=args.entries, invoices=args.invoices)
+
+    _apply_index_set(engine, _BEFORE)
+    before = _run(engine, "ДО (initial_schema)", args.repeat)
+    _apply_index_set(engine, _AFTER)
+    after = _run(engine, "ПОСЛЕ (route_driven_indexes)", args.repeat)
+
+    print("\n══ Итог " + "═" * 64)
+    print(f"{'Запрос':<45}{'до, мс':>10}{'после, мс':>12}{'×':>7}")
+    for name in before:
+        ratio = before[name] / after[name] if after[name] else float("inf")
+        print(f"{name:<45}{before[name]:>10.2f}{after[name]:>12.2f}{ratio:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
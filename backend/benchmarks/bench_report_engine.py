@@ -0,0 +1,121 @@
+"""
+Движки отчёта /reports: sql (GROUP BY в БД) против columnar
+(app.analytics.columnar — колонки в памяти и NumPy).
+
+Для каждого периода отчёт строится обоими движками и сверяется
+построчно: число записей — точно, часы и суммы — с точностью до
+округления. Код выхода 1 при расхождении — скрипт служит и проверкой
+паритета движков.
+
+Запуск (из директории backend/, нужен numpy):
+    python -m benchmarks.bench_report_engine
+    python -m benchmarks.bench_report_engine --entries 1000000 --repeat 5
+    RATES_PROVIDER=fixture RATES_FIXTURE_PATH=rates.json \\
+        python -m benchmarks.bench_report_engine --foreign USD
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.analytics.columnar import entry_columns
+from app.api.routes.reports import ReportResponse, _build_report
+from app.models.project import Project
+from app.rates.service import get_rate_service
+from benchmarks._fixtures import make_engine, populate
+
+
+def _diff(sql: ReportResponse, columnar: ReportResponse) -> list[str]:
+    problems = []
+    if abs(sql.total_hours - columnar.total_hours) > 0.1 + 1e-9:
+        problems.append(f"total_hours {sql.total_hours} ≠ {columnar.total_hours}")
+    if abs(sql.total_amount - columnar.total_amount) > 0.01 + 1e-6:
+        problems.append(f"total_amount {sql.total_amount} ≠ {columnar.total_amount}")
+
+    expected = {(c.client_id, p.project_id): p for c in sql.breakdown for p in c.projects}
+    actual = {(c.client_id, p.project_id): p for c in columnar.breakdown for p in c.projects}
+    if expected.keys() != actual.keys():
+        problems.append(f"проекты: {sorted(expected.keys() ^ actual.keys())[:5]}…")
+    for key in expected.keys() & actual.keys():
+        a, b = expected[key], actual[key]
+        if (
+            a.entries_count != b.entries_count
+            or a.currency != b.currency
+            or abs(a.hours - b.hours) > 0.1 + 1e-9
+            or abs(a.amount - b.amount) > 0.01 + 1e-6
+            or abs(a.original_amount - b.original_amount) > 0.01 + 1e-6
+        ):
+            problems.append(f"проект {key}: {a} ≠ {b}")
+    return problems
+
+
+def _timed(build, repeat: int) -> tuple[ReportResponse, float]:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        report = build()
+        samples.append(time.perf_counter() - t0)
+    return report, statistics.median(samples) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=200_000, help="Количество записей времени")
+    parser.add_argument("--repeat", type=int, default=5, help="Повторов на отчёт (берётся медиана)")
+    parser.add_argument(
+        "--foreign", default=None,
+        help="Перевести каждый третий проект в эту валюту (нужен провайдер курсов)",
+    )
+    args = parser.parse_args()
+
+    engine = make_engine()
+    print(f"Заполнение базы: {args.entries} записей…")
+    populate(engine, entries=args.entries, invoices=1_000)
+    if args.foreign:
+        with engine.begin() as conn:
+            conn.execute(update(Project).where(Project.id % 3 == 0).values(currency=args.foreign))
+
+    rates = get_rate_service()
+    today = date.today()
+    cases = [
+        ("месяц", today.replace(day=1), today, None),
+        ("год", today - timedelta(days=365), today, None),
+        ("год, клиент 7", today - timedelta(days=365), today, 7),
+        ("5 лет", today - timedelta(days=5 * 365), today, None),
+    ]
+
+    with sessionmaker(bind=engine)() as db:
+        t0 = time.perf_counter()
+        entry_columns(db)
+        print(f"Загрузка колонок: {(time.perf_counter() - t0) * 1000:.0f} ms")
+
+        failed = False
+        print(f"\n{'Период':<20}{'sql, мс':>10}{'columnar, мс':>15}{'×':>7}  паритет")
+        for label, date_from, date_to, client_id in cases:
+            def build(engine_name: str, db: Session = db):
+                return _build_report(
+                    db, date_from, date_to, client_id, "RUB", rates, engine=engine_name
+                )
+
+            sql, sql_ms = _timed(lambda: build("sql"), args.repeat)
+            columnar, col_ms = _timed(lambda: build("columnar"), args.repeat)
+            problems = _diff(sql, columnar)
+            failed |= bool(problems)
+            print(
+                f"{label:<20}{sql_ms:>10.1f}{col_ms:>15.1f}{sql_ms / col_ms:>7.1f}  "
+                + ("ok" if not problems else f"РАСХОЖДЕНИЙ: {len(problems)}")
+            )
+            for problem in problems[:10]:
+                print(f"    {problem}")
+
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
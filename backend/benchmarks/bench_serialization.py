@@ -0,0 +1,147 @@
+"""
+Бенчмарк сериализации списков: ORM-объекты + Pydantic (response_model) + json
+против быстрого пути «строки колонок → dict → orjson».
+
+Измеряется дважды: весь путь роута (запросы к БД + построение ответа +
+кодирование в байты) и только сериализация уже выбранной страницы.
+На больших таблицах первое упирается в сортировку/COUNT(*) OVER (),
+одинаковые для обоих путей, поэтому выигрыш виден во втором.
+
+Запуск (из директории backend/):
+    python -m benchmarks.bench_serialization
+    python -m benchmarks.bench_serialization --entries 100000 --repeat 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import time
+from decimal import Decimal
+from typing import Callable
+
+from pydantic import TypeAdapter
+from sqlalchemy import Engine, select
+from sqlalchemy.orm import sessionmaker
+
+from app.api.deps import PaginationParams
+from app.api.responses import FastJSONResponse
+from app.api.routes.invoices import _LOAD_ITEMS, _READ_COLUMNS as INVOICE_COLUMNS, _items_by_invoice
+from app.api.routes.time_entries import _READ_COLUMNS as ENTRY_COLUMNS
+from app.models.invoice import Invoice
+from app.models.time_entry import TimeEntry
+from app.schemas.common import Page
+from app.schemas.invoice import InvoiceRead
+from app.schemas.time_entry import TimeEntryRead
+from benchmarks._fixtures import make_engine, populate
+
+
+def _stdlib_render(content) -> bytes:
+    # То же, что starlette.responses.JSONResponse.render
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def _pydantic_path(adapter: TypeAdapter, page: Page) -> bytes:
+    # Как serialize_response в FastAPI: валидация по response_model из
+    # атрибутов ORM, затем dump в JSON-совместимые типы и json.dumps
+    validated = adapter.validate_python(page.model_dump(), from_attributes=True)
+    return _stdlib_render(adapter.dump_python(validated, mode="json"))
+
+
+def _bench(fn: Callable[[], bytes], repeat: int) -> tuple[float, int]:
+    fn()  # прогрев
+    samples, size = [], 0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        size = len(fn())
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples) * 1000, size
+
+
+def run(engine: Engine, size: int, repeat: int) -> None:
+    Session = sessionmaker(bind=engine)
+    pagination = PaginationParams(page=1, size=size, include_total=True)
+
+    entries_adapter = TypeAdapter(Page[TimeEntryRead])
+    invoices_adapter = TypeAdapter(Page[InvoiceRead])
+
+    def entries_orm() -> bytes:
+        with Session() as db:
+            page = pagination.paginate(db.query(TimeEntry), TimeEntry.date.desc(), TimeEntry.id.desc())
+            return _pydantic_path(entries_adapter, page)
+
+    def entries_fast() -> bytes:
+        with Session() as db:
+            page = pagination.paginate_rows(
+                db, select(*ENTRY_COLUMNS), TimeEntry.date.desc(), TimeEntry.id.desc()
+            )
+            return FastJSONResponse(page).body
+
+    def invoices_orm() -> bytes:
+        with Session() as db:
+            q = db.query(Invoice).options(_LOAD_ITEMS)
+            page = pagination.paginate(q, Invoice.issue_date.desc(), Invoice.id.desc())
+            return _pydantic_path(invoices_adapter, page)
+
+    def invoices_rows() -> dict:
+        with Session() as db:
+            page = pagination.paginate_rows(
+                db, select(*INVOICE_COLUMNS), Invoice.issue_date.desc(), Invoice.id.desc()
+            )
+            items = _items_by_invoice(db, [inv["id"] for inv in page["items"]])
+            for inv in page["items"]:
+                inv["items"] = items[inv["id"]]
+                inv["total_amount"] = sum((i["amount"] for i in inv["items"]), Decimal("0"))
+            return page
+
+    def invoices_fast() -> bytes:
+        return FastJSONResponse(invoices_rows()).body
+
+    # Паритет: оба пути должны давать один и тот же JSON
+    assert json.loads(entries_orm()) == json.loads(entries_fast()), "time entries: JSON differs"
+    assert json.loads(invoices_orm()) == json.loads(invoices_fast()), "invoices: JSON differs"
+
+    with Session() as db:
+        entries_page = pagination.paginate(db.query(TimeEntry), TimeEntry.date.desc(), TimeEntry.id.desc())
+        entries_dict = pagination.paginate_rows(
+            db, select(*ENTRY_COLUMNS), TimeEntry.date.desc(), TimeEntry.id.desc()
+        )
+        # Позиции счетов грузятся жадно — после закрытия сессии доступны
+        invoices_page = pagination.paginate(
+            db.query(Invoice).options(_LOAD_ITEMS), Invoice.issue_date.desc(), Invoice.id.desc()
+        )
+    invoices_dict = invoices_rows()
+
+    print(f"\n{'Список (size=' + str(size) + ')':<34}{'ORM+Pydantic, мс':>18}{'rows+orjson, мс':>18}{'×':>7}{'байт':>10}")
+    for name, slow, fast in (
+        ("GET /time-entries", entries_orm, entries_fast),
+        ("  └ только сериализация", lambda: _pydantic_path(entries_adapter, entries_page),
+         lambda: FastJSONResponse(entries_dict).body),
+        ("GET /invoices (с позициями)", invoices_orm, invoices_fast),
+        ("  └ только сериализация", lambda: _pydantic_path(invoices_adapter, invoices_page),
+         lambda: FastJSONResponse(invoices_dict).body),
+    ):
+        slow_ms, nbytes = _bench(slow, repeat)
+        fast_ms, _ = _bench(fast, repeat)
+        print(f"{name:<34}{slow_ms:>18.2f}{fast_ms:>18.2f}{slow_ms / fast_ms:>7.1f}{nbytes:>10}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=50_000, help="Количество записей времени")
+    parser.add_argument("--invoices", type=int, default=5_000, help="Количество счетов")
+    parser.add_argument("--size", type=int, default=100, help="Размер страницы")
+    parser.add_argument("--repeat", type=int, default=30, help="Повторов (берётся медиана)")
+    args = parser.parse_args()
+
+    engine = make_engine()
+    print(f"Заполнение базы: {args.entries} записей, {args.invoices} счетов…")
+    populate(engine, entries=args.entries, invoices=args.invoices)
+    run(engine, args.size, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
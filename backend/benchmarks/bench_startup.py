@@ -0,0 +1,97 @@
+"""
+Время импорта приложения и память воркера: ленивый WeasyPrint против
+загрузки при старте.
+
+Каждый сценарий выполняется в отдельном процессе с ``python -X importtime``;
+время — медиана по повторам, память — пиковый RSS процесса.
+
+Сценарии:
+  lazy    — import app.main (WeasyPrint загружается при первом PDF)
+  eager   — import weasyprint + app.main (как было до ленивой загрузки)
+  prewarm — import app.main + app.pdf.loader.prewarm() (PDF_PREWARM=true)
+
+Запуск (из директории backend/):
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --repeat 10 --top 15
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+SCENARIOS = {
+    "lazy": "import app.main",
+    "eager": "import weasyprint; import app.main",
+    "prewarm": "import app.main; from app.pdf.loader import prewarm; prewarm()",
+}
+
+_CHILD = """
+import json, resource, time
+t0 = time.perf_counter()
+{stmt}
+print(json.dumps({{
+    "wall_ms": (time.perf_counter() - t0) * 1000,
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "weasyprint": __import__("sys").modules.get("weasyprint") is not None,
+}}))
+"""
+
+
+def _run(stmt: str) -> tuple[dict, dict[str, int]] | None:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _CHILD.format(stmt=stmt)],
+        cwd=BACKEND_DIR,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        return None
+
+    # "import time: self [us] | cumulative | imported package" —
+    # собственное время модулей суммируется по корневому пакету
+    by_package: dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, _, name = line.removeprefix("import time:").split("|")
+        root = name.strip().split(".")[0]
+        by_package[root] = by_package.get(root, 0) + int(self_us)
+    return json.loads(proc.stdout.strip().splitlines()[-1]), by_package
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="Повторов на сценарий (берётся медиана)")
+    parser.add_argument("--top", type=int, default=10, help="Самых тяжёлых пакетов в каждом сценарии")
+    args = parser.parse_args()
+
+    print(f"{'Сценарий':<10}{'импорт, мс':>14}{'пик RSS, МБ':>14}{'weasyprint':>12}")
+    packages: dict[str, dict[str, int]] = {}
+    for name, stmt in SCENARIOS.items():
+        runs = [_run(stmt) for _ in range(args.repeat)]
+        if any(r is None for r in runs):
+            print(f"{name:<10}{'недоступно (нет WeasyPrint / Pango)':>40}")
+            continue
+        wall = statistics.median(r[0]["wall_ms"] for r in runs)
+        rss = statistics.median(r[0]["rss_mb"] for r in runs)
+        loaded = "да" if runs[0][0]["weasyprint"] else "нет"
+        print(f"{name:<10}{wall:>14.1f}{rss:>14.1f}{loaded:>12}")
+        packages[name] = runs[-1][1]
+
+    for name, by_package in packages.items():
+        print(f"\nСамые тяжёлые пакеты ({name}), собственное время импорта, мс:")
+        for package, self_us in sorted(by_package.items(), key=lambda kv: kv[1], reverse=True)[: args.top]:
+            print(f"  {self_us / 1000:>8.1f}  {package}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Продакшен-профиль: gunicorn + uvicorn-воркеры.
+
+Запуск (из директории backend/):
+    gunicorn app.main:app -c gunicorn.conf.py
+
+Переменные окружения:
+    WEB_CONCURRENCY — число воркеров (по умолчанию 2 × CPU + 1, не больше 8:
+                      SQLite сериализует запись, больше воркеров не ускоряет)
+    PORT            — порт (8000)
+    GUNICORN_TIMEOUT — таймаут запроса, с (120: генерация PDF)
+
+Приложение загружается в мастере до fork (preload_app): общий код и
+импорты разделяются страницами copy-on-write, ошибки импорта видны сразу.
+Прогрев (проверка схемы, PDF_PREWARM) — в lifespan каждого воркера.
+Перевод просроченных счетов (OVERDUE_SWEEPER_ENABLED) — один на инстанс:
+поток в мастере (when_ready), воркерам задача отключается. Кэши воркеров
+не общие: согласованность обеспечивает таблица data_versions (см. app.core.cache).
+"""
+
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = int(os.getenv("WEB_CONCURRENCY", min(multiprocessing.cpu_count() * 2 + 1, 8)))
+
+preload_app = True
+
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+graceful_timeout = 30
+keepalive = 5
+
+# Перезапуск воркеров против постепенного роста памяти (WeasyPrint, кэши)
+max_requests = 2000
+max_requests_jitter = 200
+
+accesslog = "-"
+errorlog = "-"
+
+
+def when_ready(server):
+    # Вызывается до запуска воркеров: они получают уже выключенную настройку —
+    # копией объекта при preload и из окружения, если preload выключен
+    from app.core.config import settings
+    from app.tasks.overdue import start_overdue_thread
+
+    if settings.OVERDUE_SWEEPER_ENABLED:
+        settings.OVERDUE_SWEEPER_ENABLED = False
+        os.environ["OVERDUE_SWEEPER_ENABLED"] = "false"
+        server.overdue_sweeper = start_overdue_thread()
+
+
+def on_exit(server):
+    sweeper = getattr(server, "overdue_sweeper", None)
+    if sweeper is not None:
+        sweeper.set()
+
+
+def post_fork(server, worker):
+    # Соединения пула, открытые в мастере при preload, не должны
+    # использоваться несколькими процессами
+    from app.db.database import engine
+
+    engine.dispose(close=False)
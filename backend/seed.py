@@ -20,16 +20,11 @@ from decimal import Decimal
 # Ensure the app package is importable when running from /app
 sys.path.insert(0, os.path.dirname(__file__))
 
-# Trigger table creation (same as main.py lifespan)
-from app.db.database import SessionLocal, engine, Base
-import app.models.client  # noqa: F401
-import app.models.lawyer_profile  # noqa: F401
-import app.models.project  # noqa: F401
-import app.models.time_entry  # noqa: F401
-import app.models.invoice  # noqa: F401
-import app.models.invoice_item  # noqa: F401
+# Схема БД до head (то же, что python -m app.main --init-db)
+from app.db.database import SessionLocal, engine
+from app.db.migrations import init_db
 
-Base.metadata.create_all(bind=engine)
+init_db(engine)
 
 from app.models.client import Client
 from app.models.invoice import Invoice
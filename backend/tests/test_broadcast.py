@@ -0,0 +1,27 @@
+"""Опрос data_versions переживает ошибку первого чтения."""
+
+from __future__ import annotations
+
+import asyncio
+
+from app.core import broadcast
+from app.core.broadcast import ChangeBroadcaster
+
+
+def test_watcher_survives_failed_initial_read(monkeypatch):
+    reads = iter([RuntimeError("database is locked"), {"invoices": 1}, {"invoices": 2}])
+
+    def read_all_versions() -> dict[str, int]:
+        result = next(reads, {"invoices": 2})
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    monkeypatch.setattr(broadcast, "_read_all_versions", read_all_versions)
+
+    async def scenario() -> set[str]:
+        changes = ChangeBroadcaster(poll_interval=0.01)
+        async with changes.subscribe() as subscription:
+            return await subscription.wait(timeout=1)
+
+    assert asyncio.run(scenario()) == {"invoices"}
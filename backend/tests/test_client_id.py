@@ -0,0 +1,44 @@
+"""Перенос проекта к другому клиенту: client_id записей и версия time_entries."""
+
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+from app.models.client import Client
+from app.models.data_version import read_versions
+from app.models.project import Project
+from app.models.time_entry import TimeEntry
+from benchmarks._fixtures import make_engine
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = make_engine(str(tmp_path / "client_id.db"))
+    with sessionmaker(bind=engine)() as session:
+        yield session
+    engine.dispose()
+
+
+def test_project_client_change_propagates(db):
+    first, second = Client(name="Иванов"), Client(name="Петров")
+    project = Project(client=first, name="Иск", hourly_rate=Decimal("1000"))
+    entry = TimeEntry(project=project, date=date(2026, 10, 1), duration_hours=Decimal("1.5"))
+    db.add_all([first, second, entry])
+    db.commit()
+    entry = db.get(TimeEntry, entry.id)
+    assert entry.client_id == first.id
+    before = read_versions(db, ("time_entries",))[0]
+
+    project.client = second
+    db.flush()
+    # Загруженная в сессию запись видит нового клиента ещё до commit
+    assert entry.client_id == second.id
+    db.commit()
+
+    assert read_versions(db, ("time_entries",))[0] == before + 1
+    assert db.scalar(select(TimeEntry.client_id).where(TimeEntry.id == entry.id)) == second.id
@@ -0,0 +1,72 @@
+"""Импорт записей: кодировка файла."""
+
+from __future__ import annotations
+
+import io
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import get_db
+from app.importers import time_entries as importer
+from app.main import app
+from app.models.time_entry import TimeEntry
+from app.schemas.common import ImportEncoding, ImportFormat
+from benchmarks._fixtures import make_engine, populate
+
+_CSV = "project_id,date,duration_hours,description\n1,2026-03-02,1.5,Подготовка иска\n"
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = make_engine(str(tmp_path / "import.db"))
+    populate(engine, clients=2, projects_per_client=1, entries=0, invoices=0)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def _count(session_factory) -> int:
+    with session_factory() as db:
+        return db.scalar(select(func.count()).select_from(TimeEntry))
+
+
+def test_cp1251_with_encoding(session_factory):
+    with session_factory() as db:
+        result = importer.import_time_entries(
+            db, io.BytesIO(_CSV.encode("cp1251")), ImportFormat.csv, encoding=ImportEncoding.cp1251
+        )
+        db.commit()
+    assert (result.imported_count, result.error_count) == (1, 0)
+    with session_factory() as db:
+        assert db.scalar(select(TimeEntry.description)) == "Подготовка иска"
+
+
+def test_non_utf8_rolls_back_earlier_batches(session_factory, monkeypatch):
+    # Первая пачка уже вставлена, когда поток доходит до байтов не в UTF-8
+    monkeypatch.setattr(importer, "IMPORT_BATCH_SIZE", 1)
+    data = _CSV.encode("utf-8") + "1,2026-03-03,1.0,Жалоба\n".encode("cp1251")
+    with session_factory() as db:
+        with pytest.raises(importer.ImportEncodingError, match="encoding=cp1251"):
+            importer.import_time_entries(db, io.BytesIO(data), ImportFormat.csv)
+        db.commit()
+    assert _count(session_factory) == 0
+
+
+def test_route_returns_422(session_factory):
+    def override_db():
+        with session_factory() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_db
+    try:
+        response = TestClient(app).post(
+            "/api/v1/time-entries/import",
+            files={"file": ("entries.csv", _CSV.encode("cp1251"), "text/csv")},
+        )
+    finally:
+        app.dependency_overrides.clear()
+    assert response.status_code == 422
+    assert "utf-8" in response.json()["detail"]
+    assert _count(session_factory) == 0
@@ -0,0 +1,90 @@
+"""Курсы: неизвестная валюта — ошибка запроса, а не сбой провайдера."""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from app.main import app
+from app.rates.providers import CbrProvider, RateProviderError, UnsupportedCurrencyError
+from app.rates.service import RateService, RateUnavailableError, get_rate_service
+from benchmarks._fixtures import make_engine
+
+
+class _Provider:
+    """Знает только USD; down=True — имитация недоступного провайдера."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.down = False
+
+    def currencies(self) -> frozenset[str]:
+        if self.down:
+            raise RateProviderError("timeout")
+        return frozenset({"USD"})
+
+    def fetch(self, currency: str, date_from: date, date_to: date) -> dict[date, Decimal]:
+        self.calls += 1
+        if self.down:
+            raise RateProviderError("timeout")
+        if currency != "USD":
+            raise UnsupportedCurrencyError(f"нет курса {currency}")
+        return {date_from + timedelta(days=i): Decimal("90") for i in range((date_to - date_from).days + 1)}
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = make_engine(str(tmp_path / "rates.db"))
+    with sessionmaker(bind=engine)() as session:
+        yield session
+    engine.dispose()
+
+
+def test_unknown_currency_does_not_pause_provider(db):
+    provider = _Provider()
+    rates = RateService(provider)
+    day = date(2026, 3, 2)
+
+    with pytest.raises(UnsupportedCurrencyError):
+        rates.rates_to_rub(db, [("XXX", day)])
+    assert rates.rates_to_rub(db, [("USD", day)]) == {("USD", day): Decimal("90")}
+    assert provider.calls == 2
+
+
+def test_provider_outage_pauses_provider(db):
+    provider = _Provider()
+    provider.down = True
+    rates = RateService(provider)
+
+    for _ in range(2):
+        with pytest.raises(RateUnavailableError, match="Нет курса USD"):
+            rates.rates_to_rub(db, [("USD", date(2026, 3, 2))])
+    assert provider.calls == 1
+    # Пока провайдер недоступен, валюту не отвергаем — решит пересчёт
+    assert rates.is_supported("XXX")
+
+
+def test_cbr_unknown_currency():
+    provider = CbrProvider()
+    provider._codes = {"USD": "R01235"}
+    assert provider.currencies() == frozenset({"USD"})
+    with pytest.raises(UnsupportedCurrencyError):
+        provider._cbr_code("XXX")
+
+
+def test_report_currency_rejects_unknown():
+    provider = _Provider()
+    app.dependency_overrides[get_rate_service] = lambda: RateService(provider)
+    try:
+        response = TestClient(app).get(
+            "/api/v1/reports", params={"date_from": "2026-01-01", "date_to": "2026-01-31", "currency": "xxx"}
+        )
+    finally:
+        app.dependency_overrides.clear()
+    assert response.status_code == 422
+    assert "XXX" in response.json()["detail"]
+    assert provider.calls == 0
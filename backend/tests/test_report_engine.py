@@ -0,0 +1,73 @@
+"""Паритет движков разбивки /reports: sql и columnar (REPORT_ENGINE)."""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.orm import sessionmaker
+
+pytest.importorskip("numpy")
+
+from app.analytics import columnar  # noqa: E402
+from app.api.routes.reports import _build_report  # noqa: E402
+from app.models.project import Project  # noqa: E402
+from app.rates.service import RateService  # noqa: E402
+from benchmarks._fixtures import make_engine, populate  # noqa: E402
+
+
+class _Provider:
+    """Курс USD, меняющийся по дням, — чтобы пересчёт шёл по дате работы."""
+
+    def fetch(self, currency: str, date_from: date, date_to: date) -> dict[date, Decimal]:
+        days = (date_to - date_from).days + 1
+        return {
+            day: Decimal("90") + Decimal(day.toordinal() % 7)
+            for day in (date_from + timedelta(days=i) for i in range(days))
+        }
+
+
+@pytest.fixture(scope="module")
+def db(tmp_path_factory):
+    engine = make_engine(str(tmp_path_factory.mktemp("report_engine") / "bench.db"))
+    populate(engine, clients=12, projects_per_client=3, entries=5_000, invoices=200)
+    with engine.begin() as conn:
+        conn.execute(update(Project).where(Project.id % 3 == 0).values(currency="USD"))
+    columnar._COLUMNS.clear()
+    with sessionmaker(bind=engine)() as session:
+        yield session
+    columnar._COLUMNS.clear()
+    engine.dispose()
+
+
+@pytest.mark.parametrize("currency", ["RUB", "USD"])
+@pytest.mark.parametrize(
+    ("days", "client_id"),
+    [(30, None), (365, None), (365, 5), (5 * 365, None)],
+)
+def test_columnar_matches_sql(db, currency, days, client_id):
+    rates = RateService(_Provider())
+    date_to = date.today()
+    date_from = date_to - timedelta(days=days)
+
+    sql = _build_report(db, date_from, date_to, client_id, currency, rates, engine="sql")
+    col = _build_report(db, date_from, date_to, client_id, currency, rates, engine="columnar")
+
+    expected = {(c.client_id, p.project_id): p for c in sql.breakdown for p in c.projects}
+    actual = {(c.client_id, p.project_id): p for c in col.breakdown for p in c.projects}
+    assert expected, "пустой отчёт ничего не проверяет"
+    assert actual.keys() == expected.keys()
+    for key, want in expected.items():
+        got = actual[key]
+        assert got.project_name == want.project_name
+        assert got.currency == want.currency
+        assert got.entries_count == want.entries_count
+        assert got.hours == pytest.approx(want.hours, abs=0.05)
+        assert got.amount == pytest.approx(want.amount, abs=0.01)
+        assert got.original_amount == pytest.approx(want.original_amount, abs=0.01)
+
+    assert col.total_hours == pytest.approx(sql.total_hours, abs=0.05)
+    assert col.total_amount == pytest.approx(sql.total_amount, abs=0.01)
+    assert [c.client_id for c in col.breakdown] == [c.client_id for c in sql.breakdown]
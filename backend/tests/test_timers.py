@@ -0,0 +1,69 @@
+"""Остановка таймера: точные четверти часа и дата в часовом поясе пользователя."""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db.database import get_db
+from app.main import app
+from app.models.active_timer import ActiveTimer
+from app.models.time_entry import TimeEntry
+from benchmarks._fixtures import make_engine, populate
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = make_engine(str(tmp_path / "timers.db"))
+    populate(engine, clients=1, projects_per_client=1, entries=0, invoices=0)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def client(session_factory):
+    def override_db():
+        with session_factory() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_db
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def _start(session_factory, started_at: datetime) -> int:
+    with session_factory() as db:
+        timer = ActiveTimer(project_id=1, started_at=started_at)
+        db.add(timer)
+        db.commit()
+        return timer.id
+
+
+@pytest.mark.parametrize(("minutes", "hours"), [(5, "0.25"), (40, "0.75"), (61, "1.25")])
+def test_billable_hours_quarters(minutes, hours):
+    started_at = datetime(2026, 10, 19, 9, 0)
+    timer = ActiveTimer(started_at=started_at)
+    assert timer.billable_hours(started_at + timedelta(minutes=minutes)) == Decimal(hours)
+
+
+def test_stop_stores_quarter_hour(client, session_factory):
+    timer_id = _start(session_factory, datetime.now(timezone.utc).replace(tzinfo=None))
+    response = client.post(f"/api/v1/timers/{timer_id}/stop")
+    assert response.status_code == 201
+    assert Decimal(response.json()["duration_hours"]) == Decimal("0.25")
+    with session_factory() as db:
+        assert db.get(TimeEntry, response.json()["id"]).duration_hours == Decimal("0.25")
+
+
+def test_stop_uses_configured_timezone(client, session_factory, monkeypatch):
+    # 22:30 UTC 18 октября — уже 19 октября в Москве
+    monkeypatch.setattr(settings, "TIMEZONE", "Europe/Moscow")
+    timer_id = _start(session_factory, datetime(2026, 10, 18, 22, 30))
+    response = client.post(f"/api/v1/timers/{timer_id}/stop")
+    assert response.status_code == 201
+    assert date.fromisoformat(response.json()["date"]) == date(2026, 10, 19)
@@ -210,7 +210,7 @@ export function InvoiceDetailPage() {
                   <td>{item.date ? fmtDate(item.date, lang) : `${idx + 1}`}</td>
                   <td>{item.project_name ?? '—'}</td>
                   <td className="td-desc">{item.description ?? '—'}</td>
-                  <td className="td-num">{Number(item.hours).toFixed(1)}</td>
+                  <td className="td-num">{Number(item.hours).toFixed(2)}</td>
                   <td className="td-num">{Number(item.rate).toLocaleString(lang === 'ru' ? 'ru-RU' : 'en-US', { minimumFractionDigits: 2 })}</td>
                   <td className="td-num">{Number(item.amount).toLocaleString(lang === 'ru' ? 'ru-RU' : 'en-US', { minimumFractionDigits: 2 })}</td>
                 </tr>
@@ -219,7 +219,7 @@ export function InvoiceDetailPage() {
             <tfoot>
               <tr className="table-total-row">
                 <td colSpan={3} className="total-label">{lang === 'ru' ? 'Итого:' : 'Subtotal:'}</td>
-                <td className="td-num total-value">{totalHours.toFixed(1)} h</td>
+                <td className="td-num total-value">{totalHours.toFixed(2)} h</td>
                 <td />
                 <td className="td-num total-value">{fmt(invoice.subtotal ?? invoice.total_amount)}</td>
               </tr>
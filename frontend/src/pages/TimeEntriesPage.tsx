@@ -344,8 +344,8 @@ export function TimeEntriesPage() {
           <div className="form-group">
             <input
               type="number"
-              step="0.1"
-              min="0.1"
+              step="0.01"
+              min="0.01"
               className="form-input"
               placeholder="Часы *"
               value={qHours}
@@ -611,8 +611,8 @@ export function TimeEntriesPage() {
             <label className="form-label">Часы</label>
             <input
               type="number"
-              step="0.1"
-              min="0.1"
+              step="0.01"
+              min="0.01"
               className="form-input"
               value={editForm.duration_hours ?? ''}
               onChange={e =>